@@ -1,8 +1,9 @@
 from fastapi import APIRouter
-from app.api.endpoints import auth, user, verification
+from app.api.endpoints import admin, auth, user, verification
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(user.router, tags=["users"])
-api_router.include_router(verification.router, tags=["verification"])
\ No newline at end of file
+api_router.include_router(verification.router, tags=["verification"])
+api_router.include_router(admin.router, tags=["admin"])
\ No newline at end of file
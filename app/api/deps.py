@@ -1,18 +1,21 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from jose import JWTError
-from app.core.database import get_session
+from app.core.config import settings
+from app.core.database import get_async_session
 from app.core.security import verify_token
-from app.crud.user import UserCRUD
+from app.crud.user import AsyncUserCRUD
 from app.models.user import User, UserRole
+from app.services.principal_cache import principal_cache
+from app.services.token_revocation import revocation_table
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -21,18 +24,49 @@ async def get_current_user(
     )
     
     payload = verify_token(token)
-    if payload is None:
+    if payload is None or payload.get("type") == "refresh":
         raise credentials_exception
     
     email: Optional[str] = payload.get("sub")
     if email is None:
         raise credentials_exception
     
-    user = UserCRUD.get_user_by_email(session, email=email)
+    # Tokens issued before claims-only mode lack uid and take the lookup below
+    if settings.AUTH_CLAIMS_ONLY and "uid" in payload:
+        return claims_principal(payload, email, credentials_exception)
+    
+    user = principal_cache.get(email)
+    if user is not None:
+        return user
+    
+    version = principal_cache.version(email)
+    user = await AsyncUserCRUD.get_user_by_email(session, email=email)
+    # End the read: otherwise the connection stays checked out until the
+    # request finishes, and endpoints that open sessions of their own
+    # (idempotent verification) need a second one meanwhile
+    await session.commit()
     if user is None:
         raise credentials_exception
     
-    return user
+    return principal_cache.put(email, user, version)
+
+def claims_principal(payload: dict, email: str, credentials_exception: HTTPException) -> User:
+    """
+    The user as described by the token's claims. Carries only what
+    authorization needs (id, email, role, active flag): not a database row.
+    """
+    try:
+        user_id = int(payload["uid"])
+        version = int(payload.get("ver", 0))
+        role = UserRole(payload.get("role"))
+    except (TypeError, ValueError):
+        raise credentials_exception
+    
+    active = bool(payload.get("act", True))
+    if not revocation_table.check(user_id, version, active):
+        raise credentials_exception
+    
+    return User(id=user_id, name="", email=email, role=role, is_active=active, token_version=version)
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_active:
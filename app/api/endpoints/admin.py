@@ -0,0 +1,111 @@
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+from app.api.deps import get_current_admin_user
+from app.core.db_metrics import db_metrics
+from app.core.security import token_cache
+from app.models.user import User
+from app.services.outcome_cache import outcome_cache
+from app.services.password_hashing import password_hasher
+from app.services.principal_cache import principal_cache
+from app.services.registry_cache import registry_cache
+from app.services.token_revocation import revocation_table
+from app.services.verification_export import ExportFilters, MEDIA_TYPES, stream_export
+from app.services.verification_service import verifier
+from app.services.write_behind import write_behind
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/cache/registry")
+def get_registry_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """
+    Registry cache size and hit/miss/eviction counters (Admin only)
+    """
+    return registry_cache.stats()
+
+@router.delete("/cache/registry", status_code=status.HTTP_204_NO_CONTENT)
+def clear_registry_cache(current_user: User = Depends(get_current_admin_user)):
+    """
+    Drop every cached registry record, e.g. after a bulk registry load (Admin only)
+    """
+    registry_cache.clear()
+
+@router.get("/cache/outcomes")
+def get_outcome_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """
+    Memoized verification outcome counters (Admin only)
+    """
+    return outcome_cache.stats()
+
+@router.get("/cache/principals")
+def get_principal_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """
+    Authenticated principal cache size and hit/miss/invalidation counters (Admin only)
+    """
+    return principal_cache.stats()
+
+@router.get("/cache/tokens")
+def get_token_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """
+    Verified token cache size and hit/miss/expiration counters (Admin only)
+    """
+    return token_cache.stats()
+
+@router.get("/cache/revocations")
+def get_revocation_table_stats(current_user: User = Depends(get_current_admin_user)):
+    """
+    Claims-only token version table size and refresh counters (Admin only)
+    """
+    return revocation_table.stats()
+
+@router.get("/metrics/db")
+def get_db_metrics(current_user: User = Depends(get_current_admin_user)):
+    """
+    Statements executed, connection checkouts and hold time since start,
+    rows and bytes fetched per endpoint, plus the verification
+    write-behind buffer (Admin only)
+    """
+    return {**db_metrics.snapshot(), "write_behind": write_behind.stats()}
+
+@router.get("/metrics/pipeline")
+def get_pipeline_metrics(current_user: User = Depends(get_current_admin_user)):
+    """
+    Per-stage run counts, timings and outcomes of the verification
+    pipeline since start (Admin only)
+    """
+    return verifier.pipeline.stats()
+
+@router.get("/metrics/password-hashing")
+def get_password_hashing_stats(current_user: User = Depends(get_current_admin_user)):
+    """
+    Password hashing pool backlog and rejection counters (Admin only)
+    """
+    return password_hasher.stats()
+
+@router.get("/export/verifications")
+def export_verifications(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    status: Optional[str] = None,
+    town: Optional[str] = None,
+    is_fraud: Optional[bool] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Stream every verification request matching the filters as NDJSON or
+    CSV, oldest first, optionally gzip-compressed (Admin only)
+    
+    **Parameters**:
+    - `status`, `town` (case-insensitive), `is_fraud`: exact filters
+    - `since`, `until`: `requested_at` window, `since` inclusive
+    """
+    filters = ExportFilters(status=status, town=town, is_fraud=is_fraud, since=since, until=until)
+    filename = f"verifications.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(filters, format, compress=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
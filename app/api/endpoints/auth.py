@@ -1,18 +1,38 @@
 # app/api/routes/auth.py
-from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session
 from app.core.database import get_session
 from app.core.config import settings
-from app.core.security import create_access_token
+from app.core.security import access_token_expires, create_access_token, create_refresh_token, verify_token
 from app.crud.user import UserCRUD
+from app.models.user import User
 from app.schemas.user import Token, UserCreate, UserRead
-from app.schemas.auth import GoogleAuthPayload, AuthResponse
+from app.schemas.auth import GoogleAuthPayload, AuthResponse, RefreshRequest
 from app.api.deps import get_current_user
 
 router = APIRouter(tags=["authentication"])
 
+def issue_tokens(user: User) -> dict:
+    """
+    Access and refresh tokens for ``user``. The access token's claims are
+    enough to authorize a request in claims-only mode.
+    """
+    claims = {
+        "sub": user.email,
+        "role": user.role,
+        "uid": user.id,
+        "act": user.is_active,
+        "ver": user.token_version or 0,
+    }
+    return {
+        "access_token": create_access_token(data=claims, expires_delta=access_token_expires()),
+        "refresh_token": create_refresh_token({"sub": user.email, "uid": user.id, "ver": claims["ver"]}),
+        "token_type": "bearer",
+        "user_id": user.id,
+        "role": user.role
+    }
+
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 def register(
     user_data: UserCreate,
@@ -45,18 +65,7 @@ def login(
             detail="Account is inactive"
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role}, 
-        expires_delta=access_token_expires
-    )
-    
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user_id": user.id,
-        "role": user.role
-    }
+    return issue_tokens(user)
 
 @router.post("/google", response_model=AuthResponse)
 def google_auth(
@@ -75,25 +84,51 @@ def google_auth(
             detail="Account is inactive"
         )
     
-    # Generate access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role},
-        expires_delta=access_token_expires
+    # Generate access and refresh tokens
+    return issue_tokens(user)
+
+@router.post("/refresh", response_model=AuthResponse)
+def refresh_tokens(
+    refresh_data: RefreshRequest,
+    session: Session = Depends(get_session)
+):
+    """
+    Exchange a refresh token for a new access and refresh token pair
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
     
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user_id": user.id,
-        "role": user.role
-    }
+    payload = verify_token(refresh_data.refresh_token)
+    if payload is None or payload.get("type") != "refresh" or "uid" not in payload:
+        raise credentials_exception
+    
+    # Deactivated, deleted or re-versioned users cannot renew
+    user = UserCRUD.get_user_by_id(session, payload["uid"])
+    if not user or not user.is_active or (user.token_version or 0) != payload.get("ver"):
+        raise credentials_exception
+    
+    return issue_tokens(user)
 
 @router.get("/me", response_model=UserRead)
-def read_users_me(current_user: UserRead = Depends(get_current_user)):
+def read_users_me(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
     """
     Get current user information
     """
+    # Claims-only principals carry just what authorization needs
+    if settings.AUTH_CLAIMS_ONLY:
+        user = UserCRUD.get_user_by_id(session, current_user.id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        return user
     return current_user
 
 @router.get("/verify-token")
@@ -101,8 +136,8 @@ def verify_token_endpoint(token: str):
     """
     Verify if a token is valid
     """
-    from app.core.security import verify_token
     payload = verify_token(token)
-    if payload:
+    # Refresh tokens only buy new access tokens, as in get_current_user
+    if payload and payload.get("type") != "refresh":
         return {"valid": True, "email": payload.get("sub")}
     return {"valid": False}
\ No newline at end of file
@@ -1,25 +1,45 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlmodel import Session
 from app.core.database import get_session
+from app.core.db_metrics import db_metrics
 from app.crud.user import UserCRUD
 from app.schemas.user import UserRead, UserUpdate
 from app.api.deps import get_current_active_user, get_current_admin_user
 from app.models.user import User
+from app.services.pagination import decode_cursor, split_page, NEXT_CURSOR_HEADER
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=List[UserRead])
 def get_all_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_admin_user),
     session: Session = Depends(get_session)
 ):
     """
-    Get all users (Admin only)
+    Get all users by id (Admin only)
+    
+    Pass the `X-Next-Cursor` header of a page as `cursor` to get the next
+    one; unlike `skip`, this costs the same on every page. The two cannot
+    be combined.
     """
-    return UserCRUD.get_all_users(session, skip, limit)
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="skip cannot be combined with cursor"
+        )
+    limit = max(1, limit)
+    after_id = decode_cursor(cursor, (int,))[0] if cursor else None
+    rows = UserCRUD.get_all_users(session, skip, limit + 1, after_id)
+    users, next_cursor = split_page(rows, limit, lambda user: (user.id,))
+    db_metrics.record_fetch("users.list", rows)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return users
 
 @router.get("/{user_id}", response_model=UserRead)
 def get_user(
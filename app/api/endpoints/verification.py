@@ -1,24 +1,52 @@
 import uuid
+from datetime import datetime
+from typing import List, Optional
 from app.models.user import User
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
-from app.core.database import get_session
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.core.database import get_session, get_async_session
+from app.core.db_metrics import db_metrics
 from app.api.deps import get_current_user
 from app.models.land_models import  VerificationRequest
+from app.models.types import coordinates_as_list
 from app.schemas.land_schemas import (
     VerificationRequestCreate,
     VerificationResult,
-    VerificationHistory
+    VerificationHistory,
+    VerificationAccepted
 )
 from app.services.verification_service import verifier
+from app.services.idempotency import idempotent_verifier
+from app.services.pagination import decode_cursor, split_page, NEXT_CURSOR_HEADER
+from app.services.verification_jobs import job_queue
 
 router = APIRouter(prefix="/verification", tags=["verification"])
 
+
+def _to_result(vr: VerificationRequest) -> VerificationResult:
+    return VerificationResult(
+        verification_id=vr.id,
+        status=vr.status,
+        is_verified=vr.is_verified,
+        message=vr.message or '',
+        location_match=vr.location_match,
+        coordinates_match=vr.coordinates_match,
+        overlap_percent=vr.overlap_score,
+        distance_meters=vr.distance_meters,
+        is_fraud=vr.is_fraud,
+        fraud_reason=vr.fraud_reason,
+        official_owner=vr.official_owner,
+        official_area=vr.official_area
+    )
+
+
 @router.post("/verify", response_model=VerificationResult)
 async def verify_land(
     request: VerificationRequestCreate,
     current_user: User = Depends(get_current_user),  # This injects the user
-    db: Session = Depends(get_session)
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key", max_length=255)
 ):
     """
     Verify land ownership using coordinates and location data.
@@ -32,6 +60,11 @@ async def verify_land(
     2. Approximate match on coordinates (≥2 of 3 checks must pass)
     3. Fraud detection for suspicious mismatches
     
+    **Retries**: Identical submissions that arrive while one is in flight
+    share its result. Send an `Idempotency-Key` header to also get the
+    same result for retries after it finished; reusing a key with a
+    different body is rejected with 422.
+    
     **Returns**:
     - Verification result with match details
     - Official ownership data (if verified)
@@ -39,43 +72,105 @@ async def verify_land(
     """
     try:
         # The user is automatically injected by FastAPI
-        vr = verifier.verify_land(db, current_user.id, request)
+        vr = await idempotent_verifier.verify(current_user.id, request, idempotency_key)
         
-        return VerificationResult(
-            verification_id=vr.id,
-            status=vr.status,
-            is_verified=vr.is_verified,
-            message=vr.message or '',
-            location_match=vr.location_match,
-            coordinates_match=vr.coordinates_match,
-            overlap_percent=vr.overlap_score,
-            distance_meters=vr.distance_meters,
-            is_fraud=vr.is_fraud,
-            fraud_reason=vr.fraud_reason,
-            official_owner=vr.official_owner,
-            official_area=vr.official_area
-        )
+        return _to_result(vr)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/verify-async", response_model=VerificationAccepted, status_code=status.HTTP_202_ACCEPTED)
+def verify_land_async(
+    request: VerificationRequestCreate,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """
+    Queue a land verification and return immediately.
+    
+    **Authentication Required**: User must be logged in.
+    
+    The verification is stored as `pending` and finished by a background
+    worker. Poll `GET /verification/{verification_id}` until its status
+    is no longer `pending`.
+    
+    **Returns**: 202 with the verification id, or 503 when the job queue is full
+    """
+    if not job_queue.reserve():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Verification queue is full, try again shortly",
+            headers={"Retry-After": "5"},
+        )
+    
+    try:
+        vr = verifier.create_pending(db, current_user.id, request)
+    except Exception:
+        job_queue.release()
+        raise
+    
+    job_queue.submit(vr.id, request)
+    
+    response.headers["Location"] = f"{settings.API_V1_PREFIX}{router.prefix}/{vr.id}"
+    return VerificationAccepted(verification_id=vr.id)
+
+@router.post("/verify-batch", response_model=List[VerificationResult])
+def verify_land_batch(
+    requests: List[VerificationRequestCreate],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_session)
+):
+    """
+    Verify many plots in one request.
+    
+    **Authentication Required**: User must be logged in.
+    
+    Each item is verified exactly like `POST /verification/verify`, but
+    registry lookups, coordinate checks and result writes are batched.
+    An item that fails internally comes back with status `failed`
+    without affecting the rest of the batch.
+    
+    **Returns**: One verification result per item, in request order
+    """
+    if len(requests) > settings.VERIFICATION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.VERIFICATION_BATCH_MAX_ITEMS} items per batch"
+        )
+    
+    vrs = verifier.verify_batch(db, current_user.id, requests)
+    return [_to_result(vr) for vr in vrs]
+
 @router.get("/history", response_model=list[VerificationHistory])
 async def get_verification_history(
+    response: Response,
     current_user: User = Depends(get_current_user),  # User dependency
-    db: Session = Depends(get_session),
-    limit: int = 20
+    db: AsyncSession = Depends(get_async_session),
+    limit: int = 20,
+    cursor: Optional[str] = None
 ):
     """
-    Get verification history for the authenticated user.
+    Get verification history for the authenticated user, newest first.
     
     **Authentication Required**: User must be logged in.
     
     **Parameters**:
     - `limit`: Maximum number of records to return (default: 20, max: 100)
+    - `cursor`: `X-Next-Cursor` header of the previous page, to fetch the next one
     
-    **Returns**: List of verification requests with basic information
+    **Returns**: List of verification requests with basic information; the
+    `X-Next-Cursor` header is set when more records follow
     """
-    history = verifier.get_history(db, current_user.id, limit)
+    limit = max(1, min(limit, 100))
+    after = decode_cursor(cursor, (datetime.fromisoformat, uuid.UUID)) if cursor else None
+    rows = await verifier.aget_history(db, current_user.id, limit + 1, after)
+    history, next_cursor = split_page(rows, limit, lambda vr: (vr.requested_at, vr.id))
+    db_metrics.record_fetch("verification.history", rows)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return [
         VerificationHistory(
@@ -96,7 +191,7 @@ async def get_verification_history(
 async def get_verification_details(
     verification_id: uuid.UUID,
     current_user: User = Depends(get_current_user),  # User dependency
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """
     Get detailed information about a specific verification request.
@@ -110,16 +205,15 @@ async def get_verification_details(
     
     **Returns**: Complete verification details including submitted and official data
     """
-    from sqlmodel import select
-    
     stmt = select(VerificationRequest).where(
         VerificationRequest.id == verification_id,
         VerificationRequest.user_id == current_user.id  # Security check
     )
-    vr = db.exec(stmt).first()
+    vr = (await db.exec(stmt)).first()
     
     if not vr:
         raise HTTPException(status_code=404, detail="Verification not found")
+    db_metrics.record_fetch("verification.detail", [vr])
     
     return {
         'id': vr.id,
@@ -134,7 +228,7 @@ async def get_verification_details(
             'layout': vr.submitted_layout,
             'block': vr.submitted_block,
             'plot': vr.submitted_plot,
-            'coordinates': vr.submitted_coords
+            'coordinates': coordinates_as_list(vr.submitted_coords)
         },
         
         'match_details': {
@@ -147,6 +241,6 @@ async def get_verification_details(
         'official_data': {
             'owner': vr.official_owner,
             'area': vr.official_area,
-            'coordinates': vr.official_coords
+            'coordinates': coordinates_as_list(vr.official_coords)
         } 
     }
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Backfill derived columns on existing land_registry rows.
+
+Rows inserted through the ORM get their derived columns from the model's
+insert/update hooks; rows loaded before those columns existed (or written
+outside the ORM) need this one-off pass.
+
+Usage:
+    python -m app.commands.backfill_registry [--batch-size 1000] [--all]
+"""
+import argparse
+import logging
+from typing import Optional
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.database import engine, add_missing_columns, create_trigram_index
+from app.models.land_models import LandRegistry, derive_registry_fields
+
+logger = logging.getLogger(__name__)
+
+
+def backfill(batch_size: int = 1000, only_missing: bool = True) -> int:
+    """Recompute derived columns in primary-key order; returns rows updated"""
+    added = add_missing_columns(engine, LandRegistry.__table__)
+    if added:
+        logger.info("Added columns to land_registry: %s", ", ".join(added))
+    if settings.REGISTRY_FUZZY_TOWN_MATCH:
+        create_trigram_index(engine, LandRegistry.__table__, "town_key")
+
+    updated = 0
+    last_id: Optional[object] = None
+
+    with Session(engine) as session:
+        # version was added without a default by earlier releases
+        result = session.execute(
+            update(LandRegistry).where(LandRegistry.version.is_(None)).values(version=1)
+        )
+        session.commit()
+        if result.rowcount:
+            logger.info("Set version on %s registry rows", result.rowcount)
+
+        while True:
+            stmt = select(LandRegistry).order_by(LandRegistry.id).limit(batch_size)
+            if last_id is not None:
+                stmt = stmt.where(LandRegistry.id > last_id)
+            if only_missing:
+                stmt = stmt.where(
+                    (LandRegistry.vertex_count.is_(None))
+                    | (LandRegistry.geohash.is_(None))
+                    | (LandRegistry.location_key.is_(None))
+                )
+
+            records = session.exec(stmt).all()
+            if not records:
+                break
+
+            rows = [
+                {
+                    "id": record.id,
+                    **derive_registry_fields(
+                        record.coordinates,
+                        record.town,
+                        record.layout,
+                        record.block_number,
+                        record.plot_number,
+                    ),
+                }
+                for record in records
+            ]
+            last_id = records[-1].id
+
+            # Bulk UPDATE by primary key, bypassing the per-row ORM hooks
+            session.execute(update(LandRegistry), rows)
+            session.commit()
+            session.expunge_all()
+
+            updated += len(rows)
+            logger.info("Backfilled %s registry rows", updated)
+
+    return updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Recompute every row, not only rows missing derived columns",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    engine.echo = False
+
+    total = backfill(batch_size=args.batch_size, only_missing=not args.all)
+    logger.info("Done, %s rows updated", total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+"""
+Stream a registry dataset (CSV or GeoJSON) into land_registry in bulk.
+
+Parcels are read one at a time, so memory stays flat however large the
+file is. Each one is validated and then buffered, and each full batch is
+written in a single transaction:
+
+- derived columns (centroid, bbox, area, hashes, location keys) are
+  computed for the whole batch at once
+- rows are written with COPY on PostgreSQL (psycopg 3 driver) and with
+  executemany elsewhere
+
+Rows are inserted directly, bypassing the ORM hooks. A running API picks
+the new parcels up on its next spatial index refresh.
+
+Inputs:
+
+- CSV: one parcel per row, with a header naming LandRegistry columns.
+  ``coordinates`` holds a JSON list of ``{"lat": .., "lng": ..}``.
+- GeoJSON: a FeatureCollection of Polygon features; the outer ring is
+  used and the columns come from ``properties``.
+
+Rejected parcels (invalid values, degenerate polygons, duplicate
+certificate numbers) are written to an error report (position,
+certificate_number, error) and the import carries on.
+
+After every committed batch the position reached is saved to a
+checkpoint file, so ``--resume`` restarts an interrupted import after
+the last committed batch. The checkpoint is deleted once the import
+finishes.
+
+Usage:
+    python -m app.commands.import_registry parcels.geojson
+    python -m app.commands.import_registry parcels.csv [--batch-size 5000]
+        [--errors parcels.errors.csv] [--checkpoint parcels.checkpoint.json] [--resume]
+"""
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import engine, add_missing_columns, create_trigram_index
+from app.models.land_models import LandRegistry, derive_registry_fields_many
+
+logger = logging.getLogger(__name__)
+
+table = LandRegistry.__table__
+
+REQUIRED_FIELDS = (
+    "certificate_number",
+    "certificate_pdf_url",
+    "town",
+    "layout",
+    "block_number",
+    "plot_number",
+    "owner_name",
+)
+OPTIONAL_TEXT_FIELDS = ("owner_national_id", "owner_phone", "owner_email", "land_use", "notes")
+OPTIONAL_DATE_FIELDS = ("acquisition_date", "registration_date")
+
+
+class RowError(ValueError):
+    """A parcel that cannot be imported; the message goes to the error report"""
+
+
+# ----------------------------------------------------------------------
+# Readers: (position, raw record) one parcel at a time
+# ----------------------------------------------------------------------
+
+def read_csv(path: str) -> Iterator[Tuple[int, Dict]]:
+    with open(path, newline="", encoding="utf-8") as fp:
+        for position, row in enumerate(csv.DictReader(fp), start=1):
+            try:
+                coordinates = json.loads(row.get("coordinates") or "null")
+            except ValueError:
+                coordinates = "invalid JSON"
+            yield position, {**row, "coordinates": coordinates}
+
+
+def read_geojson(path: str, chunk_size: int = 1 << 16) -> Iterator[Tuple[int, Dict]]:
+    """
+    Features of a FeatureCollection, decoded one by one from a sliding
+    buffer rather than loading the whole document
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as fp:
+        buffer = fp.read(chunk_size)
+        eof = not buffer
+
+        # Skip to the opening bracket of the "features" array
+        while True:
+            start = buffer.find('"features"')
+            if start >= 0:
+                bracket = buffer.find("[", start)
+                if bracket >= 0:
+                    index = bracket + 1
+                    break
+            if eof:
+                raise ValueError(f"{path} is not a GeoJSON FeatureCollection")
+            more = fp.read(chunk_size)
+            eof = not more
+            buffer += more
+
+        position = 0
+        while True:
+            # Drop consumed text now and then, not after every feature
+            if index > chunk_size:
+                buffer, index = buffer[index:], 0
+
+            while index < len(buffer) and buffer[index] in " \t\r\n,":
+                index += 1
+            if index < len(buffer) and buffer[index] == "]":
+                return
+
+            try:
+                feature, end = decoder.raw_decode(buffer, index)
+            except ValueError:
+                if eof:
+                    if buffer[index:].strip():
+                        raise ValueError(f"{path}: truncated or invalid feature after #{position}")
+                    return
+                more = fp.read(max(chunk_size, len(buffer)))
+                eof = not more
+                buffer += more
+                continue
+
+            position += 1
+            index = end
+            yield position, _feature_record(feature)
+
+
+def _feature_record(feature) -> Dict:
+    if not isinstance(feature, dict):
+        return {"coordinates": "feature is not an object"}
+    geometry = feature.get("geometry") or {}
+    coordinates = "geometry must be a Polygon"
+    if geometry.get("type") == "Polygon" and geometry.get("coordinates"):
+        # GeoJSON positions are [lng, lat]; the outer ring is the parcel
+        coordinates = [
+            {"lat": point[1], "lng": point[0]} if isinstance(point, list) and len(point) >= 2 else point
+            for point in geometry["coordinates"][0]
+        ]
+    return {**(feature.get("properties") or {}), "coordinates": coordinates}
+
+
+READERS = {"csv": read_csv, "geojson": read_geojson}
+
+
+# ----------------------------------------------------------------------
+# Validation
+# ----------------------------------------------------------------------
+
+def validate(raw: Dict) -> Dict:
+    """LandRegistry column values for a raw record; raises RowError"""
+    record = {}
+    for field in REQUIRED_FIELDS:
+        value = raw.get(field)
+        if value is None or not str(value).strip():
+            raise RowError(f"missing {field}")
+        record[field] = str(value).strip()
+
+    for field in OPTIONAL_TEXT_FIELDS:
+        value = raw.get(field)
+        record[field] = str(value).strip() if value not in (None, "") else None
+
+    for field in OPTIONAL_DATE_FIELDS:
+        value = raw.get(field)
+        try:
+            record[field] = datetime.fromisoformat(value) if value not in (None, "") else None
+        except (TypeError, ValueError):
+            raise RowError(f"invalid {field}: {value!r}")
+
+    area = raw.get("area_square_meters")
+    try:
+        record["area_square_meters"] = float(area) if area not in (None, "") else None
+    except (TypeError, ValueError):
+        raise RowError(f"invalid area_square_meters: {area!r}")
+
+    is_active = raw.get("is_active")
+    if is_active in (None, ""):
+        record["is_active"] = True
+    elif isinstance(is_active, bool):
+        record["is_active"] = is_active
+    else:
+        record["is_active"] = str(is_active).strip().lower() in ("true", "1", "yes")
+
+    record["coordinates"] = validate_coordinates(raw.get("coordinates"))
+    return record
+
+
+def validate_coordinates(coordinates) -> List[Dict]:
+    if isinstance(coordinates, str):
+        raise RowError(f"invalid coordinates: {coordinates}")
+    if not isinstance(coordinates, list):
+        raise RowError("missing coordinates")
+
+    points = []
+    for point in coordinates:
+        try:
+            lat, lng = float(point["lat"]), float(point["lng"])
+        except (TypeError, KeyError, ValueError):
+            raise RowError(f"invalid coordinate: {point!r}")
+        if not (math.isfinite(lat) and math.isfinite(lng) and -90 <= lat <= 90 and -180 <= lng <= 180):
+            raise RowError(f"coordinate out of range: {point!r}")
+        points.append({"lat": lat, "lng": lng})
+
+    # Stored rings are open; drop a closing vertex
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    if len(points) < 3:
+        raise RowError("polygon needs at least 3 distinct vertices")
+    return points
+
+
+# ----------------------------------------------------------------------
+# Writers
+# ----------------------------------------------------------------------
+
+COLUMNS = [column.name for column in table.columns]
+
+
+def _use_copy() -> bool:
+    return engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg"
+
+
+def write_rows(conn, rows: List[Dict]) -> None:
+    """Insert fully built rows on ``conn`` in one round-trip"""
+    if not _use_copy():
+        conn.execute(insert(table), rows)
+        return
+
+    coordinates_type = table.c.coordinates.type
+    columns = ", ".join(f'"{name}"' for name in COLUMNS)
+    cursor = conn.connection.driver_connection.cursor()
+    with cursor.copy(f"COPY {table.name} ({columns}) FROM STDIN") as copy:
+        for row in rows:
+            values = []
+            for name in COLUMNS:
+                value = row.get(name)
+                if name == "coordinates":
+                    value = coordinates_type.process_bind_param(value, engine.dialect)
+                    if not isinstance(value, bytes):
+                        value = json.dumps(value)
+                values.append(value)
+            copy.write_row(values)
+
+
+# ----------------------------------------------------------------------
+# Import
+# ----------------------------------------------------------------------
+
+@dataclass
+class ImportStats:
+    position: int = 0  # records read, including skipped and rejected ones
+    imported: int = 0
+    rejected: int = 0
+
+
+class RegistryImporter:
+    def __init__(
+        self,
+        source: str,
+        fmt: str,
+        batch_size: int = 5000,
+        errors_path: Optional[str] = None,
+        checkpoint_path: Optional[str] = None,
+    ):
+        self.source = source
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.errors_path = errors_path or f"{source}.errors.csv"
+        self.checkpoint_path = checkpoint_path or f"{source}.checkpoint.json"
+        self.stats = ImportStats()
+        self._errors = None
+        self._rejections: List[List] = []
+        self._started = 0.0
+        self._skipped = 0
+
+    def run(self, resume: bool = False) -> ImportStats:
+        added = add_missing_columns(engine, table)
+        if added:
+            logger.info("Added columns to land_registry: %s", ", ".join(added))
+        if settings.REGISTRY_FUZZY_TOWN_MATCH:
+            create_trigram_index(engine, table, "town_key")
+
+        skip = 0
+        if resume:
+            checkpoint = self._load_checkpoint()
+            if checkpoint:
+                skip = self._skipped = checkpoint["position"]
+                self.stats = ImportStats(**{k: checkpoint[k] for k in ("position", "imported", "rejected")})
+                logger.info("Resuming after record %s", skip)
+
+        self._started = time.perf_counter()
+        with open(self.errors_path, "a" if skip else "w", newline="", encoding="utf-8") as errors:
+            self._errors = csv.writer(errors)
+            if not skip:
+                self._errors.writerow(["position", "certificate_number", "error"])
+
+            batch: List[Tuple[int, Dict]] = []
+            position = skip
+            for position, raw in READERS[self.fmt](self.source):
+                if position <= skip:
+                    continue
+                try:
+                    batch.append((position, validate(raw)))
+                except RowError as e:
+                    self._reject(position, raw.get("certificate_number"), str(e))
+
+                # Counted in records read, so rejections are bounded too
+                if position - self.stats.position >= self.batch_size:
+                    self._flush(batch, position)
+                    batch = []
+                    errors.flush()
+
+            self._flush(batch, position)
+
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return self.stats
+
+    def _flush(self, batch: List[Tuple[int, Dict]], position: int) -> None:
+        """Write a batch in one transaction, then record the position reached"""
+        if batch:
+            rows = self._build_rows(batch)
+            try:
+                with engine.begin() as conn:
+                    rows = self._drop_duplicates(conn, rows)
+                    write_rows(conn, [row for _, row in rows])
+                self.stats.imported += len(rows)
+            except IntegrityError:
+                # Someone else inserted one of these meanwhile; find it row by row
+                self._write_each(rows)
+
+        # Rejections are only reported once their batch is settled, so a
+        # resumed import neither loses nor repeats them
+        for rejection in self._rejections:
+            self._errors.writerow(rejection)
+        self.stats.rejected += len(self._rejections)
+        self._rejections = []
+
+        self.stats.position = position
+        self._save_checkpoint()
+
+        elapsed = time.perf_counter() - self._started
+        logger.info(
+            "Imported %s parcels, %s rejected, %s records read | %.0f records/s",
+            self.stats.imported,
+            self.stats.rejected,
+            self.stats.position,
+            (self.stats.position - self._skipped) / elapsed if elapsed else 0.0,
+        )
+
+    def _build_rows(self, batch: List[Tuple[int, Dict]]) -> List[Tuple[int, Dict]]:
+        now = datetime.utcnow()
+        derived = derive_registry_fields_many([record for _, record in batch])
+        rows = []
+        for (position, record), fields in zip(batch, derived):
+            if not fields["projected_area_m2"]:
+                self._reject(position, record["certificate_number"], "degenerate polygon (zero area)")
+                continue
+            rows.append((position, {
+                **record,
+                **fields,
+                "id": uuid.uuid4(),
+                "version": 1,
+                "registration_date": record["registration_date"] or now,
+                "area_square_meters": record["area_square_meters"] or fields["projected_area_m2"],
+            }))
+        return rows
+
+    def _drop_duplicates(self, conn, rows: List[Tuple[int, Dict]]) -> List[Tuple[int, Dict]]:
+        """Reject certificate numbers already stored or repeated in the batch"""
+        numbers = [row["certificate_number"] for _, row in rows]
+        existing = set(conn.execute(
+            select(table.c.certificate_number).where(table.c.certificate_number.in_(numbers))
+        ).scalars())
+
+        kept = []
+        for position, row in rows:
+            number = row["certificate_number"]
+            if number in existing:
+                self._reject(position, number, "duplicate certificate_number")
+                continue
+            existing.add(number)
+            kept.append((position, row))
+        return kept
+
+    def _write_each(self, rows: List[Tuple[int, Dict]]) -> None:
+        for position, row in rows:
+            try:
+                with engine.begin() as conn:
+                    write_rows(conn, [row])
+                self.stats.imported += 1
+            except IntegrityError as e:
+                self._reject(position, row["certificate_number"], f"rejected by database: {e.orig}")
+
+    def _reject(self, position: int, certificate_number, error: str) -> None:
+        self._rejections.append([position, certificate_number or "", error])
+
+    def _load_checkpoint(self) -> Optional[Dict]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, encoding="utf-8") as fp:
+            checkpoint = json.load(fp)
+        if checkpoint.get("source") != os.path.abspath(self.source):
+            raise ValueError(f"{self.checkpoint_path} belongs to {checkpoint.get('source')}")
+        return checkpoint
+
+    def _save_checkpoint(self) -> None:
+        # Written after the batch commits; written to a temporary file
+        # and renamed so a crash never leaves a half-written checkpoint
+        temp = f"{self.checkpoint_path}.tmp"
+        with open(temp, "w", encoding="utf-8") as fp:
+            json.dump({
+                "source": os.path.abspath(self.source),
+                "position": self.stats.position,
+                "imported": self.stats.imported,
+                "rejected": self.stats.rejected,
+            }, fp)
+        os.replace(temp, self.checkpoint_path)
+
+
+def detect_format(path: str) -> str:
+    lower = path.lower()
+    if lower.endswith((".geojson", ".json")):
+        return "geojson"
+    if lower.endswith(".csv"):
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {path}; pass --format")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source")
+    parser.add_argument("--format", choices=sorted(READERS))
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--errors", help="Error report path (default: <source>.errors.csv)")
+    parser.add_argument("--checkpoint", help="Checkpoint path (default: <source>.checkpoint.json)")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue after the last committed batch of an interrupted import",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    engine.echo = False
+
+    importer = RegistryImporter(
+        args.source,
+        args.format or detect_format(args.source),
+        batch_size=args.batch_size,
+        errors_path=args.errors,
+        checkpoint_path=args.checkpoint,
+    )
+    stats = importer.run(resume=args.resume)
+    logger.info(
+        "Done, %s parcels imported, %s rejected (see %s)",
+        stats.imported,
+        stats.rejected,
+        importer.errors_path,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Convert stored coordinate columns between JSON and packed binary storage.
+
+Each coordinate column is copied into a temporary column of the target
+type in keyset-paged batches, then swapped in place of the original.
+Run it with the API stopped, then start the API with POLYGON_STORAGE set
+to the same format.
+
+Usage:
+    python -m app.commands.migrate_polygons --to wkb [--batch-size 1000]
+"""
+import argparse
+import logging
+
+from sqlalchemy import bindparam, inspect, literal_column, select, text
+
+from app.core.database import engine
+from app.models.land_models import LandRegistry, VerificationRequest
+from app.models.types import STORAGE_FORMATS, PolygonType, decode_any
+
+logger = logging.getLogger(__name__)
+
+COORDINATE_COLUMNS = [
+    (LandRegistry.__table__, "coordinates"),
+    (VerificationRequest.__table__, "submitted_coords"),
+    (VerificationRequest.__table__, "official_coords"),
+]
+
+
+def migrate_column(table, column: str, target: str, batch_size: int = 1000) -> int:
+    """Rewrite one column in the target storage format; returns rows converted"""
+    temp = f"{column}_{target}"
+    target_type = PolygonType(target)
+    ddl_type = target_type.dialect_impl(engine.dialect).compile(dialect=engine.dialect)
+
+    existing = {c["name"] for c in inspect(engine).get_columns(table.name)}
+    if temp not in existing:
+        with engine.begin() as conn:
+            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{temp}" {ddl_type}'))
+
+    update = text(f'UPDATE {table.name} SET "{temp}" = :value WHERE id = :pk').bindparams(
+        bindparam("value", type_=target_type),
+        bindparam("pk", type_=table.c.id.type),
+    )
+
+    converted = 0
+    last_id = None
+    while True:
+        # The source column is read untyped so any stored representation
+        # (JSON text, parsed JSON or bytes) reaches decode_any as-is
+        stmt = select(table.c.id, literal_column(f'"{column}"')).order_by(table.c.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(table.c.id > last_id)
+
+        with engine.begin() as conn:
+            rows = conn.execute(stmt).all()
+            if not rows:
+                break
+            conn.execute(update, [{"pk": row[0], "value": decode_any(row[1])} for row in rows])
+
+        last_id = rows[-1][0]
+        converted += len(rows)
+        logger.info("%s.%s: %s rows converted", table.name, column, converted)
+
+    with engine.begin() as conn:
+        conn.execute(text(f'ALTER TABLE {table.name} DROP COLUMN "{column}"'))
+        conn.execute(text(f'ALTER TABLE {table.name} RENAME COLUMN "{temp}" TO "{column}"'))
+
+    return converted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--to", choices=STORAGE_FORMATS, required=True)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    engine.echo = False
+
+    for table, column in COORDINATE_COLUMNS:
+        migrate_column(table, column, args.to, args.batch_size)
+
+    logger.info("Done. Start the API with POLYGON_STORAGE=%s", args.to)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,19 @@
+import logging
+import threading
+import time
+from typing import Optional
+from sqlalchemy import event, inspect, text, Table
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import create_engine, SQLModel, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
+from app.core.db_metrics import db_metrics
+from app.services.location_keys import similarity
 import os
 
+logger = logging.getLogger(__name__)
+
 def get_engine():
     """Create database engine based on URL"""
     # Check if it's SQLite or PostgreSQL
@@ -20,32 +32,253 @@ def get_engine():
             # No connect_args for PostgreSQL!
         )
 
-# def get_registry_engine():
-#     """Create registry database engine"""
-#     if settings.REGISTRY_DB_URL.startswith("sqlite"):
-#         return create_engine(
-#             settings.REGISTRY_DB_URL,
-#             echo=False,
-#             connect_args={"check_same_thread": False}
-#         )
-#     else:
-#         return create_engine(
-#             settings.REGISTRY_DB_URL,
-#             echo=False
-#         )
+def get_async_database_url() -> str:
+    """Async driver URL for the primary database"""
+    return settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+
+def to_async_url(url: str) -> str:
+    """Async driver URL: aiosqlite for SQLite, psycopg (async mode) for PostgreSQL"""
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+psycopg://", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+psycopg://", 1)
+    return url
+
+def get_async_engine():
+    """Create the async engine used by async endpoints"""
+    return create_async_engine(get_async_database_url(), echo=True)
+
+def get_registry_engine(url: str, is_async: bool = False):
+    """
+    Read-only engine for registry (LandRegistry) reads, pooled
+    separately from the primary
+    """
+    if url.startswith("sqlite"):
+        kwargs = {} if is_async else {"connect_args": {"check_same_thread": False}}
+    else:
+        kwargs = {
+            "pool_size": settings.REGISTRY_POOL_SIZE,
+            "max_overflow": settings.REGISTRY_MAX_OVERFLOW,
+            "pool_pre_ping": True,
+            "execution_options": {"postgresql_readonly": True},
+        }
+
+    if is_async:
+        registry = create_async_engine(url, echo=False, **kwargs)
+        bind = registry.sync_engine
+    else:
+        registry = bind = create_engine(url, echo=False, **kwargs)
+
+    if bind.dialect.name == "sqlite":
+        @event.listens_for(bind, "connect")
+        def _read_only(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA query_only = ON")
+            cursor.close()
+
+    @event.listens_for(bind, "handle_error")
+    def _mark_down(context):
+        if context.is_disconnect or context.connection is None:
+            registry_router.mark_down()
+
+    return registry
 
 # Create engines
 engine = get_engine()
-# registry_engine = get_registry_engine()
+async_engine = get_async_engine()
+
+registry_engine = None
+async_registry_engine = None
+if settings.REGISTRY_DB_URL:
+    registry_engine = get_registry_engine(settings.REGISTRY_DB_URL)
+    async_registry_engine = get_registry_engine(to_async_url(settings.REGISTRY_DB_URL), is_async=True)
+
+def register_sqlite_functions(bind: Engine) -> None:
+    """Give SQLite a similarity() like pg_trgm's, for fuzzy town lookups"""
+    if bind.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(bind, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("similarity", 2, similarity, deterministic=True)
+
+for bind in filter(None, (
+    engine,
+    async_engine.sync_engine,
+    registry_engine,
+    async_registry_engine and async_registry_engine.sync_engine,
+)):
+    register_sqlite_functions(bind)
+    db_metrics.instrument(bind)
+
+
+class RegistryRouter:
+    """
+    Picks the engine for registry reads: the registry engine while it is
+    healthy, the primary otherwise. Health is checked at most every
+    REGISTRY_HEALTH_CHECK_SECONDS, and a connection error on the registry
+    engine marks it down until the next successful check.
+
+    The registry database is read-only here, so schema changes (new
+    columns, backfills) only reach the primary. A registry database
+    missing any mapped column counts as unhealthy until it is migrated.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._healthy = False
+        self._checked_at: Optional[float] = None
+        # primary bind -> its registry bind (sync and async sessions)
+        self._routes = {}
+        if registry_engine is not None:
+            self._routes[engine] = registry_engine
+            self._routes[async_engine.sync_engine] = async_registry_engine.sync_engine
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._routes)
+
+    def available(self) -> bool:
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= settings.REGISTRY_HEALTH_CHECK_SECONDS:
+            with self._lock:
+                if self._checked_at is None or now - self._checked_at >= settings.REGISTRY_HEALTH_CHECK_SECONDS:
+                    self._healthy = self._check()
+                    self._checked_at = time.monotonic()
+        return self._healthy
+
+    def _check(self) -> bool:
+        try:
+            with registry_engine.connect() as conn:
+                conn.execute(text("SELECT 1 FROM land_registry LIMIT 1"))
+                missing = self._missing_columns(conn)
+        except Exception:
+            logger.warning("Registry engine unavailable, reading the registry from the primary", exc_info=True)
+            return False
+
+        if missing:
+            logger.warning(
+                "Registry database lacks columns %s, reading the registry from the primary",
+                ", ".join(sorted(missing)),
+            )
+            return False
+        return True
+
+    def _missing_columns(self, conn) -> set:
+        """Mapped registry columns the registry database does not have, as table.column"""
+        inspector = inspect(conn)
+        missing = set()
+        for name in REGISTRY_TABLES:
+            table = SQLModel.metadata.tables.get(name)
+            if table is None:
+                continue
+            present = {column["name"] for column in inspector.get_columns(name)}
+            missing.update(f"{name}.{column.name}" for column in table.columns if column.name not in present)
+        return missing
+
+    def mark_down(self) -> None:
+        self._healthy = False
+        self._checked_at = time.monotonic()
+
+    def registry_bind(self, primary: Engine) -> Optional[Engine]:
+        """Registry engine for sessions bound to ``primary``, if usable"""
+        if not self.available():
+            return None
+        return self._routes.get(primary)
+
+registry_router = RegistryRouter()
+
+# Tables read through the registry engine when one is configured
+REGISTRY_TABLES = {"land_registry"}
+
+
+class RoutingSession(Session):
+    """
+    Session that reads registry tables from the registry engine and
+    everything else, including all writes, from the primary it is bound to
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if mapper is None or self._flushing or not registry_router.enabled:
+            return primary
+        if clause is None or not getattr(clause, "is_select", False):
+            return primary
+
+        table = getattr(inspect(mapper).local_table, "name", None)
+        if table in REGISTRY_TABLES:
+            return registry_router.registry_bind(primary) or primary
+        return primary
 
 def create_db_and_tables():
     """Create verification database tables only (not registry)"""
     SQLModel.metadata.create_all(engine)
 
+    # create_all skips existing tables, so indexes added to a model later
+    # are created here
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+def add_missing_columns(bind: Engine, table: Table) -> list:
+    """
+    Add columns (and their indexes) that exist on the model but not yet in
+    the database. There is no migration tool here, so this is how new
+    derived columns reach tables created by an earlier version.
+    """
+    inspector = inspect(bind)
+    if not inspector.has_table(table.name):
+        table.create(bind)
+        return [column.name for column in table.columns]
+
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    added = []
+    with bind.begin() as conn:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=bind.dialect)
+            ddl = f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+            # With a server default, existing rows get it and NOT NULL holds
+            default = bind.dialect.ddl_compiler(bind.dialect, None).get_column_default_string(column)
+            if default is not None:
+                ddl += f" DEFAULT {default}" + ("" if column.nullable else " NOT NULL")
+            conn.execute(text(ddl))
+            added.append(column.name)
+
+    for index in table.indexes:
+        index.create(bind, checkfirst=True)
+    return added
+
+def create_trigram_index(bind: Engine, table: Table, column: str) -> None:
+    """GIN trigram index for fuzzy lookups on PostgreSQL; no-op elsewhere"""
+    if bind.dialect.name != "postgresql":
+        return
+    with bind.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{table.name}_{column}_trgm "
+            f"ON {table.name} USING gin ({column} gin_trgm_ops)"
+        ))
+
 def get_session():
-    with Session(engine) as session:
+    with RoutingSession(engine) as session:
         yield session
 
-# def get_registry_session():
-#     with Session(registry_engine) as session:
-#         yield session
\ No newline at end of file
+def new_async_session(**kwargs) -> AsyncSession:
+    # Objects stay loaded after commit: reading an expired attribute would
+    # need implicit IO, which async sessions cannot do
+    return AsyncSession(
+        async_engine,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        **kwargs,
+    )
+
+async def get_async_session():
+    async with new_async_session() as session:
+        yield session
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Database round-trip and connection hold-time counters.
+
+Engines registered with ``db_metrics.instrument`` count every statement
+sent to the database and time how long each pooled connection stays
+checked out, so per-request DB cost can be compared between code paths
+(see ``benchmarks/bench_verify_transactions.py``).
+
+Endpoints also report what they read with ``record_fetch(label, rows)``:
+rows and approximate bytes fetched per label, i.e. per endpoint. Bytes
+are counted from the loaded values (column projections and deferred
+columns count only what was actually selected), not from the wire.
+"""
+import json
+import threading
+import time
+from typing import Iterable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm.base import NO_VALUE
+
+
+def value_bytes(value) -> int:
+    """Approximate stored size of a fetched column value"""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 8
+    raw = getattr(value, "raw", None)  # PackedPolygon
+    if isinstance(raw, bytes):
+        return len(raw)
+    if isinstance(value, (list, dict)):
+        return len(json.dumps(value, default=str))
+    if hasattr(value, "to_list"):
+        return len(json.dumps(value.to_list()))
+    return len(str(value))
+
+
+def row_bytes(row) -> int:
+    """Bytes of a result row or ORM object, counting only loaded columns"""
+    if hasattr(row, "_sa_instance_state"):
+        state = inspect(row)
+        return sum(
+            value_bytes(state.attrs[key].loaded_value)
+            for key in state.mapper.column_attrs.keys()
+            if state.attrs[key].loaded_value is not NO_VALUE
+        )
+    if isinstance(row, tuple) or hasattr(row, "_mapping"):
+        return sum(row_bytes(value) for value in row)
+    return value_bytes(row)
+
+
+class DBMetrics:
+    """Process-wide statement and connection counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.statements = 0
+            self.checkouts = 0
+            self.hold_seconds = 0.0
+            self.max_hold_seconds = 0.0
+            self.fetched = {}
+
+    def instrument(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        with self._lock:
+            self.statements += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is None:
+            return
+        held = time.perf_counter() - started
+        with self._lock:
+            self.hold_seconds += held
+            self.max_hold_seconds = max(self.max_hold_seconds, held)
+
+    def record_fetch(self, label: str, rows: Iterable) -> None:
+        """Count rows (result rows or ORM objects) read under ``label``"""
+        rows = list(rows)
+        size = sum(row_bytes(row) for row in rows)
+        with self._lock:
+            fetched = self.fetched.setdefault(label, {"requests": 0, "rows": 0, "bytes": 0})
+            fetched["requests"] += 1
+            fetched["rows"] += len(rows)
+            fetched["bytes"] += size
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "statements": self.statements,
+                "checkouts": self.checkouts,
+                "hold_seconds": self.hold_seconds,
+                "max_hold_seconds": self.max_hold_seconds,
+                "fetched": {
+                    label: {**fetched, "bytes_per_request": fetched["bytes"] / fetched["requests"]}
+                    for label, fetched in self.fetched.items()
+                },
+            }
+
+
+# Global instance
+db_metrics = DBMetrics()
@@ -1,23 +1,45 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.core.config import settings
+from app.services.password_hashing import PasswordHasherBusy, password_hasher
 import hashlib
+import threading
+import time
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def _prehash(password: str) -> str:
+    # Always pre-hash with SHA256 to avoid bcrypt's 72-byte limit
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many password operations in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt with SHA256 pre-hashing"""
-    # Always pre-hash with SHA256 to avoid bcrypt's 72-byte limit
-    password_hash = hashlib.sha256(password.encode('utf-8')).hexdigest()
-    return pwd_context.hash(password_hash)
+    """Hash a password using bcrypt with SHA256 pre-hashing (on the hashing pool)"""
+    try:
+        return password_hasher.hash(_prehash(password))
+    except PasswordHasherBusy:
+        raise _hasher_busy()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    # Apply the same pre-hashing
-    password_hash = hashlib.sha256(plain_password.encode('utf-8')).hexdigest()
-    return pwd_context.verify(password_hash, hashed_password)
+    return verify_and_update_password(plain_password, hashed_password)[0]
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password against a hash. When it matches and the hash was
+    made with another bcrypt cost, also return its replacement.
+    """
+    try:
+        return password_hasher.verify_and_update(_prehash(plain_password), hashed_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
 
 # JWT Token functions
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -31,9 +53,106 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+class TokenCache:
+    """
+    LRU cache of verified JWT payloads, keyed by a SHA-256 digest of the
+    token so raw tokens are never held in memory. An entry is dropped once
+    its token's ``exp`` passes; only successfully verified tokens that
+    carry an ``exp`` are cached.
+    """
+
+    def __init__(self, max_entries: int = settings.TOKEN_CACHE_MAX_ENTRIES):
+        self.enabled = settings.TOKEN_CACHE_ENABLED
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, payload = entry
+            # Same comparison as jose: the token is valid through its exp second
+            if time.time() > expires_at:
+                del self._entries[digest]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return dict(payload)
+
+    def put(self, digest: bytes, payload: dict) -> None:
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[digest] = (expires_at, dict(payload))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+# Global instance
+token_cache = TokenCache()
+
+def access_token_expires() -> timedelta:
+    if settings.AUTH_CLAIMS_ONLY:
+        return timedelta(minutes=settings.AUTH_CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES)
+    return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+def create_refresh_token(data: dict) -> str:
+    """Long-lived token accepted only by POST /auth/refresh"""
+    return create_access_token(
+        {**data, "type": "refresh"},
+        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+
 def verify_token(token: str) -> Optional[dict]:
+    digest = None
+    if token_cache.enabled:
+        digest = TokenCache.digest(token)
+        payload = token_cache.get(digest)
+        if payload is not None:
+            return payload
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+    if digest is not None:
+        token_cache.put(digest, payload)
+    return payload
\ No newline at end of file
@@ -1,12 +1,84 @@
 # app/crud/user.py
 from datetime import datetime
 from typing import Optional, List
+from sqlalchemy import exists, func, literal, or_, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, load_only
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.schemas.auth import GoogleAuthPayload
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password, verify_and_update_password
+from app.services.principal_cache import invalidate_on_commit
+from app.services.token_revocation import bump_token_version
+
+# Columns a user listing returns (see UserRead)
+USER_LIST_COLUMNS = (
+    User.id, User.name, User.email, User.role, User.is_active, User.created_at, User.updated_at,
+)
+
+def _insert_for(session: Session):
+    """INSERT construct with ON CONFLICT support for the session's database"""
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+def _google_profile(google_data: GoogleAuthPayload, now: datetime):
+    """Columns a Google sign-in refreshes, and whether any of them would change"""
+    profile = {
+        "name": google_data.name,
+        "image": google_data.image,
+        "is_verified": True,  # Google users are auto-verified
+        # Link google_id if not already linked
+        "google_id": func.coalesce(User.google_id, google_data.google_id),
+        "updated_at": now,
+    }
+    changed = or_(
+        User.name.is_distinct_from(google_data.name),
+        User.image.is_distinct_from(google_data.image),
+        User.is_verified.is_(False),
+        User.google_id.is_(None),
+    )
+    return profile, changed
+
+def _written_or_existing(session: Session, statement, lookup):
+    """
+    Run an upsert or UPDATE that RETURNs the user only when it wrote, and
+    return ``(user, written)`` either way.
+
+    On Postgres the written row and the existing one come back from one
+    statement: the write is a data-modifying CTE, unioned with the row
+    matching ``lookup`` when the CTE returned nothing. SQLite has no
+    data-modifying CTEs, so there an unchanged profile costs a SELECT. So
+    does the rare Postgres case of a row committed by a concurrent sign-in
+    after the statement's snapshot was taken.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        written = statement.cte("upserted")
+        rows = union_all(
+            select(*written.c, literal(True).label("written")),
+            select(*User.__table__.c, literal(False).label("written")).where(
+                lookup, ~exists(select(written.c.id))
+            ),
+        ).subquery()
+        row = session.execute(
+            select(aliased(User, rows), rows.c.written),
+            execution_options={"populate_existing": True},
+        ).first()
+        if row is not None:
+            return row[0], row[1]
+    else:
+        user = session.scalars(
+            select(User).from_statement(statement),
+            execution_options={"populate_existing": True},
+        ).first()
+        if user is not None:
+            return user, True
+    # Profile unchanged: nothing was written
+    return session.exec(select(User).where(lookup)).first(), False
 
 class UserCRUD:
     @staticmethod
@@ -56,38 +128,58 @@ class UserCRUD:
     ) -> User:
         """
         Create a new user from Google OAuth or update existing user
-        """
-        # Check if user exists by email or google_id
-        user = UserCRUD.get_user_by_email(session, google_data.email)
         
-        if not user:
-            user = UserCRUD.get_user_by_google_id(session, google_data.google_id)
+        A single upsert on email inserts the user or links the existing
+        account, and writes only when the profile changed. Concurrent
+        sign-ins of the same user are resolved by the unique index, not by
+        a SELECT racing an INSERT.
         
-        if user:
-            # Update existing user
-            user.name = google_data.name
-            user.image = google_data.image
-            user.is_verified = True  # Google users are auto-verified
-            
-            # Link google_id if not already linked
-            if not user.google_id:
-                user.google_id = google_data.google_id
-            
-            user.updated_at = datetime.utcnow()
-        else:
-            # Create new user
-            user = User(
-                name=google_data.name,
-                email=google_data.email,
-                google_id=google_data.google_id,
-                image=google_data.image,
-                is_verified=True,  # Google users are pre-verified
-                password_hash=None,  # No password for OAuth users
+        On Postgres this is one statement whether or not the profile
+        changed; on SQLite an unchanged profile adds a SELECT (see
+        _written_or_existing). A google_id already linked to an account
+        under another email fails the upsert; that path rolls back and
+        updates by google_id instead, so it takes three statements on
+        Postgres and up to four on SQLite.
+        """
+        now = datetime.utcnow()
+        new_user = User(
+            name=google_data.name,
+            email=google_data.email,
+            google_id=google_data.google_id,
+            image=google_data.image,
+            is_verified=True,  # Google users are pre-verified
+            password_hash=None,  # No password for OAuth users
+            created_at=now,
+        )
+        values = {column.name: getattr(new_user, column.name) for column in User.__table__.columns if column.name != "id"}
+        profile, changed = _google_profile(google_data, now)
+        
+        statement = (
+            _insert_for(session)(User)
+            .values(**values)
+            .on_conflict_do_update(index_elements=[User.email], set_=profile, where=changed)
+            .returning(*User.__table__.columns)
+        )
+        try:
+            user, written = _written_or_existing(session, statement, User.email == google_data.email)
+        except IntegrityError:
+            # The google_id is linked to an account under another email
+            session.rollback()
+            statement = (
+                update(User)
+                .where(User.google_id == google_data.google_id, changed)
+                .values(**profile)
+                .returning(*User.__table__.columns)
+                .execution_options(synchronize_session=False)
             )
-            session.add(user)
+            user, written = _written_or_existing(session, statement, User.google_id == google_data.google_id)
+        
+        if written:
+            invalidate_on_commit(session, {user.email})
         
+        # Keep the loaded row usable after commit without a refresh query
+        session.expunge(user)
         session.commit()
-        session.refresh(user)
         return user
     
     @staticmethod
@@ -100,8 +192,15 @@ class UserCRUD:
         if not user.password_hash:
             return None
             
-        if not verify_password(password, user.password_hash):
+        verified, new_hash = verify_and_update_password(password, user.password_hash)
+        if not verified:
             return None
+        
+        # Stored with a different bcrypt cost: upgrade while we have the password
+        if new_hash:
+            user.password_hash = new_hash
+            session.commit()
+            session.refresh(user)
         return user
     
     @staticmethod
@@ -119,6 +218,7 @@ class UserCRUD:
         for field, value in update_data.items():
             if field == "password" and value:
                 user.password_hash = hash_password(value)
+                bump_token_version(user)
             elif field == "email" and value:
                 # Check if email is already taken
                 existing_user = UserCRUD.get_user_by_email(session, value)
@@ -151,6 +251,52 @@ class UserCRUD:
         return True
     
     @staticmethod
-    def get_all_users(session: Session, skip: int = 0, limit: int = 100) -> List[User]:
-        statement = select(User).offset(skip).limit(limit)
-        return list(session.exec(statement).all())
\ No newline at end of file
+    def get_all_users(
+        session: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+    ) -> List[User]:
+        """
+        Users by id; ``after_id`` (keyset) pages in constant time, ``skip``
+        does not. Given both, ``skip`` counts from ``after_id``. Only the
+        columns of UserRead are loaded up front.
+        """
+        statement = _users_page(skip, limit, after_id).options(load_only(*USER_LIST_COLUMNS))
+        return list(session.exec(statement).all())
+
+
+class AsyncUserCRUD:
+    """Read paths of UserCRUD for async endpoints (AsyncSession)"""
+    
+    @staticmethod
+    async def get_user_by_email(session: AsyncSession, email: str) -> Optional[User]:
+        statement = select(User).where(User.email == email)
+        return (await session.exec(statement)).first()
+    
+    @staticmethod
+    async def get_user_by_google_id(session: AsyncSession, google_id: str) -> Optional[User]:
+        statement = select(User).where(User.google_id == google_id)
+        return (await session.exec(statement)).first()
+    
+    @staticmethod
+    async def get_user_by_id(session: AsyncSession, user_id: int) -> Optional[User]:
+        return await session.get(User, user_id)
+    
+    @staticmethod
+    async def get_all_users(
+        session: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+    ) -> List[User]:
+        return list((await session.exec(_users_page(skip, limit, after_id))).all())
+
+
+def _users_page(skip: int, limit: int, after_id: Optional[int]):
+    statement = select(User).order_by(User.id)
+    if after_id is not None:
+        statement = statement.where(User.id > after_id)
+    if skip:
+        statement = statement.offset(skip)
+    return statement.limit(limit)
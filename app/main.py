@@ -1,8 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import create_db_and_tables
+from sqlmodel import Session
+from app.core.database import add_missing_columns, create_db_and_tables, create_trigram_index, engine, RoutingSession
+from app.models.land_models import LandRegistry
+from app.models.user import User
 from app.api import api_router
+from app.services.idempotency import idempotent_verifier
+from app.services.pagination import NEXT_CURSOR_HEADER
+from app.services.password_hashing import password_hasher
+from app.services.principal_cache import principal_broadcast
+from app.services.spatial_index import spatial_index
+from app.services.token_revocation import revocation_table
+from app.services.verification_jobs import job_queue
+from app.services.write_behind import write_behind
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -17,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
@@ -26,6 +38,32 @@ app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
+    add_missing_columns(engine, User.__table__)
+
+    if settings.REGISTRY_FUZZY_TOWN_MATCH:
+        create_trigram_index(engine, LandRegistry.__table__, "town_key")
+
+    if spatial_index.enabled:
+        with RoutingSession(engine) as session:
+            spatial_index.build(session)
+        spatial_index.start_refresh(
+            lambda: RoutingSession(engine),
+            settings.REGISTRY_SPATIAL_INDEX_REFRESH_SECONDS,
+        )
+
+    principal_broadcast.start(engine)
+    revocation_table.start(lambda: Session(engine))
+    job_queue.fail_stale()
+
+@app.on_event("startup")
+async def purge_idempotency_keys():
+    await idempotent_verifier.purge_expired()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    job_queue.shutdown()
+    password_hasher.shutdown()
+    write_behind.flush()
 
 # Health check endpoint
 @app.get("/health")
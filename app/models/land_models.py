@@ -1,8 +1,14 @@
 from datetime import datetime
 from typing import Optional, List, Dict
 import uuid
-from sqlmodel import Field, SQLModel, Column, JSON
+from sqlalchemy import event, Index, UniqueConstraint
+from sqlalchemy.orm import object_session
+from sqlmodel import Field, SQLModel, Column
 from pydantic import BaseModel
+from app.core.config import settings
+from app.services import geohash, location_keys
+from app.services.geometry_service import geometry
+from app.models.types import PolygonType
 
 # ============================================================================
 # REGISTRY DATABASE (Existing - READ ONLY)
@@ -44,7 +50,7 @@ class LandRegistry(SQLModel, table=True):
     layout: str = Field(index=True) 
     block_number: str = Field(index=True) 
     plot_number: str = Field(index=True) 
-    coordinates: List[Dict] = Field(sa_column=Column(JSON)) 
+    coordinates: List[Dict] = Field(sa_column=Column(PolygonType())) 
     area_square_meters: Optional[float] = None 
     owner_name: str 
     owner_national_id: Optional[str] = None 
@@ -55,11 +61,115 @@ class LandRegistry(SQLModel, table=True):
     registration_date: datetime = Field(default_factory=datetime.utcnow) 
     is_active: bool = Field(default=True) 
     notes: Optional[str] = None
+    # Bumped on every ORM update; the server default fills rows that
+    # predate the column when add_missing_columns adds it
+    version: int = Field(default=1, nullable=False, sa_column_kwargs={"server_default": "1"})
+
+    # Derived geometry (maintained from coordinates on insert/update)
+    centroid_lat: Optional[float] = Field(default=None, index=True)
+    centroid_lng: Optional[float] = Field(default=None, index=True)
+    bbox_min_lat: Optional[float] = None
+    bbox_min_lng: Optional[float] = None
+    bbox_max_lat: Optional[float] = None
+    bbox_max_lng: Optional[float] = None
+    projected_area_m2: Optional[float] = None
+    vertex_count: Optional[int] = None
+    geometry_hash: Optional[str] = Field(default=None, index=True)
+    geohash: Optional[str] = Field(default=None, index=True, max_length=12)
+
+    # Normalized location keys (maintained from town/layout/block/plot)
+    town_key: Optional[str] = Field(default=None, index=True)
+    layout_key: Optional[str] = Field(default=None, index=True)
+    location_key: Optional[str] = Field(default=None, index=True)
+
+
+def derive_registry_fields(
+    coordinates: Optional[List[Dict]],
+    town: str,
+    layout: str,
+    block_number: str,
+    plot_number: str,
+) -> Dict:
+    """Values of every derived LandRegistry column for a registry record"""
+    fields = geometry.derive_fields(coordinates)
+    fields["geohash"] = None
+    if fields["centroid_lat"] is not None:
+        fields["geohash"] = geohash.encode(
+            fields["centroid_lat"],
+            fields["centroid_lng"],
+            settings.REGISTRY_GEOHASH_PRECISION,
+        )
+    return _with_location_keys(fields, town, layout, block_number, plot_number)
+
+
+def derive_registry_fields_many(records: List[Dict]) -> List[Dict]:
+    """
+    ``derive_registry_fields`` for many records (dicts with coordinates,
+    town, layout, block_number and plot_number), with the geometry and
+    geohashes computed for the whole batch at once
+    """
+    derived = geometry.derive_fields_many([record["coordinates"] for record in records])
+
+    located = [i for i, fields in enumerate(derived) if fields["centroid_lat"] is not None]
+    cells = geohash.encode_many(
+        [derived[i]["centroid_lat"] for i in located],
+        [derived[i]["centroid_lng"] for i in located],
+        settings.REGISTRY_GEOHASH_PRECISION,
+    )
+    for fields in derived:
+        fields["geohash"] = None
+    for i, cell in zip(located, cells):
+        derived[i]["geohash"] = cell
+
+    return [
+        _with_location_keys(
+            fields,
+            record["town"],
+            record["layout"],
+            record["block_number"],
+            record["plot_number"],
+        )
+        for fields, record in zip(derived, records)
+    ]
+
+
+def _with_location_keys(fields: Dict, town: str, layout: str, block_number: str, plot_number: str) -> Dict:
+    fields["town_key"] = location_keys.normalize(town)
+    fields["layout_key"] = location_keys.normalize(layout)
+    fields["location_key"] = location_keys.location_key(town, layout, block_number, plot_number)
+    return fields
+
+
+@event.listens_for(LandRegistry, "before_insert")
+@event.listens_for(LandRegistry, "before_update")
+def _maintain_derived_fields(mapper, connection, target: LandRegistry) -> None:
+    """Keep derived geometry and location key columns in step with the record"""
+    fields = derive_registry_fields(
+        target.coordinates,
+        target.town,
+        target.layout,
+        target.block_number,
+        target.plot_number,
+    )
+    for field, value in fields.items():
+        setattr(target, field, value)
+
+
+@event.listens_for(LandRegistry, "before_update")
+def _bump_version(mapper, connection, target: LandRegistry) -> None:
+    """Count changes so results computed against a record can be scoped to it"""
+    session = object_session(target)
+    if session is not None and session.is_modified(target, include_collections=False):
+        target.version = (target.version or 1) + 1
 
 
 class VerificationRequest(SQLModel, table=True):
     """Stores verification requests and results"""
     __tablename__ = "verification_requests"
+    # Serves keyset pagination of a user's history, newest first
+    __table_args__ = (
+        Index("ix_verification_requests_user_history", "user_id", "requested_at", "id"),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
@@ -69,7 +179,7 @@ class VerificationRequest(SQLModel, table=True):
     submitted_layout: str
     submitted_block: str
     submitted_plot: str
-    submitted_coords: List[Dict] = Field(sa_column=Column(JSON))
+    submitted_coords: List[Dict] = Field(sa_column=Column(PolygonType()))
     
     # Verification results
     status: str = Field(default="pending")  # pending, verified, failed, fraudulent
@@ -80,7 +190,8 @@ class VerificationRequest(SQLModel, table=True):
     location_match: Optional[bool] = None
     coordinates_match: Optional[bool] = None
     
-    # Scores (simple 0-1)
+    # Scores (simple 0-1). overlap_score is the IoU when it was computed,
+    # else the area ratio (always for pairs a coordinate vote rejected)
     overlap_score: Optional[float] = None
     distance_meters: Optional[float] = None
     
@@ -90,11 +201,25 @@ class VerificationRequest(SQLModel, table=True):
     
     # Official data (if verified)
     official_owner: Optional[str] = None
-    official_coords: Optional[List[Dict]] = Field(sa_column=Column(JSON), default=None)
+    official_coords: Optional[List[Dict]] = Field(sa_column=Column(PolygonType()), default=None)
     official_area: Optional[float] = None
     official_certificate_pdf_url: Optional[str] = None
     official_certificate_number: Optional[str] = None
     
     # Timestamps
     requested_at: datetime = Field(default_factory=datetime.utcnow, index=True)
-    verified_at: Optional[datetime] = None
\ No newline at end of file
+    verified_at: Optional[datetime] = None
+
+
+class IdempotencyRecord(SQLModel, table=True):
+    """Verification created for a client's Idempotency-Key, until it expires"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "key"),)
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    key: str = Field(max_length=255)
+    request_hash: str = Field(max_length=64)  # sha256 of the request body
+    verification_id: uuid.UUID = Field(foreign_key="verification_requests.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(index=True)
@@ -0,0 +1,188 @@
+"""
+Compact polygon storage for coordinate columns.
+
+Coordinates have always been stored as JSON arrays of ``{"lat", "lng"}``
+dicts. ``PolygonType`` keeps that as the default and can instead store
+them as packed binary, selected by ``settings.POLYGON_STORAGE``:
+
+- ``json``:  JSON list of dicts (default, unchanged)
+- ``wkb``:   little-endian WKB Polygon, float64 (x=lng, y=lat), ring closed
+- ``int32``: 1e-7 degree scaled int32 pairs (about 1 cm), half the size
+
+Binary values are returned as ``PackedPolygon``, which only decodes its
+bytes when the coordinates are first accessed.
+"""
+import json
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import JSON, LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import settings
+
+STORAGE_FORMATS = ("json", "wkb", "int32")
+
+_WKB_HEADER = struct.Struct("<BIII")  # byte order, type, ring count, point count
+_WKB_POLYGON = 3
+_INT32_MAGIC = b"PI7"
+_INT32_HEADER = struct.Struct("<3sI")  # magic, point count
+_INT32_SCALE = 1e7
+
+
+class PackedPolygon:
+    """
+    Array-backed polygon that behaves like the list of ``{"lat", "lng"}``
+    dicts it replaces. The (n, 2) ``array`` of (lat, lng) is decoded from
+    the stored bytes on first use.
+    """
+
+    __slots__ = ("_raw", "_array")
+
+    def __init__(self, raw: Optional[bytes] = None, array: Optional[np.ndarray] = None):
+        self._raw = raw
+        self._array = array
+
+    @classmethod
+    def from_coordinates(cls, coords) -> "PackedPolygon":
+        if isinstance(coords, PackedPolygon):
+            return coords
+        array = np.array([(c["lat"], c["lng"]) for c in coords], dtype=np.float64).reshape(-1, 2)
+        return cls(array=array)
+
+    @property
+    def array(self) -> np.ndarray:
+        if self._array is None:
+            self._array = _decode(self._raw)
+        return self._array
+
+    @property
+    def raw(self) -> Optional[bytes]:
+        return self._raw
+
+    def points(self) -> List[Tuple[float, float]]:
+        """(lat, lng) tuples, as ``SimpleGeometry.points_to_list`` returns"""
+        return [tuple(point) for point in self.array.tolist()]
+
+    def to_list(self) -> List[Dict]:
+        return [{"lat": lat, "lng": lng} for lat, lng in self.array.tolist()]
+
+    def __len__(self) -> int:
+        if self._array is None and self._raw is not None:
+            return _point_count(self._raw)
+        return len(self.array)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, index: int) -> Dict:
+        lat, lng = self.array[index].tolist()
+        return {"lat": lat, "lng": lng}
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_list())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PackedPolygon):
+            return np.array_equal(self.array, other.array)
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PackedPolygon({len(self)} points)"
+
+
+def encode(coords, storage: str) -> bytes:
+    """Pack coordinates (dict list or PackedPolygon) in a binary format"""
+    polygon = PackedPolygon.from_coordinates(coords)
+    if polygon.raw is not None and _format_of(polygon.raw) == storage:
+        return polygon.raw
+
+    array = polygon.array
+    if storage == "wkb":
+        ring = array[:, ::-1]  # WKB is x/y, i.e. lng/lat
+        if len(ring) and not np.array_equal(ring[0], ring[-1]):
+            ring = np.vstack([ring, ring[:1]])
+        return _WKB_HEADER.pack(1, _WKB_POLYGON, 1, len(ring)) + ring.astype("<f8").tobytes()
+
+    if storage == "int32":
+        scaled = np.round(array * _INT32_SCALE).astype("<i4")
+        return _INT32_HEADER.pack(_INT32_MAGIC, len(scaled)) + scaled.tobytes()
+
+    raise ValueError(f"Unknown binary polygon storage: {storage}")
+
+
+def _format_of(raw: bytes) -> str:
+    return "int32" if raw[:3] == _INT32_MAGIC else "wkb"
+
+
+def _point_count(raw: bytes) -> int:
+    if _format_of(raw) == "int32":
+        return _INT32_HEADER.unpack_from(raw)[1]
+    count = _WKB_HEADER.unpack_from(raw)[3]
+    return max(count - 1, 0) if count > 1 else count
+
+
+def _decode(raw: bytes) -> np.ndarray:
+    if _format_of(raw) == "int32":
+        count = _INT32_HEADER.unpack_from(raw)[1]
+        scaled = np.frombuffer(raw, dtype="<i4", count=count * 2, offset=_INT32_HEADER.size)
+        return scaled.reshape(-1, 2) / _INT32_SCALE
+
+    byte_order, geometry_type, rings, count = _WKB_HEADER.unpack_from(raw)
+    if byte_order != 1 or geometry_type != _WKB_POLYGON or rings != 1:
+        raise ValueError("Only little-endian single-ring WKB polygons are supported")
+    ring = np.frombuffer(raw, dtype="<f8", count=count * 2, offset=_WKB_HEADER.size).reshape(-1, 2)
+    if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+        ring = ring[:-1]
+    return ring[:, ::-1]
+
+
+def decode_any(value) -> Optional[Union[List[Dict], PackedPolygon]]:
+    """Coordinates from any stored representation: JSON text, parsed JSON or bytes"""
+    if value is None:
+        return None
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+    if isinstance(value, (bytes, bytearray)):
+        return PackedPolygon(bytes(value))
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def coordinates_as_list(value) -> Optional[List[Dict]]:
+    """Plain list of dicts for responses, whatever the column storage"""
+    if isinstance(value, PackedPolygon):
+        return value.to_list()
+    return value
+
+
+class PolygonType(TypeDecorator):
+    """Coordinate column stored as JSON or packed binary per POLYGON_STORAGE"""
+
+    impl = JSON
+    cache_ok = True
+
+    def __init__(self, storage: Optional[str] = None):
+        super().__init__()
+        self.storage = storage or settings.POLYGON_STORAGE
+        if self.storage not in STORAGE_FORMATS:
+            raise ValueError(f"POLYGON_STORAGE must be one of {STORAGE_FORMATS}")
+
+    def load_dialect_impl(self, dialect):
+        if self.storage == "json":
+            return dialect.type_descriptor(JSON())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if self.storage == "json":
+            return coordinates_as_list(value)
+        return encode(value, self.storage)
+
+    def process_result_value(self, value, dialect):
+        return decode_any(value)
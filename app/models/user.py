@@ -21,5 +21,6 @@ class User(SQLModel, table=True):
     is_verified: bool = Field(default=False)  # Google users auto-verified
     role: UserRole = Field(default=UserRole.USER)
     is_active: bool = Field(default=True)
+    token_version: int = Field(default=0)  # bumped to end existing sessions (see app/services/token_revocation.py)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = Field(default=None)
\ No newline at end of file
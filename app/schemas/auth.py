@@ -8,8 +8,12 @@ class GoogleAuthPayload(BaseModel):
     google_id: str
     image: Optional[str] = None
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
 class AuthResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     user_id: int
-    role: str
\ No newline at end of file
+    role: str
+    refresh_token: Optional[str] = None
\ No newline at end of file
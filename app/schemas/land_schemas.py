@@ -32,7 +32,7 @@ class VerificationResult(BaseModel):
     # Match details
     location_match: Optional[bool] = None
     coordinates_match: Optional[bool] = None
-    overlap_percent: Optional[float] = None
+    overlap_percent: Optional[float] = None  # IoU, or the area ratio when IoU was not computed
     distance_meters: Optional[float] = None
     
     # Fraud
@@ -43,6 +43,11 @@ class VerificationResult(BaseModel):
     official_owner: Optional[str] = None
     official_area: Optional[float] = None
 
+class VerificationAccepted(BaseModel):
+    """Async verification job accepted"""
+    verification_id: uuid.UUID
+    status: str = "pending"
+
 class VerificationHistory(BaseModel):
     """History item"""
     id: uuid.UUID
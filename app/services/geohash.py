@@ -0,0 +1,115 @@
+"""
+Geohash encoding for registry cells.
+
+Parcels carry the geohash of their centroid at a fixed precision, so a
+proximity search becomes an indexed ``geohash IN (...)`` over the target
+cell and its eight neighbours on any SQL backend.
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(BASE32)}
+_ALPHABET = np.array(list(BASE32))
+
+
+def encode(lat: float, lng: float, precision: int) -> str:
+    """Geohash of a point at the given number of characters"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash interleaves bits starting with longitude
+
+    while len(chars) < precision:
+        value, bounds = (lng, lng_range) if even else (lat, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            bounds[0] = mid
+        else:
+            bits <<= 1
+            bounds[1] = mid
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def encode_many(lats: Sequence[float], lngs: Sequence[float], precision: int) -> List[str]:
+    """
+    ``encode`` for many points at once: the same bisection, run on arrays,
+    so every point gets exactly the cell ``encode`` gives it
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    bounds = {
+        "lat": (lats, np.full(len(lats), -90.0), np.full(len(lats), 90.0)),
+        "lng": (lngs, np.full(len(lngs), -180.0), np.full(len(lngs), 180.0)),
+    }
+    codes = np.zeros((len(lats), precision), dtype=np.int64)
+
+    for bit in range(5 * precision):
+        values, low, high = bounds["lng" if bit % 2 == 0 else "lat"]
+        mid = (low + high) / 2
+        upper = values >= mid
+        np.copyto(low, mid, where=upper)
+        np.copyto(high, mid, where=~upper)
+        codes[:, bit // 5] = (codes[:, bit // 5] << 1) | upper
+
+    chars = _ALPHABET[codes]
+    return chars.view(f"<U{precision}").ravel().tolist() if len(chars) else []
+
+
+def decode_cell(geohash: str) -> Tuple[float, float, float, float]:
+    """(center_lat, center_lng, lat_half_height, lng_half_width) of a cell"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bounds = lng_range if even else lat_range
+            mid = (bounds[0] + bounds[1]) / 2
+            if (value >> shift) & 1:
+                bounds[0] = mid
+            else:
+                bounds[1] = mid
+            even = not even
+
+    return (
+        (lat_range[0] + lat_range[1]) / 2,
+        (lng_range[0] + lng_range[1]) / 2,
+        (lat_range[1] - lat_range[0]) / 2,
+        (lng_range[1] - lng_range[0]) / 2,
+    )
+
+
+def neighbours(geohash: str) -> List[str]:
+    """The up to eight cells surrounding a geohash cell"""
+    lat, lng, half_lat, half_lng = decode_cell(geohash)
+    cells = []
+    for dlat in (-1, 0, 1):
+        for dlng in (-1, 0, 1):
+            if dlat == 0 and dlng == 0:
+                continue
+            n_lat = lat + dlat * 2 * half_lat
+            if not -90 < n_lat < 90:
+                continue
+            n_lng = (lng + dlng * 2 * half_lng + 180) % 360 - 180
+            cells.append(encode(n_lat, n_lng, len(geohash)))
+    return cells
+
+
+def covering_cells(lat: float, lng: float, precision: int) -> List[str]:
+    """A point's cell plus its neighbours, deduplicated"""
+    cell = encode(lat, lng, precision)
+    return list(dict.fromkeys([cell, *neighbours(cell)]))
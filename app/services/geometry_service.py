@@ -1,106 +1,741 @@
+import hashlib
 import math
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Sequence, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.types import PackedPolygon
+
+CLIP_EPSILON = 1e-9  # square meters, absorbs rounding on shared edges
+SMALL_RING = 64  # below this many vertices plain Python clips faster than NumPy
+SMALL_POLYGON = 48  # up to this many vertices per ring, IoU runs in plain Python end to end
+SIMPLIFY_TOLERANCE = 0.01  # meters, far below GPS survey precision
+
+
+class PolygonBatch:
+    """
+    Ragged batch of polygons packed into flat NumPy arrays.
+
+    ``vertices`` holds every (lat, lng) pair back to back and ``offsets``
+    marks where each polygon starts, so polygon ``i`` is
+    ``vertices[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(self, vertices: np.ndarray, offsets: np.ndarray):
+        self.vertices = vertices
+        self.offsets = offsets
+        self.counts = np.diff(offsets)
+
+    @classmethod
+    def from_polygons(cls, polygons: Sequence[Sequence[Tuple[float, float]]]) -> "PolygonBatch":
+        """Pack a sequence of point lists into one batch"""
+        counts = np.fromiter((len(p) for p in polygons), dtype=np.int64, count=len(polygons))
+        offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        if offsets[-1]:
+            vertices = np.array(
+                [point for polygon in polygons for point in polygon],
+                dtype=np.float64,
+            ).reshape(-1, 2)
+        else:
+            vertices = np.empty((0, 2), dtype=np.float64)
+
+        return cls(vertices, offsets)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def _segment_starts(self, mask: np.ndarray) -> np.ndarray:
+        # reduceat cannot express empty segments, so empty polygons are
+        # masked out and their results filled in by the caller
+        return self.offsets[:-1][mask]
+
+    def centroids(self) -> np.ndarray:
+        """Vertex-average centroid per polygon, shape (N, 2)"""
+        out = np.zeros((len(self), 2), dtype=np.float64)
+        nonempty = self.counts > 0
+        if nonempty.any():
+            sums = np.add.reduceat(self.vertices, self._segment_starts(nonempty), axis=0)
+            out[nonempty] = sums / self.counts[nonempty, None]
+        return out
+
+    def areas(self) -> np.ndarray:
+        """Shoelace area per polygon in squared degrees, shape (N,)"""
+        out = np.zeros(len(self), dtype=np.float64)
+        valid = self.counts >= 3
+        if not valid.any():
+            return out
+
+        # Index of the next vertex, wrapping around inside each polygon
+        nxt = np.arange(len(self.vertices)) + 1
+        nonempty = self.counts > 0
+        nxt[self.offsets[1:][nonempty] - 1] = self.offsets[:-1][nonempty]
+
+        x = self.vertices[:, 0]
+        y = self.vertices[:, 1]
+        cross = x * y[nxt] - x[nxt] * y
+
+        sums = np.add.reduceat(cross, self._segment_starts(nonempty))
+        out[nonempty] = np.abs(sums) / 2.0
+        out[~valid] = 0.0
+        return out
+
+    def polygon(self, index: int) -> np.ndarray:
+        """Vertices of one polygon as an (n, 2) view"""
+        return self.vertices[self.offsets[index]:self.offsets[index + 1]]
+
+    def bboxes(self) -> np.ndarray:
+        """(min_lat, min_lng, max_lat, max_lng) per polygon, shape (N, 4)"""
+        out = np.zeros((len(self), 4), dtype=np.float64)
+        nonempty = self.counts > 0
+        if nonempty.any():
+            starts = self._segment_starts(nonempty)
+            out[nonempty, :2] = np.minimum.reduceat(self.vertices, starts, axis=0)
+            out[nonempty, 2:] = np.maximum.reduceat(self.vertices, starts, axis=0)
+        return out
+
+
+def _signed_area(xy: np.ndarray) -> float:
+    """Shoelace signed area of planar (x, y) vertices, CCW positive"""
+    if len(xy) < 3:
+        return 0.0
+    x = xy[:, 0]
+    y = xy[:, 1]
+    return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2.0
+
+
+def _is_convex(xy: np.ndarray) -> bool:
+    """True when every turn along the ring goes the same way"""
+    if len(xy) < 4:
+        return True
+    edges = np.roll(xy, -1, axis=0) - xy
+    turns = edges[:, 0] * np.roll(edges[:, 1], -1) - edges[:, 1] * np.roll(edges[:, 0], -1)
+    return bool((turns >= -CLIP_EPSILON).all() or (turns <= CLIP_EPSILON).all())
+
+
+def _clip_halfplane_small(subject: List[Tuple[float, float]], a, b) -> List[Tuple[float, float]]:
+    """One Sutherland-Hodgman step in plain Python, cheaper for short rings"""
+    ax, ay = a
+    ex, ey = b[0] - ax, b[1] - ay
+
+    output = []
+    prev = subject[-1]
+    prev_side = ex * (prev[1] - ay) - ey * (prev[0] - ax)
+    for cur in subject:
+        side = ex * (cur[1] - ay) - ey * (cur[0] - ax)
+        cur_inside = side >= -CLIP_EPSILON
+        if cur_inside != (prev_side >= -CLIP_EPSILON):
+            t = prev_side / (prev_side - side)
+            output.append((prev[0] + t * (cur[0] - prev[0]), prev[1] + t * (cur[1] - prev[1])))
+        if cur_inside:
+            output.append(cur)
+        prev, prev_side = cur, side
+    return output
+
+
+def _signed_area_small(ring: List[Tuple[float, float]]) -> float:
+    """``_signed_area`` for a point list"""
+    if len(ring) < 3:
+        return 0.0
+    total = 0.0
+    prev = ring[-1]
+    for cur in ring:
+        total += prev[0] * cur[1] - cur[0] * prev[1]
+        prev = cur
+    return total / 2.0
+
+
+def _is_convex_small(ring: List[Tuple[float, float]]) -> bool:
+    """``_is_convex`` for a point list"""
+    if len(ring) < 4:
+        return True
+    left = right = False
+    n = len(ring)
+    for i in range(n):
+        (x0, y0), (x1, y1), (x2, y2) = ring[i], ring[(i + 1) % n], ring[(i + 2) % n]
+        turn = (x1 - x0) * (y2 - y1) - (y1 - y0) * (x2 - x1)
+        if turn < -CLIP_EPSILON:
+            right = True
+        elif turn > CLIP_EPSILON:
+            left = True
+    return not (left and right)
+
+
+def _clip_convex_small(subject: List[Tuple[float, float]], clip: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """``_clip_convex`` for point lists"""
+    for i in range(len(clip)):
+        subject = _clip_halfplane_small(subject, clip[i], clip[(i + 1) % len(clip)])
+        if not subject:
+            break
+    return subject
+
+
+def _intersection_area_small(ring1: List[Tuple[float, float]], ring2: List[Tuple[float, float]]) -> float:
+    """
+    ``_intersection_area`` in plain Python, for rings of at most
+    SMALL_POLYGON vertices: NumPy's per-call overhead dominates there
+    """
+    if _signed_area_small(ring2) < 0:
+        ring2 = ring2[::-1]
+    if _is_convex_small(ring2):
+        return abs(_signed_area_small(_clip_convex_small(ring1, ring2)))
+
+    if _signed_area_small(ring1) < 0:
+        ring1 = ring1[::-1]
+    if _is_convex_small(ring1):
+        return abs(_signed_area_small(_clip_convex_small(ring2, ring1)))
+
+    total = 0.0
+    for i in range(1, len(ring2) - 1):
+        triangle = [ring2[0], ring2[i], ring2[i + 1]]
+        orientation = _signed_area_small(triangle)
+        if orientation == 0:
+            continue
+        if orientation < 0:
+            triangle.reverse()
+        clipped = abs(_signed_area_small(_clip_convex_small(ring1, triangle)))
+        total += clipped if orientation > 0 else -clipped
+    return max(total, 0.0)
+
+
+def _clip_halfplane(subject: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """One Sutherland-Hodgman step: keep the part of ``subject`` left of a->b"""
+    side = (b[0] - a[0]) * (subject[:, 1] - a[1]) - (b[1] - a[1]) * (subject[:, 0] - a[0])
+    inside = side >= -CLIP_EPSILON
+    if inside.all():
+        return subject
+    if not inside.any():
+        return subject[:0]
+
+    # Edge (i - 1) -> i crosses the clip line: emit the intersection
+    # point, then vertex i if it is inside. Only the few crossing edges
+    # need any arithmetic; everything else is a splice of kept vertices.
+    crossing = np.flatnonzero(inside != np.concatenate((inside[-1:], inside[:-1])))
+    prev = crossing - 1
+    t = side[prev] / (side[prev] - side[crossing])
+    intersections = subject[prev] + t[:, None] * (subject[crossing] - subject[prev])
+
+    emitted = np.zeros(len(subject), dtype=np.int64)
+    emitted[crossing] = 1
+    slots = np.cumsum(emitted + inside) - inside  # slot after any intersection
+
+    output = np.empty((len(crossing) + int(inside.sum()), 2), dtype=np.float64)
+    output[slots[inside]] = subject[inside]
+    output[slots[crossing] - 1] = intersections
+    return output
+
+
+def _clip_convex(subject: np.ndarray, clip: np.ndarray) -> np.ndarray:
+    """Clip any simple polygon by a convex, counter-clockwise one"""
+    ends = np.roll(clip, -1, axis=0)
+
+    # Clip edges that already have the whole subject on their inner side
+    # cannot cut anything away, so they are skipped up front
+    edges = ends - clip
+    rel_x = subject[None, :, 0] - clip[:, None, 0]
+    rel_y = subject[None, :, 1] - clip[:, None, 1]
+    sides = edges[:, 0, None] * rel_y - edges[:, 1, None] * rel_x
+    cutting = np.flatnonzero((sides < -CLIP_EPSILON).any(axis=1))
+
+    if len(subject) <= SMALL_RING:
+        points = [tuple(p) for p in subject.tolist()]
+        for i in cutting.tolist():
+            points = _clip_halfplane_small(points, clip[i].tolist(), ends[i].tolist())
+            if not points:
+                break
+        return np.array(points, dtype=np.float64).reshape(-1, 2)
+
+    for i in cutting:
+        subject = _clip_halfplane(subject, clip[i], ends[i])
+        if len(subject) == 0:
+            break
+    return subject
+
+
+def _simplify(ring: np.ndarray, tolerance: float) -> np.ndarray:
+    """Douglas-Peucker simplification of a ring in planar meters"""
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[0] = keep[-1] = True
+
+    stack = [(0, len(ring) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a = ring[first]
+        d = ring[last] - a
+        between = ring[first + 1:last]
+        length = np.hypot(d[0], d[1])
+        if length == 0:
+            dist = np.hypot(between[:, 0] - a[0], between[:, 1] - a[1])
+        else:
+            dist = np.abs(d[0] * (between[:, 1] - a[1]) - d[1] * (between[:, 0] - a[0])) / length
+        farthest = int(dist.argmax())
+        if dist[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return ring[keep]
+
+
+def _intersection_area(poly1: np.ndarray, poly2: np.ndarray) -> float:
+    """Area of the intersection of two simple planar polygons"""
+    # Clipping costs one pass per clip edge, so long traced rings are
+    # first thinned to within SIMPLIFY_TOLERANCE of their outline
+    if len(poly1) > SMALL_RING:
+        poly1 = _simplify(poly1, SIMPLIFY_TOLERANCE)
+    if len(poly2) > SMALL_RING:
+        poly2 = _simplify(poly2, SIMPLIFY_TOLERANCE)
+
+    if _signed_area(poly2) < 0:
+        poly2 = poly2[::-1]
+    if _is_convex(poly2):
+        return abs(_signed_area(_clip_convex(poly1, poly2)))
+
+    if _signed_area(poly1) < 0:
+        poly1 = poly1[::-1]
+    if _is_convex(poly1):
+        return abs(_signed_area(_clip_convex(poly2, poly1)))
+
+    # Neither side is convex: fan-triangulate poly2 from its first vertex.
+    # The signed triangles add up to poly2 exactly, so clipping poly1 by
+    # each one and summing with the triangle's sign gives the overlap.
+    total = 0.0
+    for i in range(1, len(poly2) - 1):
+        triangle = np.stack([poly2[0], poly2[i], poly2[i + 1]])
+        orientation = _signed_area(triangle)
+        if orientation == 0:
+            continue
+        if orientation < 0:
+            triangle = triangle[::-1]
+        clipped = abs(_signed_area(_clip_convex(poly1, triangle)))
+        total += clipped if orientation > 0 else -clipped
+    return max(total, 0.0)
+
 
 class SimpleGeometry:
     """Minimal geometry calculations"""
-    
+
     EARTH_RADIUS = 6371000  # meters
-    
+
     def points_to_list(self, coords: List[Dict]) -> List[Tuple[float, float]]:
         """Convert dict coordinates to list of tuples"""
+        if isinstance(coords, PackedPolygon):
+            return coords.points()
         return [(c['lat'], c['lng']) for c in coords]
-    
+
+    # ------------------------------------------------------------------
+    # Scalar API: plain Python, cheapest for the handful of vertices a
+    # plot has. Same formulas as the batch API; results agree with it to
+    # floating-point rounding.
+    # ------------------------------------------------------------------
+
     def calculate_centroid(self, points: List[Tuple[float, float]]) -> Tuple[float, float]:
         """Simple centroid calculation"""
         if not points:
             return (0, 0)
-        
+
         lats = [p[0] for p in points]
         lngs = [p[1] for p in points]
         return (sum(lats)/len(lats), sum(lngs)/len(lngs))
-    
+
     def haversine_distance(self, point1: Tuple[float, float], point2: Tuple[float, float]) -> float:
         """Distance between two points in meters"""
         lat1, lon1 = math.radians(point1[0]), math.radians(point1[1])
         lat2, lon2 = math.radians(point2[0]), math.radians(point2[1])
-        
+
         dlat = lat2 - lat1
         dlon = lon2 - lon1
-        
+
         a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
         c = 2 * math.asin(math.sqrt(a))
-        
+
         return self.EARTH_RADIUS * c
-    
+
     def polygon_area(self, points: List[Tuple[float, float]]) -> float:
         """Area using shoelace formula"""
         if len(points) < 3:
             return 0.0
-        
+
         area = 0.0
         n = len(points)
-        
+
         for i in range(n):
             j = (i + 1) % n
-            area += points[i][0] * points[j][1]
-            area -= points[j][0] * points[i][1]
-        
+            area += points[i][0] * points[j][1] - points[j][0] * points[i][1]
+
         return abs(area) / 2.0
-    
-    def compare_polygons(self, poly1: List[Tuple[float, float]], 
+
+    def bounding_box(self, points: List[Tuple[float, float]]) -> Tuple[float, float, float, float]:
+        """(min_lat, min_lng, max_lat, max_lng) of a non-empty polygon"""
+        lats = [p[0] for p in points]
+        lngs = [p[1] for p in points]
+        return (min(lats), min(lngs), max(lats), max(lngs))
+
+    def compare_polygons(self, poly1: List[Tuple[float, float]],
                         poly2: List[Tuple[float, float]]) -> Dict:
         """
         Simple polygon comparison with 3 checks:
         1. Centroid distance
         2. Area similarity
         3. Bounding box overlap
+
+        With COORDINATES_IOU_REQUIRED, a pair that passes the checks must
+        also overlap by COORDINATES_OVERLAP_THRESHOLD (intersection over
+        union in square meters); ``iou`` is None when it was not needed.
         """
         # 1. Centroid distance
-        centroid1 = self.calculate_centroid(poly1)
-        centroid2 = self.calculate_centroid(poly2)
-        distance = self.haversine_distance(centroid1, centroid2)
-        
+        distance = self.haversine_distance(self.calculate_centroid(poly1), self.calculate_centroid(poly2))
+
         # 2. Area similarity
         area1 = self.polygon_area(poly1)
         area2 = self.polygon_area(poly2)
-        
+
         if area2 == 0:
             area_ratio = 0.0
         else:
             area_ratio = min(area1, area2) / max(area1, area2)
-        
+
         # 3. Bounding box overlap (simplified)
-        def get_bbox(points):
-            lats = [p[0] for p in points]
-            lngs = [p[1] for p in points]
-            return (min(lats), min(lngs), max(lats), max(lngs))
-        
-        bbox1 = get_bbox(poly1)
-        bbox2 = get_bbox(poly2)
-        
-        # Check if bboxes intersect
+        bbox1 = self.bounding_box(poly1)
+        bbox2 = self.bounding_box(poly2)
+
         bbox_overlap = not (bbox1[2] < bbox2[0] or bbox2[2] < bbox1[0] or
-                           bbox1[3] < bbox2[1] or bbox2[3] < bbox1[1])
-        
+                            bbox1[3] < bbox2[1] or bbox2[3] < bbox1[1])
+
         # Simple scoring
         passes = 0
-        if distance <= 10:  # 10 meters
+        if distance <= settings.COORDINATES_CENTROID_DISTANCE_METERS:
             passes += 1
-        if area_ratio >= 0.9:  # 90% area match
+        if area_ratio >= settings.COORDINATES_AREA_RATIO_THRESHOLD:
             passes += 1
         if bbox_overlap:
             passes += 1
-        
-        # Match if 2 out of 3 pass
-        coordinates_match = passes >= 2
-        
+
+        # Match if enough checks pass (2 of 3 by default)
+        coordinates_match = passes >= settings.COORDINATES_REQUIRED_VOTES
+
+        # Clipping costs far more than the checks above: only pairs they
+        # accepted are clipped, and only when IoU is enforced
+        iou = None
+        if settings.COORDINATES_IOU_REQUIRED and coordinates_match:
+            iou = self.polygon_iou(poly1, poly2)
+            coordinates_match = iou >= settings.COORDINATES_OVERLAP_THRESHOLD
+
         return {
             'match': coordinates_match,
             'distance_meters': distance,
             'area_ratio': area_ratio,
             'bbox_overlap': bbox_overlap,
-            'passes': passes
+            'passes': passes,
+            'iou': iou,
+        }
+
+    def to_local_meters(self, points: np.ndarray, origin: Tuple[float, float]) -> np.ndarray:
+        """
+        Project (lat, lng) points to planar (x east, y north) meters with an
+        equirectangular projection centred on ``origin``. Accurate to well
+        under a meter across a single parcel.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        lat0 = np.radians(origin[0])
+        x = np.radians(points[:, 1] - origin[1]) * np.cos(lat0) * self.EARTH_RADIUS
+        y = np.radians(points[:, 0] - origin[0]) * self.EARTH_RADIUS
+        return np.column_stack([x, y])
+
+    def _local_rings(self, poly1, poly2) -> Tuple[np.ndarray, np.ndarray]:
+        """Project both polygons around their shared midpoint, dropping closing vertices"""
+        rings = []
+        for poly in (poly1, poly2):
+            ring = np.asarray(poly, dtype=np.float64).reshape(-1, 2)
+            if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+                ring = ring[:-1]
+            rings.append(ring)
+
+        origin = (np.concatenate(rings).min(axis=0) + np.concatenate(rings).max(axis=0)) / 2
+        return (
+            self.to_local_meters(rings[0], origin),
+            self.to_local_meters(rings[1], origin),
+        )
+
+    def _local_rings_small(self, poly1, poly2) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """``_local_rings`` for short rings, as point lists"""
+        rings = []
+        for poly in (poly1, poly2):
+            ring = [(float(lat), float(lng)) for lat, lng in poly]
+            if len(ring) > 1 and ring[0] == ring[-1]:
+                ring = ring[:-1]
+            rings.append(ring)
+
+        lats = [p[0] for ring in rings for p in ring]
+        lngs = [p[1] for ring in rings for p in ring]
+        lat0 = (min(lats) + max(lats)) / 2
+        lng0 = (min(lngs) + max(lngs)) / 2
+        scale_x = math.cos(math.radians(lat0)) * self.EARTH_RADIUS
+        return tuple(
+            [(math.radians(lng - lng0) * scale_x, math.radians(lat - lat0) * self.EARTH_RADIUS) for lat, lng in ring]
+            for ring in rings
+        )
+
+    def polygon_area_m2(self, points: List[Tuple[float, float]]) -> float:
+        """Area in square meters on a local projection around the polygon"""
+        if len(points) < 3:
+            return 0.0
+        ring, _ = self._local_rings(points, points)
+        return abs(_signed_area(ring))
+
+    def polygon_iou(self, poly1: List[Tuple[float, float]],
+                    poly2: List[Tuple[float, float]]) -> float:
+        """
+        Intersection over union of two (lat, lng) polygons, measured in
+        square meters on a shared local projection.
+        """
+        if len(poly1) < 3 or len(poly2) < 3:
+            return 0.0
+
+        # Disjoint bboxes cannot overlap: no clipping needed
+        bbox1 = self.bounding_box(poly1)
+        bbox2 = self.bounding_box(poly2)
+        if bbox1[2] < bbox2[0] or bbox2[2] < bbox1[0] or bbox1[3] < bbox2[1] or bbox2[3] < bbox1[1]:
+            return 0.0
+
+        if len(poly1) <= SMALL_POLYGON and len(poly2) <= SMALL_POLYGON:
+            ring1, ring2 = self._local_rings_small(poly1, poly2)
+            signed_area, intersection_area = _signed_area_small, _intersection_area_small
+        else:
+            ring1, ring2 = self._local_rings(poly1, poly2)
+            signed_area, intersection_area = _signed_area, _intersection_area
+
+        area1 = abs(signed_area(ring1))
+        area2 = abs(signed_area(ring2))
+        if area1 == 0 or area2 == 0:
+            return 0.0
+
+        intersection = min(intersection_area(ring1, ring2), area1, area2)
+        return intersection / (area1 + area2 - intersection)
+
+    def polygon_hash(self, points: List[Tuple[float, float]]) -> str:
+        """
+        Canonical hash of a polygon's outline.
+
+        Coordinates are rounded to 1e-7 degrees (about 1 cm), a closing
+        vertex is dropped, the ring is turned counter-clockwise and rotated
+        to start at its smallest vertex, so the same outline hashes the
+        same whatever vertex it starts from or which way it winds.
+        """
+        ring = [(round(lat * 1e7), round(lng * 1e7)) for lat, lng in points]
+        if len(ring) > 1 and ring[0] == ring[-1]:
+            ring = ring[:-1]
+
+        if len(ring) >= 3:
+            twice_area = sum(
+                ring[i][0] * ring[(i + 1) % len(ring)][1] - ring[(i + 1) % len(ring)][0] * ring[i][1]
+                for i in range(len(ring))
+            )
+            if twice_area < 0:
+                ring.reverse()
+
+        if ring:
+            start = ring.index(min(ring))
+            ring = ring[start:] + ring[:start]
+
+        canonical = ";".join(f"{lat},{lng}" for lat, lng in ring)
+        return hashlib.sha256(canonical.encode("ascii")).hexdigest()
+
+    def derive_fields(self, coords: Optional[List[Dict]]) -> Dict:
+        """
+        Derived geometry persisted alongside registry coordinates, so
+        searches can filter on centroid/bbox without decoding the JSON.
+        """
+        points = self.points_to_list(coords or [])
+        if not points:
+            return {
+                'centroid_lat': None,
+                'centroid_lng': None,
+                'bbox_min_lat': None,
+                'bbox_min_lng': None,
+                'bbox_max_lat': None,
+                'bbox_max_lng': None,
+                'projected_area_m2': None,
+                'vertex_count': 0,
+                'geometry_hash': None,
+            }
+
+        centroid_lat, centroid_lng = self.calculate_centroid(points)
+        min_lat, min_lng, max_lat, max_lng = self.bounding_box(points)
+
+        return {
+            'centroid_lat': centroid_lat,
+            'centroid_lng': centroid_lng,
+            'bbox_min_lat': min_lat,
+            'bbox_min_lng': min_lng,
+            'bbox_max_lat': max_lat,
+            'bbox_max_lng': max_lng,
+            'projected_area_m2': self.polygon_area_m2(points),
+            'vertex_count': len(points),
+            'geometry_hash': self.polygon_hash(points),
+        }
+
+    def degree_window(self, center: Tuple[float, float], radius_meters: float) -> Tuple[float, float, float, float]:
+        """(min_lat, min_lng, max_lat, max_lng) box enclosing a circle around center"""
+        dlat = np.degrees(radius_meters / self.EARTH_RADIUS)
+        dlng = dlat / max(np.cos(np.radians(center[0])), 1e-6)
+        return (
+            float(center[0] - dlat),
+            float(center[1] - dlng),
+            float(center[0] + dlat),
+            float(center[1] + dlng),
+        )
+
+    # ------------------------------------------------------------------
+    # Batch API: NumPy over a PolygonBatch, for many polygons at once
+    # ------------------------------------------------------------------
+
+    def haversine_many(self, points1: np.ndarray, points2: np.ndarray) -> np.ndarray:
+        """
+        Element-wise distance in meters between two (N, 2) arrays of
+        (lat, lng) points. Either side may also be a single (2,) point,
+        which is broadcast against the other.
+        """
+        points1 = np.asarray(points1, dtype=np.float64)
+        points2 = np.asarray(points2, dtype=np.float64)
+
+        lat1, lon1 = np.radians(points1[..., 0]), np.radians(points1[..., 1])
+        lat2, lon2 = np.radians(points2[..., 0]), np.radians(points2[..., 1])
+
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+
+        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+        c = 2 * np.arcsin(np.sqrt(a))
+
+        return self.EARTH_RADIUS * c
+
+    def compare_pairs(self, batch1: PolygonBatch, batch2: PolygonBatch) -> Dict[str, np.ndarray]:
+        """
+        Run the 3-check comparison on N pairs at once.
+
+        ``batch1[i]`` is compared with ``batch2[i]``; either side may also
+        hold a single polygon, which is then broadcast against every
+        polygon on the other side. Returns a dict of arrays keyed like
+        ``compare_polygons``; ``iou`` is only included with
+        COORDINATES_IOU_REQUIRED, and is NaN for pairs the checks rejected.
+        """
+        # 1. Centroid distance
+        centroids1 = batch1.centroids()
+        centroids2 = batch2.centroids()
+        distance = self.haversine_many(centroids1, centroids2)
+
+        # 2. Area similarity
+        area1, area2 = np.broadcast_arrays(batch1.areas(), batch2.areas())
+
+        area_ratio = np.divide(
+            np.minimum(area1, area2),
+            np.maximum(area1, area2),
+            out=np.zeros(area1.shape, dtype=np.float64),
+            where=area2 != 0,
+        )
+
+        # 3. Bounding box overlap (simplified)
+        bbox1 = batch1.bboxes()
+        bbox2 = batch2.bboxes()
+
+        bbox_overlap = ~(
+            (bbox1[:, 2] < bbox2[:, 0]) | (bbox2[:, 2] < bbox1[:, 0]) |
+            (bbox1[:, 3] < bbox2[:, 1]) | (bbox2[:, 3] < bbox1[:, 1])
+        )
+
+        # Simple scoring
+        passes = (
+            (distance <= settings.COORDINATES_CENTROID_DISTANCE_METERS).astype(np.int64)
+            + (area_ratio >= settings.COORDINATES_AREA_RATIO_THRESHOLD)
+            + bbox_overlap
+        )
+
+        # Match if enough checks pass (2 of 3 by default)
+        result = {
+            'match': passes >= settings.COORDINATES_REQUIRED_VOTES,
+            'distance_meters': distance,
+            'area_ratio': area_ratio,
+            'bbox_overlap': bbox_overlap,
+            'passes': passes,
         }
 
+        if settings.COORDINATES_IOU_REQUIRED:
+            # Only pairs the checks accepted are clipped
+            iou = np.full(len(passes), np.nan)
+            for i in np.flatnonzero(result['match']):
+                iou[i] = self.polygon_iou(
+                    batch1.polygon(i if len(batch1) > 1 else 0),
+                    batch2.polygon(i if len(batch2) > 1 else 0),
+                )
+            result['iou'] = iou
+            result['match'] = result['match'] & (iou >= settings.COORDINATES_OVERLAP_THRESHOLD)
+
+        return result
+
+    def compare_many(self, poly: List[Tuple[float, float]],
+                     candidates: Sequence[List[Tuple[float, float]]]) -> Dict[str, np.ndarray]:
+        """Compare one submitted polygon against N candidate polygons"""
+        return self.compare_pairs(
+            PolygonBatch.from_polygons([poly]),
+            PolygonBatch.from_polygons(candidates),
+        )
+
+    def areas_m2(self, batch: PolygonBatch) -> np.ndarray:
+        """
+        ``polygon_area_m2`` for every polygon in a batch: each polygon is
+        projected around its own bbox midpoint, all in one pass
+        """
+        out = np.zeros(len(batch), dtype=np.float64)
+        valid = batch.counts >= 3
+        if not valid.any():
+            return out
+
+        bboxes = batch.bboxes()
+        origins = np.repeat((bboxes[:, :2] + bboxes[:, 2:]) / 2, batch.counts, axis=0)
+        lat0 = np.radians(origins[:, 0])
+        x = np.radians(batch.vertices[:, 1] - origins[:, 1]) * np.cos(lat0) * self.EARTH_RADIUS
+        y = np.radians(batch.vertices[:, 0] - origins[:, 0]) * self.EARTH_RADIUS
+
+        nxt = np.arange(len(batch.vertices)) + 1
+        nonempty = batch.counts > 0
+        nxt[batch.offsets[1:][nonempty] - 1] = batch.offsets[:-1][nonempty]
+        cross = x * y[nxt] - x[nxt] * y
+
+        out[nonempty] = np.abs(np.add.reduceat(cross, batch._segment_starts(nonempty))) / 2.0
+        out[~valid] = 0.0
+        return out
+
+    def derive_fields_many(self, coords_list: Sequence[List[Dict]]) -> List[Dict]:
+        """``derive_fields`` for many polygons, vectorized over the batch"""
+        points_list = [self.points_to_list(coords or []) for coords in coords_list]
+        batch = PolygonBatch.from_polygons(points_list)
+        centroids = batch.centroids().tolist()
+        bboxes = batch.bboxes().tolist()
+        areas = self.areas_m2(batch).tolist()
+
+        fields = []
+        for i, points in enumerate(points_list):
+            if not points:
+                fields.append(self.derive_fields(points))
+                continue
+            fields.append({
+                'centroid_lat': centroids[i][0],
+                'centroid_lng': centroids[i][1],
+                'bbox_min_lat': bboxes[i][0],
+                'bbox_min_lng': bboxes[i][1],
+                'bbox_max_lat': bboxes[i][2],
+                'bbox_max_lng': bboxes[i][3],
+                'projected_area_m2': areas[i],
+                'vertex_count': len(points),
+                'geometry_hash': self.polygon_hash(points),
+            })
+        return fields
+
 # Global instance
-geometry = SimpleGeometry()
\ No newline at end of file
+geometry = SimpleGeometry()
@@ -0,0 +1,167 @@
+"""
+Idempotent and coalesced verification submissions.
+
+Mobile clients retry, so the same ``POST /verification/verify`` can
+arrive several times at once. Identical concurrent submissions from one
+user (same ``Idempotency-Key`` and body, or same body when no key is
+sent) share one verification through ``SingleFlight``. With a key, the verification
+id is also recorded until ``IDEMPOTENCY_KEY_TTL_SECONDS`` passes, so a
+retry arriving later gets the stored result instead of a new
+verification.
+"""
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_engine, new_async_session
+from app.models.land_models import IdempotencyRecord, VerificationRequest
+from app.schemas.land_schemas import VerificationRequestCreate
+from app.services.single_flight import SingleFlight
+from app.services.verification_service import verifier
+
+logger = logging.getLogger(__name__)
+
+
+def request_hash(request: VerificationRequestCreate) -> str:
+    return hashlib.sha256(request.model_dump_json().encode("utf-8")).hexdigest()
+
+
+class IdempotentVerifier:
+    """Runs ``verifier.averify_land`` at most once per duplicate submission"""
+
+    def __init__(self):
+        self.flights = SingleFlight()
+
+    async def verify(
+        self,
+        user_id: int,
+        request: VerificationRequestCreate,
+        idempotency_key: Optional[str] = None,
+    ) -> VerificationRequest:
+        """
+        Verification for a submission, shared with identical in-flight
+        submissions and, given a key, with earlier ones. The returned
+        record is detached and shared between callers: read-only.
+        """
+        body_hash = request_hash(request)
+        # The body hash is part of a keyed flight too: a reused key with a
+        # different body must not join, it gets the 422 from _replay or _record
+        if idempotency_key:
+            flight = (user_id, "key", idempotency_key, body_hash)
+        else:
+            flight = (user_id, "body", body_hash)
+
+        vr, shared = await self.flights.do(
+            flight,
+            lambda: self._verify(user_id, request, idempotency_key, body_hash),
+        )
+        if shared:
+            logger.info("Joined in-flight verification | user_id=%s | verification_id=%s", user_id, vr.id)
+        return vr
+
+    async def _verify(
+        self,
+        user_id: int,
+        request: VerificationRequestCreate,
+        idempotency_key: Optional[str],
+        body_hash: str,
+    ) -> VerificationRequest:
+        # Own session: the flight outlives whichever request started it
+        async with new_async_session() as db:
+            if idempotency_key:
+                existing = await self._replay(db, user_id, idempotency_key, body_hash)
+                if existing is not None:
+                    return existing
+
+            # A recorded key points at the row, so it must exist before
+            # the key does: no write-behind for keyed requests
+            vr = await verifier.averify_land(db, user_id, request, durable=bool(idempotency_key))
+
+            if idempotency_key:
+                return await self._record(db, user_id, idempotency_key, body_hash, vr)
+            return vr
+
+    async def _replay(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        idempotency_key: str,
+        body_hash: str,
+    ) -> Optional[VerificationRequest]:
+        """Verification stored for an unexpired key; clears an expired one"""
+        stmt = select(IdempotencyRecord).where(
+            IdempotencyRecord.user_id == user_id,
+            IdempotencyRecord.key == idempotency_key,
+        )
+        record = (await db.exec(stmt)).first()
+        if record is None:
+            return None
+
+        if record.expires_at <= datetime.utcnow():
+            await db.delete(record)
+            await db.commit()
+            return None
+
+        if record.request_hash != body_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+
+        logger.info(
+            "Replaying idempotent verification | user_id=%s | verification_id=%s",
+            user_id,
+            record.verification_id,
+        )
+        return await db.get(VerificationRequest, record.verification_id)
+
+    async def _record(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        idempotency_key: str,
+        body_hash: str,
+        vr: VerificationRequest,
+    ) -> VerificationRequest:
+        now = datetime.utcnow()
+        db.add(IdempotencyRecord(
+            user_id=user_id,
+            key=idempotency_key,
+            request_hash=body_hash,
+            verification_id=vr.id,
+            created_at=now,
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS),
+        ))
+        try:
+            await db.commit()
+            return vr
+        except IntegrityError:
+            # Another process recorded the key first; answer with its
+            # verification so every retry sees the same result
+            await db.rollback()
+            existing = await self._replay(db, user_id, idempotency_key, body_hash)
+            if existing is not None:
+                return existing
+            # The rollback expired vr; reload it through the identity map
+            return await db.get(VerificationRequest, vr.id) or vr
+
+    async def purge_expired(self) -> int:
+        """Delete expired idempotency records; returns rows deleted"""
+        async with AsyncSession(async_engine) as db:
+            result = await db.execute(
+                delete(IdempotencyRecord).where(IdempotencyRecord.expires_at <= datetime.utcnow())
+            )
+            await db.commit()
+            return result.rowcount
+
+
+# Global instance
+idempotent_verifier = IdempotentVerifier()
@@ -0,0 +1,42 @@
+"""
+Normalized location keys for registry lookups.
+
+Town and layout names arrive with inconsistent case, spacing, punctuation
+and accents ("Molyko-II", "molyko ii", "Molykó II"). Registry rows store
+a normalized ``town_key`` / ``layout_key`` and a composite
+``location_key``, so the exact-match step is an indexed equality lookup
+instead of a ``LIKE '%...%'`` scan.
+"""
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Optional
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+_SEPARATOR = "|"
+
+
+@lru_cache(maxsize=4096)  # town and layout names repeat across requests and rows
+def normalize(value: Optional[str]) -> str:
+    """Accent-folded, case-folded text with whitespace and punctuation removed"""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub("", stripped.casefold())
+
+
+def location_key(town: str, layout: str, block_number: str, plot_number: str) -> str:
+    """
+    Composite key of a plot. Block and plot numbers are kept verbatim:
+    they have always been compared exactly.
+    """
+    return _SEPARATOR.join((normalize(town), normalize(layout), block_number, plot_number))
+
+
+def similarity(a: Optional[str], b: Optional[str]) -> float:
+    """0-1 similarity of two keys; SQLite's stand-in for pg_trgm ``similarity``"""
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
@@ -0,0 +1,183 @@
+"""
+Memoized verification outcomes for repeated identical submissions.
+
+A submission is identified by its location and the canonical hash of its
+polygon (``geometry.polygon_hash``: independent of start vertex and
+winding). The outcome computed for it against a registry record is
+remembered together with that record's ``version``; a later identical
+submission reuses it only while the record is still active at the same
+version. ORM writes to the registry in this process drop affected
+entries at once, and a TTL bounds everything else (e.g. a closer parcel
+inserted by another process).
+
+Only outcomes that involved a registry record are remembered: "not
+found" has no record version to scope it to.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.land_models import LandRegistry
+
+# VerificationRequest fields that make up an outcome
+OUTCOME_FIELDS = (
+    "status",
+    "is_verified",
+    "message",
+    "location_match",
+    "coordinates_match",
+    "overlap_score",
+    "distance_meters",
+    "is_fraud",
+    "fraud_reason",
+    "official_owner",
+    "official_coords",
+    "official_area",
+    "official_certificate_pdf_url",
+    "official_certificate_number",
+)
+
+# (location key, polygon hash): location_match compares normalized names,
+# so every spelling that shares a location key shares its outcome
+OutcomeKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class MemoizedOutcome:
+    verification_id: uuid.UUID  # request the outcome was computed for
+    registry_id: uuid.UUID
+    registry_version: int
+    location_key: str
+    fields: Dict
+    expires_at: float
+
+
+class VerificationOutcomeCache:
+    """LRU cache of verification outcomes with a TTL"""
+
+    def __init__(
+        self,
+        max_entries: int = settings.VERIFICATION_OUTCOME_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.VERIFICATION_OUTCOME_CACHE_TTL_SECONDS,
+    ):
+        self.enabled = settings.VERIFICATION_OUTCOME_CACHE_ENABLED
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[OutcomeKey, MemoizedOutcome]" = OrderedDict()
+        self._by_registry: Dict[uuid.UUID, Set[OutcomeKey]] = {}
+        self._by_location: Dict[str, Set[OutcomeKey]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: OutcomeKey) -> Optional[MemoizedOutcome]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry.expires_at:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self,
+        key: OutcomeKey,
+        verification_id: uuid.UUID,
+        registry: LandRegistry,
+        fields: Dict,
+    ) -> None:
+        if not self.enabled:
+            return
+        entry = MemoizedOutcome(
+            verification_id=verification_id,
+            registry_id=registry.id,
+            registry_version=registry.version or 1,  # NULL on rows never backfilled
+            location_key=key[0],
+            fields=fields,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = entry
+            self._by_registry.setdefault(entry.registry_id, set()).add(key)
+            self._by_location.setdefault(entry.location_key, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, key: OutcomeKey) -> None:
+        """Drop an entry found to be out of date"""
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+                self.stale += 1
+
+    def invalidate_registry(self, registry_id: Optional[uuid.UUID], location_key: Optional[str]) -> None:
+        """Drop outcomes computed against a record or for its location"""
+        with self._lock:
+            keys = set(self._by_registry.get(registry_id, ()))
+            keys |= self._by_location.get(location_key, set())
+            for key in keys:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_registry.clear()
+            self._by_location.clear()
+
+    def _drop(self, key: OutcomeKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for index, value in ((self._by_registry, entry.registry_id), (self._by_location, entry.location_key)):
+            keys = index.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[value]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+            }
+
+
+# Global instance
+outcome_cache = VerificationOutcomeCache()
+
+
+@event.listens_for(LandRegistry, "after_insert")
+@event.listens_for(LandRegistry, "after_update")
+@event.listens_for(LandRegistry, "after_delete")
+def _invalidate_registry_write(mapper, connection, target: LandRegistry) -> None:
+    # A new record at a location may now be the exact match for
+    # submissions that were previously resolved by proximity
+    outcome_cache.invalidate_registry(target.id, target.location_key)
@@ -0,0 +1,56 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A page is read with ``WHERE (sort columns) < (last row's values)`` on an
+index over the sort columns, so every page costs the same index seek no
+matter how deep it is, unlike ``OFFSET``, which reads and discards every
+skipped row. The last row's values travel to the client as an opaque
+cursor (URL-safe base64 of JSON), returned in the ``X-Next-Cursor``
+response header and sent back as the ``cursor`` query parameter.
+"""
+import base64
+import binascii
+import json
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Opaque cursor for a row's sort values (str()-able: ints, datetimes, UUIDs)"""
+    payload = json.dumps([v if isinstance(v, int) else str(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[Callable]) -> Tuple:
+    """
+    Sort values from a cursor, each converted with the matching entry of
+    ``types`` (e.g. ``(datetime.fromisoformat, uuid.UUID)``); 400 if the
+    cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong number of cursor values")
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def split_page(rows: List[T], limit: int, key: Callable[[T], Sequence]) -> Tuple[List[T], Optional[str]]:
+    """
+    Page and next cursor from a query that fetched ``limit + 1`` rows: the
+    extra row only signals that another page exists
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(key(page[-1]))
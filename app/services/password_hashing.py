@@ -0,0 +1,121 @@
+"""
+Password hashing off the request thread.
+
+bcrypt is deliberately slow and holds the GIL, so a login burst on the
+request threads starves every other endpoint. Hashes are computed on a
+small dedicated process pool instead; the calling thread only waits on
+the result. The pool has a bounded backlog: once every worker is busy
+and ``queue_depth`` hashes are waiting, further submissions are refused
+(the API answers 503) instead of letting login latency grow without
+limit.
+
+The bcrypt cost is ``BCRYPT_ROUNDS``. Hashes of any other cost still
+verify, and ``verify_and_update`` returns a replacement hash for them so
+logins migrate stored hashes transparently.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# min == max == default: hashes of any other cost report needs_update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+# Worker functions: module level so the pool can pickle them
+
+def _hash(secret: str) -> str:
+    return pwd_context.hash(secret)
+
+
+def _verify_and_update(secret: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(secret, hashed)
+
+
+class PasswordHasherBusy(Exception):
+    """Every worker is busy and the backlog is full"""
+
+
+class PasswordHashPool:
+    """Bounded process pool for bcrypt; ``workers=0`` hashes inline"""
+
+    def __init__(
+        self,
+        workers: int = settings.PASSWORD_HASH_WORKERS,
+        queue_depth: int = settings.PASSWORD_HASH_QUEUE_DEPTH,
+    ):
+        self.workers = workers
+        self.queue_depth = queue_depth
+
+        # One slot per running or waiting hash; submissions beyond that are refused
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_depth)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy()
+        with self._lock:
+            self._outstanding += 1
+        try:
+            if self.workers <= 0:
+                return fn(*args)
+            return self._pool().submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def hash(self, secret: str) -> str:
+        return self._run(_hash, secret)
+
+    def verify_and_update(self, secret: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Whether ``secret`` matches, plus a new hash when ``hashed`` needs an upgrade"""
+        return self._run(_verify_and_update, secret, hashed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "outstanding": self._outstanding,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance
+password_hasher = PasswordHashPool()
@@ -0,0 +1,247 @@
+"""
+In-process cache of authenticated principals.
+
+Every authenticated request used to load its user by the token subject
+(the email). Users are cached by subject instead, so steady-state
+requests cost no user query. Entries expire after a TTL (which bounds how
+stale a user changed outside the ORM can be), the least recently used
+entry is evicted once the cache is full, and ORM writes to a user drop
+its entries: ``UserCRUD.update_user`` and ``delete_user`` go through the
+mapper events below, the Google sign-in upsert calls
+``invalidate_on_commit`` itself.
+
+Each subject has a version counter, bumped on every invalidation. A
+request that missed the cache reads the version before querying and
+``put`` refuses the row if the version moved in the meantime, so a read
+racing a write cannot re-cache the old user.
+
+With several workers, committed invalidations are relayed to the other
+processes over PostgreSQL LISTEN/NOTIFY (``PrincipalBroadcast``); other
+databases rely on the TTL.
+
+Cached users are detached copies shared between requests: treat them as
+read-only.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_PENDING = "principal_cache.pending"  # Session.info key: subjects written in this transaction
+
+
+class PrincipalCache:
+    """Size-bounded LRU cache of users by token subject, with a TTL"""
+
+    def __init__(
+        self,
+        max_entries: int = settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    ):
+        self.enabled = settings.PRINCIPAL_CACHE_ENABLED
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, subject: str) -> Optional[User]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, user = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[subject]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return user
+
+    def version(self, subject: str) -> int:
+        """Current version of ``subject``; pass it to ``put`` after loading the user"""
+        with self._lock:
+            return self._versions.get(subject, 0)
+
+    def put(self, subject: str, user: User, version: int) -> User:
+        """
+        Cache a detached copy of ``user`` unless ``subject`` was
+        invalidated since ``version`` was read; returns ``user``
+        """
+        if not self.enabled:
+            return user
+
+        copy = User.model_validate(user)
+        with self._lock:
+            if self._versions.get(subject, 0) != version:
+                self.stale_puts += 1
+                return user
+
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, copy)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return user
+
+    def invalidate(self, subjects: Iterable[str]) -> None:
+        """Forget the given subjects and bump their versions"""
+        with self._lock:
+            for subject in subjects:
+                self._versions[subject] = self._versions.get(subject, 0) + 1
+                if self._entries.pop(subject, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            for subject in self._entries:
+                self._versions[subject] = self._versions.get(subject, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_puts": self.stale_puts,
+                "broadcast": principal_broadcast.listening,
+            }
+
+
+class PrincipalBroadcast:
+    """
+    Relays committed invalidations between worker processes with
+    PostgreSQL LISTEN/NOTIFY. Inactive until ``start`` is called with a
+    PostgreSQL engine.
+    """
+
+    def __init__(self, cache: PrincipalCache, channel: str = settings.PRINCIPAL_CACHE_CHANNEL):
+        self.cache = cache
+        self.channel = channel
+        self._engine: Optional[Engine] = None
+        self._listener: Optional[threading.Thread] = None
+        self.published = 0
+        self.received = 0
+
+    @property
+    def listening(self) -> bool:
+        return self._listener is not None
+
+    def start(self, engine: Engine, retry_seconds: float = 5.0) -> None:
+        """Listen for other workers' invalidations on a daemon thread"""
+        if self._listener is not None or not self.cache.enabled or engine.dialect.name != "postgresql":
+            return
+        self._engine = engine
+        conninfo = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+        def run():
+            import psycopg
+            from psycopg import sql
+
+            while True:
+                try:
+                    with psycopg.connect(conninfo, autocommit=True) as connection:
+                        connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                        # Notifications sent while we were not listening are lost
+                        self.cache.clear()
+                        for notify in connection.notifies():
+                            self.received += 1
+                            self.cache.invalidate(json.loads(notify.payload))
+                except Exception:
+                    logger.exception("Principal invalidation listener failed; reconnecting")
+                time.sleep(retry_seconds)
+
+        self._listener = threading.Thread(target=run, name="principal-invalidations", daemon=True)
+        self._listener.start()
+
+    def publish(self, subjects: Set[str]) -> None:
+        if self._engine is None or not subjects:
+            return
+        try:
+            with self._engine.begin() as connection:
+                connection.exec_driver_sql(
+                    "SELECT pg_notify(%(channel)s, %(payload)s)",
+                    {"channel": self.channel, "payload": json.dumps(sorted(subjects))},
+                )
+            self.published += 1
+        except Exception:
+            # Other workers fall back to the TTL for these subjects
+            logger.exception("Could not broadcast principal invalidation")
+
+
+# Global instance
+principal_cache = PrincipalCache()
+principal_broadcast = PrincipalBroadcast(principal_cache)
+
+
+def invalidate_on_commit(session: Optional[Session], subjects: Set[str]) -> None:
+    """
+    Drop ``subjects`` now and again, for every worker, once ``session``
+    commits. For user writes the mapper events below do not see, such as
+    Core statements.
+    """
+    principal_cache.invalidate(subjects)
+    if session is not None:
+        session.info.setdefault(_PENDING, set()).update(subjects)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_write(mapper, connection, target: User) -> None:
+    # The previous email covers an update that changed the subject
+    subjects = {target.email, *inspect(target).attrs.email.history.deleted}
+    invalidate_on_commit(object_session(target), subjects)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_user_writes(session: Session) -> None:
+    subjects = session.info.pop(_PENDING, None)
+    if subjects:
+        # Again after commit: a concurrent miss may have read the old row
+        # between the flush and the commit
+        principal_cache.invalidate(subjects)
+        principal_broadcast.publish(subjects)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_writes(session: Session) -> None:
+    session.info.pop(_PENDING, None)
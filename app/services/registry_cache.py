@@ -0,0 +1,162 @@
+"""
+In-process cache of registry records.
+
+Verifications keep hitting the same hot parcels, and this service never
+writes the registry itself, so active rows are cached by id and by
+normalized location key. Entries expire after a TTL (which bounds how
+stale a row written by another process can be), the least recently used
+entry is evicted once the cache is full, and ORM writes in this process
+invalidate the affected entries immediately.
+
+Cached records are detached copies shared between requests: treat them
+as read-only.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.land_models import LandRegistry
+
+
+class RegistryCache:
+    """Size-bounded LRU cache of LandRegistry records with a TTL"""
+
+    def __init__(
+        self,
+        max_entries: int = settings.REGISTRY_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.REGISTRY_CACHE_TTL_SECONDS,
+    ):
+        self.enabled = settings.REGISTRY_CACHE_ENABLED
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[uuid.UUID, Tuple[float, LandRegistry]]" = OrderedDict()
+        self._keys: Dict[str, uuid.UUID] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, registry_id: uuid.UUID) -> Optional[LandRegistry]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._get(registry_id)
+
+    def get_by_key(self, location_key: str) -> Optional[LandRegistry]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            registry_id = self._keys.get(location_key)
+            if registry_id is None:
+                self.misses += 1
+                return None
+            return self._get(registry_id)
+
+    def _get(self, registry_id: uuid.UUID) -> Optional[LandRegistry]:
+        entry = self._entries.get(registry_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, record = entry
+        if time.monotonic() >= expires_at:
+            self._drop(registry_id)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(registry_id)
+        self.hits += 1
+        return record
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def put(self, record: LandRegistry) -> LandRegistry:
+        """Cache a detached copy of an active record; returns ``record``"""
+        if not self.enabled or not record.is_active:
+            return record
+
+        copy = LandRegistry.model_validate(record)
+        with self._lock:
+            self._drop(copy.id)
+            self._entries[copy.id] = (time.monotonic() + self.ttl_seconds, copy)
+            if copy.location_key:
+                self._keys[copy.location_key] = copy.id
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return record
+
+    def invalidate(self, registry_id: Optional[uuid.UUID] = None, location_key: Optional[str] = None) -> None:
+        """Forget a record by id and/or location key"""
+        with self._lock:
+            if location_key is not None:
+                keyed = self._keys.get(location_key)
+                if keyed is not None:
+                    self._drop(keyed)
+                    self.invalidations += 1
+            if registry_id is not None and registry_id in self._entries:
+                self._drop(registry_id)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys.clear()
+
+    def _drop(self, registry_id: uuid.UUID) -> None:
+        entry = self._entries.pop(registry_id, None)
+        if entry is not None:
+            key = entry[1].location_key
+            if key and self._keys.get(key) == registry_id:
+                del self._keys[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# Global instance
+registry_cache = RegistryCache()
+
+
+@event.listens_for(LandRegistry, "after_insert")
+@event.listens_for(LandRegistry, "after_update")
+@event.listens_for(LandRegistry, "after_delete")
+def _invalidate_registry_write(mapper, connection, target: LandRegistry) -> None:
+    # The id covers an update that moved the record to another location
+    # key; the key covers whatever was cached under the new one
+    registry_cache.invalidate(target.id, target.location_key)
@@ -0,0 +1,238 @@
+"""
+In-process spatial index over active registry parcels.
+
+A uniform grid keyed by centroid cell answers radius and bbox queries by
+looking at a handful of cells, so lookups stay flat as the registry grows.
+The index is built at startup, kept current by ORM writes in this
+process (applied once they commit), and rebuilt periodically to pick up
+writes from other processes.
+"""
+import logging
+import math
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession, object_session
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.land_models import LandRegistry
+from app.services.geometry_service import geometry
+
+logger = logging.getLogger(__name__)
+
+Cell = Tuple[int, int]
+BBox = Tuple[float, float, float, float]
+Entry = Tuple[float, float, BBox]  # centroid lat, centroid lng, bbox
+
+_PENDING = "spatial_index.pending"  # Session.info key: parcel entries written in this transaction
+
+
+class RegistrySpatialIndex:
+    """Uniform grid of registry centroids and bounding boxes"""
+
+    def __init__(self, cell_degrees: float = settings.REGISTRY_SPATIAL_INDEX_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.enabled = settings.REGISTRY_SPATIAL_INDEX_ENABLED
+        self.built_at: Optional[float] = None
+
+        self._lock = threading.RLock()
+        self._cells: Dict[Cell, Set[uuid.UUID]] = {}
+        self._entries: Dict[uuid.UUID, Tuple[float, float, BBox]] = {}
+        self._max_extent = 0.0  # largest bbox side seen, in degrees
+        self._refresher: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.enabled and self.built_at is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cell(self, lat: float, lng: float) -> Cell:
+        return (math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees))
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def build(self, session: Session) -> int:
+        """Load every active parcel's centroid and bbox; returns entries indexed"""
+        stmt = select(
+            LandRegistry.id,
+            LandRegistry.centroid_lat,
+            LandRegistry.centroid_lng,
+            LandRegistry.bbox_min_lat,
+            LandRegistry.bbox_min_lng,
+            LandRegistry.bbox_max_lat,
+            LandRegistry.bbox_max_lng,
+        ).where(
+            LandRegistry.is_active.is_(True),
+            LandRegistry.centroid_lat.is_not(None),
+        )
+
+        cells: Dict[Cell, Set[uuid.UUID]] = {}
+        entries: Dict[uuid.UUID, Tuple[float, float, BBox]] = {}
+        max_extent = 0.0
+
+        for row in session.exec(stmt):
+            bbox = (row.bbox_min_lat, row.bbox_min_lng, row.bbox_max_lat, row.bbox_max_lng)
+            entries[row.id] = (row.centroid_lat, row.centroid_lng, bbox)
+            cells.setdefault(self._cell(row.centroid_lat, row.centroid_lng), set()).add(row.id)
+            max_extent = max(max_extent, _extent(bbox))
+
+        # Swap in the new grid in one step so readers never see a partial build
+        with self._lock:
+            self._cells = cells
+            self._entries = entries
+            self._max_extent = max_extent
+            self.built_at = time.monotonic()
+
+        logger.info("Registry spatial index built | parcels=%s", len(entries))
+        return len(entries)
+
+    def upsert(self, record: LandRegistry) -> None:
+        """Index or re-index one parcel; inactive or empty parcels are dropped"""
+        self.put(record.id, index_entry(record))
+
+    def put(self, record_id: uuid.UUID, entry: Optional[Entry]) -> None:
+        """Index or re-index one parcel's entry; ``None`` drops the parcel"""
+        with self._lock:
+            self.remove(record_id)
+            if entry is None:
+                return
+
+            self._entries[record_id] = entry
+            self._cells.setdefault(self._cell(entry[0], entry[1]), set()).add(record_id)
+            self._max_extent = max(self._max_extent, _extent(entry[2]))
+
+    def remove(self, record_id: uuid.UUID) -> None:
+        with self._lock:
+            entry = self._entries.pop(record_id, None)
+            if entry is None:
+                return
+            cell = self._cell(entry[0], entry[1])
+            members = self._cells.get(cell)
+            if members is not None:
+                members.discard(record_id)
+                if not members:
+                    del self._cells[cell]
+
+    def start_refresh(self, session_factory, interval_seconds: int) -> None:
+        """Rebuild from the database every ``interval_seconds`` on a daemon thread"""
+        if self._refresher is not None or interval_seconds <= 0:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval_seconds)
+                try:
+                    with session_factory() as session:
+                        self.build(session)
+                except Exception:
+                    logger.exception("Registry spatial index refresh failed")
+
+        self._refresher = threading.Thread(target=run, name="registry-spatial-index", daemon=True)
+        self._refresher.start()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _ids_in_window(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[uuid.UUID]:
+        low = self._cell(min_lat, min_lng)
+        high = self._cell(max_lat, max_lng)
+        ids: List[uuid.UUID] = []
+        with self._lock:
+            for cell_lat in range(low[0], high[0] + 1):
+                for cell_lng in range(low[1], high[1] + 1):
+                    members = self._cells.get((cell_lat, cell_lng))
+                    if members:
+                        ids.extend(members)
+        return ids
+
+    def query_radius(self, center: Tuple[float, float], radius_meters: float) -> List[Tuple[uuid.UUID, float]]:
+        """(id, distance) of every parcel whose centroid is within radius, nearest first"""
+        ids = self._ids_in_window(*geometry.degree_window(center, radius_meters))
+        if not ids:
+            return []
+
+        with self._lock:
+            found = [(i, self._entries[i]) for i in ids if i in self._entries]
+        centroids = np.array([entry[:2] for _, entry in found], dtype=np.float64).reshape(-1, 2)
+        distances = geometry.haversine_many(centroids, center)
+
+        return sorted(
+            # Strictly within, as in the database proximity search
+            ((found[k][0], float(d)) for k, d in enumerate(distances) if d < radius_meters),
+            key=lambda item: item[1],
+        )
+
+    def query_bbox(self, bbox: BBox) -> List[uuid.UUID]:
+        """Ids of parcels whose bounding box intersects ``bbox``"""
+        pad = self._max_extent
+        ids = self._ids_in_window(bbox[0] - pad, bbox[1] - pad, bbox[2] + pad, bbox[3] + pad)
+
+        with self._lock:
+            return [
+                i for i in ids
+                if i in self._entries and not (
+                    self._entries[i][2][2] < bbox[0] or bbox[2] < self._entries[i][2][0]
+                    or self._entries[i][2][3] < bbox[1] or bbox[3] < self._entries[i][2][1]
+                )
+            ]
+
+
+def index_entry(record: LandRegistry) -> Optional[Entry]:
+    """What the index stores for a parcel; None if it should not be indexed"""
+    if not record.is_active or record.centroid_lat is None:
+        return None
+    bbox = (record.bbox_min_lat, record.bbox_min_lng, record.bbox_max_lat, record.bbox_max_lng)
+    return (record.centroid_lat, record.centroid_lng, bbox)
+
+
+def _extent(bbox: BBox) -> float:
+    # A centroid lies inside its bbox, so it is never further than the
+    # bbox's longer side from any point the bbox covers
+    return max(bbox[2] - bbox[0], bbox[3] - bbox[1])
+
+
+# Global instance
+spatial_index = RegistrySpatialIndex()
+
+
+def _pending(target: LandRegistry, entry: Optional[Entry]) -> None:
+    # Snapshot the entry now: the row may be expired by the time it commits
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING, {})[target.id] = entry
+
+
+@event.listens_for(LandRegistry, "after_insert")
+@event.listens_for(LandRegistry, "after_update")
+def _index_registry_write(mapper, connection, target: LandRegistry) -> None:
+    if spatial_index.ready:
+        _pending(target, index_entry(target))
+
+
+@event.listens_for(LandRegistry, "after_delete")
+def _unindex_registry_delete(mapper, connection, target: LandRegistry) -> None:
+    if spatial_index.ready:
+        _pending(target, None)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _apply_registry_writes(session: OrmSession) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending and spatial_index.ready:
+        for record_id, entry in pending.items():
+            spatial_index.put(record_id, entry)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_registry_writes(session: OrmSession) -> None:
+    session.info.pop(_PENDING, None)
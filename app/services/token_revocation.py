@@ -0,0 +1,177 @@
+"""
+Token versions for claims-only authentication.
+
+With ``AUTH_CLAIMS_ONLY`` an access token carries the user id, role,
+active flag and token version (``uid``, ``role``, ``act``, ``ver``), and
+``get_current_user`` authorizes from those claims alone. Every change that
+must end existing sessions (role, active flag or email change, password
+reset, deletion) bumps ``User.token_version``; a token is accepted only
+while its ``ver`` matches.
+
+The versions live in a compact in-memory table: ``user_id -> (version,
+active)`` for users with a non-zero version or deactivated, loaded once at
+startup and then refreshed incrementally from rows whose ``updated_at``
+moved. Writes in this process apply as soon as they commit; writes by
+other workers apply within ``AUTH_REVOCATION_REFRESH_SECONDS``. Deleted
+users are only known to the process that deleted them; elsewhere their
+access tokens lapse at expiry because refresh needs the user row.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect, or_
+from sqlalchemy.orm import Session as OrmSession, object_session
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_PENDING = "token_revocation.pending"  # Session.info key: versions written in this transaction
+_DELETED = (-1, False)
+
+# Changing any of these ends the user's existing sessions
+VERSIONED_FIELDS = ("role", "is_active", "email")
+
+
+class RevocationTable:
+    """In-memory token versions, refreshed incrementally from the users table"""
+
+    # Re-read rows updated this long before the last refresh, so a
+    # transaction that committed after a later one is not skipped
+    OVERLAP = timedelta(seconds=60)
+
+    def __init__(self, refresh_seconds: int = settings.AUTH_REVOCATION_REFRESH_SECONDS):
+        self.enabled = settings.AUTH_CLAIMS_ONLY
+        self.refresh_seconds = refresh_seconds
+
+        self._lock = threading.Lock()
+        self._users: Dict[int, Tuple[int, bool]] = {}
+        self._since: Optional[datetime] = None
+        self._refresher: Optional[threading.Thread] = None
+
+        self.refreshes = 0
+        self.rows_read = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._since is not None
+
+    def check(self, user_id: int, version: int, active: bool) -> bool:
+        """Whether a token with these claims is still current"""
+        with self._lock:
+            current, current_active = self._users.get(user_id, (0, True))
+            valid = active and current_active and version == current
+            if valid:
+                self.accepted += 1
+            else:
+                self.rejected += 1
+            return valid
+
+    def apply(self, user_id: int, version: int, active: bool) -> None:
+        with self._lock:
+            if version or not active:
+                self._users[user_id] = (version, active)
+            else:
+                self._users.pop(user_id, None)
+
+    def refresh(self, session: Session) -> int:
+        """Load (first call) or catch up on changed users; returns rows read"""
+        started = datetime.utcnow()
+        statement = select(User.id, User.token_version, User.is_active)
+        if self._since is None:
+            statement = statement.where(or_(User.token_version > 0, User.is_active == False))  # noqa: E712
+        else:
+            statement = statement.where(User.updated_at >= self._since - self.OVERLAP)
+
+        rows = session.exec(statement).all()
+        for user_id, version, active in rows:
+            self.apply(user_id, version or 0, active)
+
+        with self._lock:
+            self._since = started
+            self.refreshes += 1
+            self.rows_read += len(rows)
+        return len(rows)
+
+    def start(self, session_factory) -> None:
+        """Load the table now, then refresh it on a daemon thread"""
+        if not self.enabled or self._refresher is not None:
+            return
+        with session_factory() as session:
+            self.refresh(session)
+
+        def run():
+            while True:
+                time.sleep(self.refresh_seconds)
+                try:
+                    with session_factory() as session:
+                        self.refresh(session)
+                except Exception:
+                    logger.exception("Token revocation refresh failed")
+
+        self._refresher = threading.Thread(target=run, name="token-revocation", daemon=True)
+        self._refresher.start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._users),
+                "refresh_seconds": self.refresh_seconds,
+                "last_refresh": self._since,
+                "refreshes": self.refreshes,
+                "rows_read": self.rows_read,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+            }
+
+
+# Global instance
+revocation_table = RevocationTable()
+
+
+def bump_token_version(user: User) -> None:
+    """End the user's existing sessions; marks the row for the next incremental refresh"""
+    user.token_version = (user.token_version or 0) + 1
+    user.updated_at = datetime.utcnow()
+
+
+def _pending(target: User, entry: Tuple[int, bool]) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING, {})[target.id] = entry
+
+
+@event.listens_for(User, "before_update")
+def _version_user_write(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    versioned = any(state.attrs[field].history.has_changes() for field in VERSIONED_FIELDS)
+    if versioned and not state.attrs.token_version.history.has_changes():
+        bump_token_version(target)
+    if versioned or state.attrs.token_version.history.has_changes():
+        _pending(target, (target.token_version or 0, target.is_active))
+
+
+@event.listens_for(User, "after_delete")
+def _revoke_deleted_user(mapper, connection, target: User) -> None:
+    _pending(target, _DELETED)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _apply_user_writes(session: OrmSession) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        for user_id, (version, active) in pending.items():
+            revocation_table.apply(user_id, version, active)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_user_writes(session: OrmSession) -> None:
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,172 @@
+"""
+Background verification jobs.
+
+``POST /verification/verify-async`` inserts the pending VerificationRequest
+and hands the rest of the workflow to this bounded worker pool, so slow
+verifications never hold up the request that submitted them. Clients poll
+``GET /verification/{id}`` for the outcome.
+
+Jobs live in memory only. Jobs still queued at shutdown are marked
+failed, and on startup ``fail_stale`` fails pending rows left behind by a
+process that died, so clients never poll a pending row forever. A job
+that raises is marked failed as soon as it ends.
+
+``VERIFICATION_JOB_TIMEOUT_SECONDS`` is checked before a job starts and
+again before its outcome is stored; a job stuck in the middle (a hung
+database call) is not interrupted.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.core.database import engine, RoutingSession
+from app.models.land_models import VerificationRequest
+from app.schemas.land_schemas import VerificationRequestCreate
+from app.services.verification_service import verifier
+
+logger = logging.getLogger(__name__)
+
+INTERRUPTED = "Verification was interrupted; please resubmit"
+
+
+class VerificationJobQueue:
+    """Fixed pool of verification workers with a bounded backlog"""
+
+    def __init__(
+        self,
+        workers: int = settings.VERIFICATION_JOB_WORKERS,
+        queue_depth: int = settings.VERIFICATION_JOB_QUEUE_DEPTH,
+        timeout_seconds: float = settings.VERIFICATION_JOB_TIMEOUT_SECONDS,
+    ):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.timeout_seconds = timeout_seconds
+
+        # One slot per running or waiting job; submissions beyond that are refused
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._jobs: Dict[Future, uuid.UUID] = {}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="verification-job",
+                )
+            return self._executor
+
+    def reserve(self) -> bool:
+        """Claim a slot before creating the pending row; False when full"""
+        if not self._slots.acquire(blocking=False):
+            return False
+        with self._lock:
+            self._outstanding += 1
+        return True
+
+    def release(self) -> None:
+        """Give back a reserved slot that will not be submitted"""
+        with self._lock:
+            self._outstanding -= 1
+        self._slots.release()
+
+    def submit(self, verification_id: uuid.UUID, request: VerificationRequestCreate) -> None:
+        """Run a reserved job on the pool"""
+        deadline = time.monotonic() + self.timeout_seconds
+        future = self._pool().submit(self._run, verification_id, request, deadline)
+        with self._lock:
+            self._jobs[future] = verification_id
+        future.add_done_callback(self._done)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            verification_id = self._jobs.pop(future, None)
+        self.release()
+
+        if future.cancelled() or future.exception() is None:
+            return
+        # The job died before storing an outcome: fail the row now rather
+        # than leave the client polling a pending row until fail_stale
+        logger.error(
+            "Verification job failed | verification_id=%s",
+            verification_id,
+            exc_info=future.exception(),
+        )
+        try:
+            self._fail_pending(VerificationRequest.id == verification_id)
+        except Exception:
+            logger.exception("Could not fail verification job | verification_id=%s", verification_id)
+
+    def _run(self, verification_id: uuid.UUID, request: VerificationRequestCreate, deadline: float) -> None:
+        with RoutingSession(engine) as db:
+            vr = db.get(VerificationRequest, verification_id)
+            if vr is None or vr.status != "pending":
+                return
+
+            if time.monotonic() > deadline:
+                logger.warning("Verification job expired in queue | verification_id=%s", verification_id)
+                vr.status = "failed"
+                vr.message = "Verification timed out"
+                db.commit()
+                return
+
+            verifier.complete(db, vr, request, deadline=deadline)
+
+    def stats(self) -> dict:
+        with self._lock:
+            outstanding = self._outstanding
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "outstanding": outstanding,
+            "timeout_seconds": self.timeout_seconds,
+        }
+
+    def fail_stale(self, older_than: timedelta = timedelta(minutes=settings.VERIFICATION_JOB_STALE_MINUTES)) -> int:
+        """Fail pending rows older than ``older_than``, orphaned by a dead process; returns rows failed"""
+        failed = self._fail_pending(VerificationRequest.requested_at < datetime.utcnow() - older_than)
+        if failed:
+            logger.warning("Failed %s stale pending verifications", failed)
+        return failed
+
+    def _fail_pending(self, *criteria) -> int:
+        with RoutingSession(engine) as db:
+            result = db.execute(
+                update(VerificationRequest)
+                .where(VerificationRequest.status == "pending", *criteria)
+                .values(status="failed", message=INTERRUPTED)
+            )
+            db.commit()
+            return result.rowcount
+
+    def _fail_cancelled(self, verification_ids: Iterable[uuid.UUID]) -> None:
+        ids = list(verification_ids)
+        if not ids:
+            return
+        try:
+            failed = self._fail_pending(VerificationRequest.id.in_(ids))
+            logger.warning("Failed %s verification jobs cancelled by shutdown", failed)
+        except Exception:
+            # fail_stale picks them up on the next startup
+            logger.exception("Could not fail cancelled verification jobs")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            jobs = dict(self._jobs)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._fail_cancelled(vid for future, vid in jobs.items() if future.cancelled())
+
+
+# Global instance
+job_queue = VerificationJobQueue()
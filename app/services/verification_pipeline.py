@@ -0,0 +1,291 @@
+"""
+Staged verification pipeline.
+
+A verification is a registry lookup followed by checks against the
+record found. Checks are registered stages run cheapest first, and any
+stage can settle the outcome, so a cheap rejection (wrong location,
+centroid far away) never pays for an expensive one (polygon clipping).
+
+The coordinate checks vote: a match needs
+``COORDINATES_REQUIRED_VOTES`` passing votes, so voting stops as soon as
+the result is certain either way. Every stage records its wall time and
+outcome, per verification and in aggregate (``VerificationPipeline.stats``).
+
+Adding a check means subclassing ``Stage`` (or ``VoteStage``), giving it
+a ``cost`` and registering it.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models.land_models import LandRegistry, VerificationRequest
+from app.schemas.land_schemas import VerificationRequestCreate
+from app.services.geometry_service import geometry
+
+# Outcomes that settle a verification before every stage has run
+NOT_FOUND = "not_found"
+LOCATION_MISMATCH = "location_mismatch"
+TOWN_SUGGESTION = "town_suggestion"  # record found only by fuzzy town matching
+COORDINATES_MISMATCH = "coordinates_mismatch"
+
+
+@dataclass
+class StageRecord:
+    name: str
+    outcome: str
+    elapsed_ms: float
+
+
+@dataclass
+class VerificationContext:
+    """State shared by the stages of one verification"""
+    request: VerificationRequestCreate
+    vr: VerificationRequest
+    session: Optional[Session] = None  # registry session, or None for a fresh one
+    registry: Optional[LandRegistry] = None
+    searched: bool = False  # registry is a search result already, even when None
+    rejection: Optional[str] = None
+    location_match: Optional[bool] = None
+    coord_check: Dict = field(default_factory=dict)
+    votes_total: int = 0
+    votes_passed: int = 0
+    votes_failed: int = 0
+    records: List[StageRecord] = field(default_factory=list)
+    _points: Optional[Tuple[List, List]] = None
+
+    @property
+    def points(self) -> Tuple[List, List]:
+        """Submitted and official polygon as point lists, converted once for all stages"""
+        if self._points is None:
+            self._points = (
+                geometry.points_to_list(self.vr.submitted_coords),
+                geometry.points_to_list(self.registry.coordinates),
+            )
+        return self._points
+
+    def area_ratio(self) -> float:
+        """Smaller over larger polygon area, computed once"""
+        if "area_ratio" not in self.coord_check:
+            area1, area2 = (geometry.polygon_area(points) for points in self.points)
+            self.coord_check["area_ratio"] = min(area1, area2) / max(area1, area2) if area2 != 0 else 0.0
+        return self.coord_check["area_ratio"]
+
+    @property
+    def overlap_score(self) -> float:
+        """
+        IoU when the overlap stage clipped the pair, the area ratio
+        otherwise (IoU not enforced, or a vote rejected the pair first),
+        as stored before IoU
+        """
+        iou = self.coord_check.get("iou")
+        return iou if iou is not None else self.area_ratio()
+
+    @property
+    def votes_decided(self) -> bool:
+        return self.votes_passed >= settings.COORDINATES_REQUIRED_VOTES or self.rejection is not None
+
+    @property
+    def coordinates_match(self) -> bool:
+        return self.rejection is None and self.votes_passed >= settings.COORDINATES_REQUIRED_VOTES
+
+    def reject(self, reason: str) -> None:
+        self.rejection = reason
+
+    def vote(self, passed: bool) -> None:
+        if passed:
+            self.votes_passed += 1
+        else:
+            self.votes_failed += 1
+        if self.votes_failed > self.votes_total - settings.COORDINATES_REQUIRED_VOTES:
+            self.reject(COORDINATES_MISMATCH)
+
+
+class Stage(ABC):
+    """One step of the pipeline; returns a short outcome label"""
+    name = "stage"
+    cost = 0  # relative cost; cheaper stages run first
+
+    @abstractmethod
+    def run(self, ctx: VerificationContext) -> str:
+        """Advance ``ctx``; returns the outcome label recorded for this stage"""
+
+
+class RegistryLookupStage(Stage):
+    """Find the registry record every check compares against, unless one was supplied or searched for"""
+    name = "registry_search"
+
+    def __init__(self, search: Callable):
+        self.search = search
+
+    def run(self, ctx: VerificationContext) -> str:
+        if ctx.registry is not None:
+            return "supplied"
+        if not ctx.searched:
+            ctx.registry = self.search(ctx.request, ctx.session)
+        if ctx.registry is None:
+            ctx.reject(NOT_FOUND)
+            return "miss"
+        return "hit"
+
+
+class LocationStage(Stage):
+    """
+    Submitted town/layout/block/plot against the record's. A record in
+    another town can only come from fuzzy town matching: that is a
+    suggestion, not evidence of fraud.
+    """
+    name = "location"
+    cost = 1
+
+    def __init__(self, matches: Callable, same_town: Callable):
+        self.matches = matches
+        self.same_town = same_town
+
+    def run(self, ctx: VerificationContext) -> str:
+        ctx.location_match = self.matches(ctx.request, ctx.registry)
+        if ctx.location_match:
+            return "pass"
+        if not self.same_town(ctx.request, ctx.registry):
+            ctx.reject(TOWN_SUGGESTION)
+            return "suggest"
+        ctx.reject(LOCATION_MISMATCH)
+        return "fail"
+
+
+class VoteStage(Stage):
+    """Coordinate check that casts one vote, skipped once the vote is settled"""
+
+    @abstractmethod
+    def check(self, ctx: VerificationContext) -> bool:
+        """Whether this check passes; its vote"""
+
+    def run(self, ctx: VerificationContext) -> str:
+        if ctx.votes_decided:
+            return "skipped"
+        passed = self.check(ctx)
+        ctx.vote(passed)
+        return "pass" if passed else "fail"
+
+
+class CentroidDistanceStage(VoteStage):
+    name = "centroid_distance"
+    cost = 2
+
+    def check(self, ctx: VerificationContext) -> bool:
+        submitted, official = ctx.points
+        distance = geometry.haversine_distance(
+            geometry.calculate_centroid(submitted),
+            geometry.calculate_centroid(official),
+        )
+        ctx.coord_check["distance_meters"] = distance
+        return distance <= settings.COORDINATES_CENTROID_DISTANCE_METERS
+
+
+class BoundingBoxStage(VoteStage):
+    name = "bbox_overlap"
+    cost = 3
+
+    def check(self, ctx: VerificationContext) -> bool:
+        return _bbox_overlap(ctx)
+
+
+class AreaRatioStage(VoteStage):
+    name = "area_ratio"
+    cost = 4
+
+    def check(self, ctx: VerificationContext) -> bool:
+        return ctx.area_ratio() >= settings.COORDINATES_AREA_RATIO_THRESHOLD
+
+
+class OverlapStage(Stage):
+    """
+    Metric IoU by polygon clipping, the most expensive check. Only runs
+    when COORDINATES_IOU_REQUIRED is set, for pairs the votes accepted;
+    the IoU is then enforced and reported as the overlap score.
+    """
+    name = "overlap"
+    cost = 10
+
+    def run(self, ctx: VerificationContext) -> str:
+        if ctx.rejection is not None or not settings.COORDINATES_IOU_REQUIRED:
+            return "skipped"
+
+        iou = 0.0
+        if _bbox_overlap(ctx):
+            iou = geometry.polygon_iou(*ctx.points)
+        ctx.coord_check["iou"] = iou
+
+        if iou >= settings.COORDINATES_OVERLAP_THRESHOLD:
+            return "pass"
+        ctx.reject(COORDINATES_MISMATCH)
+        return "fail"
+
+
+def _bbox_overlap(ctx: VerificationContext) -> bool:
+    if "bbox_overlap" not in ctx.coord_check:
+        bbox1, bbox2 = (geometry.bounding_box(points) for points in ctx.points)
+        ctx.coord_check["bbox_overlap"] = not (
+            bbox1[2] < bbox2[0] or bbox2[2] < bbox1[0]
+            or bbox1[3] < bbox2[1] or bbox2[3] < bbox1[1]
+        )
+    return ctx.coord_check["bbox_overlap"]
+
+
+class VerificationPipeline:
+    """Registry lookup plus cost-ordered check stages, with timing"""
+
+    def __init__(self, lookup: Stage):
+        self.lookup = lookup
+        self._stages: List[Stage] = []
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+
+    @property
+    def stages(self) -> List[Stage]:
+        return [self.lookup, *self._stages]
+
+    def register(self, stage: Stage) -> None:
+        self._stages.append(stage)
+        self._stages.sort(key=lambda s: s.cost)
+
+    def run(self, ctx: VerificationContext) -> VerificationContext:
+        ctx.votes_total = sum(isinstance(stage, VoteStage) for stage in self._stages)
+
+        for stage in self.stages:
+            if ctx.rejection is not None:
+                self._record(ctx, stage.name, "skipped", 0.0)
+                continue
+            start = time.perf_counter()
+            outcome = stage.run(ctx)
+            self._record(ctx, stage.name, outcome, time.perf_counter() - start)
+
+        return ctx
+
+    def _record(self, ctx: VerificationContext, name: str, outcome: str, elapsed: float) -> None:
+        ctx.records.append(StageRecord(name, outcome, elapsed * 1000))
+        with self._lock:
+            stats = self._stats.setdefault(name, {"runs": 0, "seconds": 0.0, "outcomes": {}})
+            if outcome != "skipped":
+                stats["runs"] += 1
+                stats["seconds"] += elapsed
+            stats["outcomes"][outcome] = stats["outcomes"].get(outcome, 0) + 1
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per stage, in run order: runs, total and mean ms, outcome counts"""
+        with self._lock:
+            report = {}
+            for stage in self.stages:
+                stats = self._stats.get(stage.name, {"runs": 0, "seconds": 0.0, "outcomes": {}})
+                report[stage.name] = {
+                    "cost": stage.cost,
+                    "runs": stats["runs"],
+                    "total_ms": stats["seconds"] * 1000,
+                    "mean_ms": stats["seconds"] * 1000 / stats["runs"] if stats["runs"] else 0.0,
+                    "outcomes": dict(stats["outcomes"]),
+                }
+            return report
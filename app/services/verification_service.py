@@ -1,18 +1,66 @@
+import time
+import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, func, or_, tuple_
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.land_models import VerificationRequest, LandRegistry
 from app.schemas.land_schemas import VerificationRequestCreate
+from app.services import geohash, location_keys
 from app.services.geometry_service import geometry
-from app.core.database import engine
+from app.services.outcome_cache import outcome_cache, OUTCOME_FIELDS, OutcomeKey
+from app.services.registry_cache import registry_cache
+from app.services.spatial_index import spatial_index
+from app.services.verification_pipeline import (
+    AreaRatioStage,
+    BoundingBoxStage,
+    CentroidDistanceStage,
+    LOCATION_MISMATCH,
+    LocationStage,
+    NOT_FOUND,
+    OverlapStage,
+    RegistryLookupStage,
+    TOWN_SUGGESTION,
+    VerificationContext,
+    VerificationPipeline,
+)
+from app.services.write_behind import write_behind
+from app.core.config import settings
+from app.core.database import engine, RoutingSession
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Columns a history item needs (see VerificationHistory)
+HISTORY_COLUMNS = (
+    VerificationRequest.id,
+    VerificationRequest.status,
+    VerificationRequest.submitted_town,
+    VerificationRequest.submitted_layout,
+    VerificationRequest.submitted_block,
+    VerificationRequest.submitted_plot,
+    VerificationRequest.is_verified,
+    VerificationRequest.is_fraud,
+    VerificationRequest.requested_at,
+)
+
 
 class SimpleVerifier:
     """Simple land verification logic"""
 
+    def __init__(self):
+        # Registry search, then checks cheapest first (see verification_pipeline)
+        self.pipeline = VerificationPipeline(RegistryLookupStage(self._search_registry))
+        self.pipeline.register(LocationStage(self._location_matches, self._same_town))
+        self.pipeline.register(CentroidDistanceStage())
+        self.pipeline.register(BoundingBoxStage())
+        self.pipeline.register(AreaRatioStage())
+        self.pipeline.register(OverlapStage())
+
     def verify_land(
         self,
         db: Session,
@@ -36,191 +84,702 @@ class SimpleVerifier:
             request.plot_number,
         )
 
-        vr = VerificationRequest(
-            user_id=user_id,
-            submitted_town=request.town,
-            submitted_layout=request.layout,
-            submitted_block=request.block_number,
-            submitted_plot=request.plot_number,
-            submitted_coords=[{"lat": c.lat, "lng": c.lng} for c in request.coordinates],
-            status="pending",
-        )
+        if self._single_commit:
+            vr = self._new_request(user_id, request)
+            try:
+                self._resolve(vr, request, db)
+            except Exception:
+                logger.exception("Unexpected verification error")
+                db.rollback()
+                self._fail(vr)
+            return self._persist(db, vr)
+
+        vr = self.create_pending(db, user_id, request)
+        return self.complete(db, vr, request)
+
+    @property
+    def _single_commit(self) -> bool:
+        return settings.VERIFICATION_SINGLE_COMMIT or settings.VERIFICATION_WRITE_BEHIND
+
+    def create_pending(
+        self,
+        db: Session,
+        user_id: int,
+        request: VerificationRequestCreate,
+    ) -> VerificationRequest:
+        """Insert the pending VerificationRequest for a submission"""
+
+        vr = self._new_request(user_id, request)
 
         db.add(vr)
         db.commit()
         db.refresh(vr)
+        return vr
+
+    def complete(
+        self,
+        db: Session,
+        vr: VerificationRequest,
+        request: VerificationRequestCreate,
+        deadline: Optional[float] = None,
+    ) -> VerificationRequest:
+        """
+        Run the registry search and checks for a pending request and store
+        the outcome. If ``deadline`` (a ``time.monotonic()`` value) has
+        passed by the time the outcome is ready, it is discarded and the
+        request fails as timed out.
+        """
 
         try:
-            registry = self._search_registry(request)
+            self._resolve(vr, request)
 
-            if not registry:
-                logger.info("No registry record found")
+            if deadline is not None and time.monotonic() > deadline:
+                logger.warning("Verification timed out | verification_id=%s", vr.id)
+                db.rollback()
                 vr.status = "failed"
-                vr.message = "Land not found in registry"
-                db.commit()
-                return vr
-
-            # 1️⃣ Exact location check
-            location_match = (
-                request.town.lower() == registry.town.lower()
-                and request.layout.lower() == registry.layout.lower()
-                and request.block_number == registry.block_number
-                and request.plot_number == registry.plot_number
-            )
+                vr.message = "Verification timed out"
 
-            vr.location_match = location_match
-
-            if not location_match:
-                logger.warning(
-                    "Location mismatch | registry_id=%s",
-                    registry.id,
-                )
-                vr.status = "fraudulent"
-                vr.is_fraud = True
-                vr.fraud_reason = "Location information mismatch"
-                vr.message = "Location does not match registry"
-                db.commit()
-                return vr
-
-            # 2️⃣ Coordinate comparison
-            submitted_points = geometry.points_to_list(vr.submitted_coords)
-            official_points = geometry.points_to_list(registry.coordinates)
-
-            coord_check = geometry.compare_polygons(
-                submitted_points,
-                official_points,
-            )
-
-            vr.coordinates_match = coord_check["match"]
-            vr.overlap_score = coord_check["area_ratio"]
-            vr.distance_meters = coord_check["distance_meters"]
-
-            if coord_check["match"]:
-                logger.info(
-                    "Verification successful | registry_id=%s | overlap=%.2f",
-                    registry.id,
-                    coord_check["area_ratio"],
-                )
-
-                vr.status = "verified"
-                vr.is_verified = True
-                vr.message = "Land verification successful"
-
-                vr.official_owner = registry.owner_name
-                vr.official_coords = registry.coordinates
-                vr.official_area = registry.area_square_meters
-                vr.official_certificate_pdf_url = registry.certificate_pdf_url
-                vr.official_certificate_number = registry.certificate_number
-            else:
-                logger.warning(
-                    "Coordinate mismatch | registry_id=%s | distance=%.2fm",
-                    registry.id,
-                    coord_check["distance_meters"],
-                )
-
-                vr.status = "fraudulent"
-                vr.is_fraud = True
-                vr.fraud_reason = (
-                    f"Coordinates mismatch "
-                    f"(distance: {coord_check['distance_meters']:.1f}m)"
-                )
-                vr.message = "Coordinates do not match official records"
-
-            vr.verified_at = datetime.utcnow()
             db.commit()
             return vr
 
         except Exception:
             logger.exception("Unexpected verification error")
-            vr.status = "failed"
-            vr.message = "Internal verification error"
+            db.rollback()
+            self._fail(vr)
             db.commit()
             return vr
 
+    async def averify_land(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        request: VerificationRequestCreate,
+        durable: bool = False,
+    ) -> VerificationRequest:
+        """
+        Async ``verify_land``: the same flow, with every database
+        round-trip awaited on ``db`` and the CPU-bound checks on the
+        threadpool, so the event loop is never blocked. ``db`` must not
+        expire objects on commit (see ``get_async_session``).
+        ``durable`` commits the row on ``db`` before returning, bypassing
+        the write-behind buffer, for callers that reference it.
+        """
+
+        logger.info(
+            "Starting land verification | user_id=%s | town=%s | layout=%s | block=%s | plot=%s",
+            user_id,
+            request.town,
+            request.layout,
+            request.block_number,
+            request.plot_number,
+        )
+
+        vr = self._new_request(user_id, request)
+
+        if self._single_commit:
+            try:
+                await self._aresolve(db, vr, request)
+            except Exception:
+                logger.exception("Unexpected verification error")
+                await db.rollback()
+                self._fail(vr)
+
+            if settings.VERIFICATION_WRITE_BEHIND and not durable:
+                return write_behind.add(vr)
+            db.add(vr)
+            await db.commit()
+            return vr
+
+        db.add(vr)
+        await db.commit()
+
+        try:
+            await self._aresolve(db, vr, request)
+            await db.commit()
+            return vr
+
+        except Exception:
+            logger.exception("Unexpected verification error")
+            await db.rollback()
+            self._fail(vr)
+            await db.commit()
+            # The rollback expired vr; reload it here rather than lazily
+            await db.refresh(vr)
+            return vr
+
+    async def _aresolve(
+        self,
+        db: AsyncSession,
+        vr: VerificationRequest,
+        request: VerificationRequestCreate,
+    ) -> None:
+        """
+        ``_resolve`` for async callers: the outcome check and registry
+        search run on ``db``, the pipeline's geometry on the threadpool
+        """
+        def lookup(session: Session) -> Tuple[bool, Optional[LandRegistry]]:
+            if self._reuse_outcome(vr, request, session):
+                return True, None
+            return False, self._search_registry(request, session)
+
+        reused, registry = await db.run_sync(lookup)
+        if not reused:
+            ctx = VerificationContext(request, vr, registry=registry, searched=True)
+            await run_in_threadpool(self._check, ctx)
+
+    def _resolve(
+        self,
+        vr: VerificationRequest,
+        request: VerificationRequestCreate,
+        session: Optional[Session] = None,
+        registry: Optional[LandRegistry] = None,
+    ) -> None:
+        """
+        Fill in vr's outcome: memoized, or from the verification pipeline.
+        ``registry`` is a record already found for the request (batch
+        lookups); the registry search only runs without one.
+        """
+        if self._reuse_outcome(vr, request, session):
+            return
+        self._check(VerificationContext(request, vr, session, registry=registry))
+
+    def _check(self, ctx: VerificationContext) -> None:
+        """Run the verification pipeline on ``ctx`` and fill in its result"""
+        ctx = self.pipeline.run(ctx)
+        logger.debug(
+            "Verification stages | %s",
+            " | ".join(f"{r.name}={r.outcome}:{r.elapsed_ms:.2f}ms" for r in ctx.records),
+        )
+        self._apply_context(ctx)
+        self._remember_outcome(ctx.vr, ctx.request, ctx.registry)
+
+    def _apply_context(self, ctx: VerificationContext) -> None:
+        """Fill in the verification result from a finished pipeline run"""
+        vr, registry = ctx.vr, ctx.registry
+
+        if ctx.rejection == NOT_FOUND:
+            self._not_found(vr)
+            return
+
+        vr.location_match = ctx.location_match
+        if ctx.rejection == TOWN_SUGGESTION:
+            self._town_suggestion(vr, registry)
+            return
+        if ctx.rejection == LOCATION_MISMATCH:
+            self._location_mismatch(vr, registry)
+            return
+
+        self._apply_coordinates(vr, registry, {
+            "match": ctx.coordinates_match,
+            "overlap": ctx.overlap_score,
+            "distance_meters": ctx.coord_check["distance_meters"],
+        })
+
+    def _fail(self, vr: VerificationRequest) -> None:
+        vr.status = "failed"
+        vr.message = "Internal verification error"
+
+    def _persist(self, db: Session, vr: VerificationRequest) -> VerificationRequest:
+        """
+        Write a finished VerificationRequest in a single commit, or hand it
+        to the write-behind buffer
+        """
+        if settings.VERIFICATION_WRITE_BEHIND:
+            return write_behind.add(vr)
+
+        # vr was built in memory, so keep it loaded after the commit
+        # rather than re-selecting it
+        expire_on_commit = db.expire_on_commit
+        db.expire_on_commit = False
+        try:
+            db.add(vr)
+            db.commit()
+        finally:
+            db.expire_on_commit = expire_on_commit
+        return vr
+
+    def verify_batch(
+        self,
+        db: Session,
+        user_id: int,
+        requests: List[VerificationRequestCreate],
+    ) -> List[VerificationRequest]:
+        """
+        Verify many submissions at once, returning results in input order.
+
+        Exact registry matches for the whole batch are resolved with one
+        query; each item then runs through the same pipeline as
+        ``verify_land`` and every VerificationRequest is written in one
+        commit. A failure on one item, verifying or storing it, marks only
+        that item as failed.
+        """
+
+        logger.info(
+            "Starting batch land verification | user_id=%s | items=%s",
+            user_id,
+            len(requests),
+        )
+
+        vrs = [self._new_request(user_id, request) for request in requests]
+
+        with RoutingSession(engine) as registry_session:
+            try:
+                exact = self._exact_matches(registry_session, requests)
+            except Exception:
+                logger.exception("Batch exact registry lookup failed")
+                exact = {}
+
+            for i, (vr, request) in enumerate(zip(vrs, requests)):
+                try:
+                    self._resolve(vr, request, registry_session, registry=exact.get(i))
+                except Exception:
+                    logger.exception("Unexpected verification error | item=%s", i)
+                    registry_session.rollback()
+                    self._fail(vr)
+
+        # Rows were fully built in memory, so keep them loaded after the
+        # commit rather than re-selecting each one when results are read
+        expire_on_commit = db.expire_on_commit
+        db.expire_on_commit = False
+        try:
+            db.add_all(vrs)
+            db.commit()
+        except Exception:
+            logger.exception("Batch insert failed, storing items one by one")
+            db.rollback()
+            self._store_each(db, vrs)
+        finally:
+            db.expire_on_commit = expire_on_commit
+
+        return vrs
+
+    def _store_each(self, db: Session, vrs: List[VerificationRequest]) -> None:
+        """
+        Insert each VerificationRequest under its own savepoint, so a row
+        the database rejects fails alone; it is returned as failed but not
+        stored
+        """
+        for i, vr in enumerate(vrs):
+            try:
+                with db.begin_nested():
+                    db.add(vr)
+            except Exception:
+                logger.exception("Could not store verification | item=%s", i)
+                vr.status = "failed"
+                vr.message = "Verification could not be stored"
+        db.commit()
+
     # ------------------------------------------------------------------
 
+    def _new_request(
+        self,
+        user_id: int,
+        request: VerificationRequestCreate,
+    ) -> VerificationRequest:
+        return VerificationRequest(
+            user_id=user_id,
+            submitted_town=request.town,
+            submitted_layout=request.layout,
+            submitted_block=request.block_number,
+            submitted_plot=request.plot_number,
+            submitted_coords=[{"lat": c.lat, "lng": c.lng} for c in request.coordinates],
+            status="pending",
+        )
+
+    def _location_matches(
+        self,
+        request: VerificationRequestCreate,
+        registry: LandRegistry,
+    ) -> bool:
+        # Same normalization as the registry lookup: "Molyko II" is "Molyko-II"
+        return (
+            self._same_town(request, registry)
+            and location_keys.normalize(request.layout) == location_keys.normalize(registry.layout)
+            and request.block_number == registry.block_number
+            and request.plot_number == registry.plot_number
+        )
+
+    def _same_town(
+        self,
+        request: VerificationRequestCreate,
+        registry: LandRegistry,
+    ) -> bool:
+        return location_keys.normalize(request.town) == location_keys.normalize(registry.town)
+
+    def _not_found(self, vr: VerificationRequest) -> None:
+        logger.info("No registry record found")
+        vr.status = "failed"
+        vr.message = "Land not found in registry"
+
+    def _town_suggestion(self, vr: VerificationRequest, registry: LandRegistry) -> None:
+        logger.info(
+            "Registry record found only by fuzzy town match | registry_id=%s | town=%s",
+            registry.id,
+            registry.town,
+        )
+        vr.status = "failed"
+        vr.message = f"Land not found in registry. Did you mean {registry.town}?"
+
+    def _location_mismatch(self, vr: VerificationRequest, registry: LandRegistry) -> None:
+        logger.warning(
+            "Location mismatch | registry_id=%s",
+            registry.id,
+        )
+        vr.status = "fraudulent"
+        vr.is_fraud = True
+        vr.fraud_reason = "Location information mismatch"
+        vr.message = "Location does not match registry"
+
+    def _apply_coordinates(
+        self,
+        vr: VerificationRequest,
+        registry: LandRegistry,
+        coord_check: dict,
+    ) -> None:
+        vr.coordinates_match = coord_check["match"]
+        vr.overlap_score = coord_check["overlap"]
+        vr.distance_meters = coord_check["distance_meters"]
+
+        if coord_check["match"]:
+            logger.info(
+                "Verification successful | registry_id=%s | overlap=%.2f",
+                registry.id,
+                coord_check["overlap"],
+            )
+
+            vr.status = "verified"
+            vr.is_verified = True
+            vr.message = "Land verification successful"
+
+            vr.official_owner = registry.owner_name
+            vr.official_coords = registry.coordinates
+            vr.official_area = registry.area_square_meters
+            vr.official_certificate_pdf_url = registry.certificate_pdf_url
+            vr.official_certificate_number = registry.certificate_number
+        else:
+            logger.warning(
+                "Coordinate mismatch | registry_id=%s | distance=%.2fm",
+                registry.id,
+                coord_check["distance_meters"],
+            )
+
+            vr.status = "fraudulent"
+            vr.is_fraud = True
+            vr.fraud_reason = (
+                f"Coordinates mismatch "
+                f"(distance: {coord_check['distance_meters']:.1f}m)"
+            )
+            vr.message = "Coordinates do not match official records"
+
+        vr.verified_at = datetime.utcnow()
+
+    # ------------------------------------------------------------------
+
+    def _outcome_key(self, request: VerificationRequestCreate) -> OutcomeKey:
+        return (
+            location_keys.location_key(
+                request.town, request.layout, request.block_number, request.plot_number
+            ),
+            geometry.polygon_hash([(c.lat, c.lng) for c in request.coordinates]),
+        )
+
+    def _reuse_outcome(
+        self,
+        vr: VerificationRequest,
+        request: VerificationRequestCreate,
+        session: Optional[Session] = None,
+    ) -> bool:
+        """
+        Fill in ``vr`` from a memoized outcome of an identical submission,
+        if the registry record it was computed against is unchanged.
+        ``vr`` keeps its own row, submitted data and timestamps.
+        """
+        if not outcome_cache.enabled:
+            return False
+
+        key = self._outcome_key(request)
+        memo = outcome_cache.get(key)
+        if memo is None:
+            return False
+
+        stmt = select(LandRegistry.id, LandRegistry.version).where(
+            LandRegistry.id == memo.registry_id,
+            LandRegistry.is_active.is_(True),
+        )
+        if session is not None:
+            row = session.exec(stmt).first()
+        else:
+            with RoutingSession(engine) as session:
+                row = session.exec(stmt).first()
+
+        # No row: deleted or deactivated. A NULL version (a row added before
+        # the column and never backfilled) counts as 1, as in _bump_version
+        if row is None or (row.version or 1) != memo.registry_version:
+            outcome_cache.discard(key)
+            return False
+
+        for field, value in memo.fields.items():
+            setattr(vr, field, value)
+        vr.verified_at = datetime.utcnow()
+
+        logger.info(
+            "Reused verification outcome | verification_id=%s | source=%s | registry_id=%s",
+            vr.id,
+            memo.verification_id,
+            memo.registry_id,
+        )
+        return True
+
+    def _remember_outcome(
+        self,
+        vr: VerificationRequest,
+        request: VerificationRequestCreate,
+        registry: Optional[LandRegistry],
+    ) -> None:
+        if registry is None or not outcome_cache.enabled:
+            return
+        outcome_cache.put(
+            self._outcome_key(request),
+            vr.id,
+            registry,
+            {field: getattr(vr, field) for field in OUTCOME_FIELDS},
+        )
+
     def _search_registry(
         self,
         request: VerificationRequestCreate,
+        session: Optional[Session] = None,
     ) -> Optional[LandRegistry]:
-        """Search registry using exact match, then proximity match"""
+        """
+        Search registry using exact match, then proximity match, on
+        ``session`` or a short-lived session of its own
+        """
 
-        from sqlmodel import Session
+        if session is not None:
+            return self._exact_match(session, request) or self._proximity_match(session, request)
 
-        with Session(engine) as session:
-            logger.debug("Searching registry (exact match)")
+        with RoutingSession(engine) as session:
+            return self._exact_match(session, request) or self._proximity_match(session, request)
 
+    def _exact_match(
+        self,
+        session: Session,
+        request: VerificationRequestCreate,
+    ) -> Optional[LandRegistry]:
+        logger.debug("Searching registry (exact match)")
+
+        key = location_keys.location_key(
+            request.town, request.layout, request.block_number, request.plot_number
+        )
+        cached = registry_cache.get_by_key(key)
+        if cached is not None:
+            logger.info(
+                "Exact registry match found (cached) | registry_id=%s",
+                cached.id,
+            )
+            return cached
+
+        stmt = select(LandRegistry).where(
+            LandRegistry.location_key == key,
+            LandRegistry.is_active.is_(True),
+        )
+
+        result = session.exec(stmt).first()
+        if result:
+            logger.info(
+                "Exact registry match found | registry_id=%s",
+                result.id,
+            )
+            return registry_cache.put(result)
+        return self._fuzzy_match(session, request)
+
+    def _exact_matches(
+        self,
+        session: Session,
+        requests: List[VerificationRequestCreate],
+    ) -> Dict[int, LandRegistry]:
+        """
+        Exact matches for a whole batch with one set-based query on the
+        location key, keyed by request position
+        """
+        keys = [
+            location_keys.location_key(r.town, r.layout, r.block_number, r.plot_number)
+            for r in requests
+        ]
+        if not keys:
+            return {}
+
+        by_key: Dict[str, LandRegistry] = {}
+        for key in set(keys):
+            cached = registry_cache.get_by_key(key)
+            if cached is not None:
+                by_key[key] = cached
+
+        missing = set(keys) - set(by_key)
+        if missing:
             stmt = select(LandRegistry).where(
-                LandRegistry.town.ilike(f"%{request.town}%"),
-                LandRegistry.layout.ilike(f"%{request.layout}%"),
+                LandRegistry.location_key.in_(missing),
+                LandRegistry.is_active.is_(True),
+            )
+            for record in session.exec(stmt):
+                if record.location_key not in by_key:
+                    by_key[record.location_key] = registry_cache.put(record)
+
+        return {i: by_key[key] for i, key in enumerate(keys) if key in by_key}
+
+    def _fuzzy_match(
+        self,
+        session: Session,
+        request: VerificationRequestCreate,
+    ) -> Optional[LandRegistry]:
+        """
+        Same layout, block and plot in the most similar town, when fuzzy
+        town matching is enabled. Whether the town counts as a location
+        match is still decided by ``_location_matches``.
+        """
+        if not settings.REGISTRY_FUZZY_TOWN_MATCH:
+            return None
+
+        logger.debug("No exact match found, running fuzzy town search")
+
+        stmt = (
+            select(LandRegistry)
+            .where(
+                self._town_clause(session, request.town),
+                LandRegistry.layout_key == location_keys.normalize(request.layout),
                 LandRegistry.block_number == request.block_number,
                 LandRegistry.plot_number == request.plot_number,
                 LandRegistry.is_active.is_(True),
             )
-
-            result = session.exec(stmt).first()
-            if result:
-                logger.info(
-                    "Exact registry match found | registry_id=%s",
-                    result.id,
-                )
-                return result
-
-            logger.debug("No exact match found, running proximity search")
-
-            if not request.coordinates:
-                logger.warning("No coordinates supplied for proximity search")
-                return None
-
-            stmt = (
-                select(LandRegistry)
-                .where(
-                    LandRegistry.town.ilike(f"%{request.town}%"),
-                    LandRegistry.is_active.is_(True),
-                )
-                .limit(20)
+            .order_by(
+                func.similarity(LandRegistry.town_key, location_keys.normalize(request.town)).desc()
             )
+            .limit(1)
+        )
 
-            candidates = session.exec(stmt).all()
-
-            submitted_points = geometry.points_to_list(
-                [{"lat": c.lat, "lng": c.lng} for c in request.coordinates]
+        result = session.exec(stmt).first()
+        if result:
+            logger.info(
+                "Fuzzy registry match found | registry_id=%s | town=%s",
+                result.id,
+                result.town,
             )
-            submitted_center = geometry.calculate_centroid(submitted_points)
+        return result
 
-            best_match = None
-            min_distance = float("inf")
+    def _town_clause(self, session: Session, town: str):
+        """
+        Indexed town filter: key equality, widened to similar keys when
+        fuzzy matching is enabled (pg_trgm ``%`` uses the trigram index)
+        """
+        key = location_keys.normalize(town)
+        if not settings.REGISTRY_FUZZY_TOWN_MATCH:
+            return LandRegistry.town_key == key
 
-            for record in candidates:
-                if not record.coordinates:
-                    continue
+        similar = func.similarity(LandRegistry.town_key, key) >= settings.REGISTRY_FUZZY_TOWN_THRESHOLD
+        if session.get_bind(LandRegistry).dialect.name == "postgresql":
+            similar = and_(LandRegistry.town_key.op("%")(key), similar)
+        return or_(LandRegistry.town_key == key, similar)
 
-                official_points = geometry.points_to_list(record.coordinates)
-                official_center = geometry.calculate_centroid(official_points)
+    def _proximity_match(
+        self,
+        session: Session,
+        request: VerificationRequestCreate,
+    ) -> Optional[LandRegistry]:
+        logger.debug("No exact match found, running proximity search")
 
-                distance = geometry.haversine_distance(
-                    submitted_center,
-                    official_center,
-                )
+        if not request.coordinates:
+            logger.warning("No coordinates supplied for proximity search")
+            return None
 
-                logger.debug(
-                    "Proximity check | registry_id=%s | distance=%.2fm",
-                    record.id,
-                    distance,
-                )
+        submitted_points = geometry.points_to_list(
+            [{"lat": c.lat, "lng": c.lng} for c in request.coordinates]
+        )
+        submitted_center = geometry.calculate_centroid(submitted_points)
+        candidates = self._proximity_candidates(
+            session,
+            request.town,
+            submitted_center,
+            radius_meters=settings.MAX_COORDINATES_DISTANCE_METERS,
+        )
 
-                if distance < min_distance and distance < 50:
-                    min_distance = distance
-                    best_match = record
+        logger.debug(
+            "Proximity check | candidates=%s",
+            len(candidates),
+        )
+
+        if not candidates:
+            return None
 
+        best_id, min_distance = candidates[0]
+        best_match = registry_cache.get(best_id)
+        if best_match is None:
+            best_match = session.get(LandRegistry, best_id)
             if best_match:
-                logger.info(
-                    "Proximity registry match found | registry_id=%s | distance=%.2fm",
-                    best_match.id,
-                    min_distance,
-                )
+                registry_cache.put(best_match)
+
+        if best_match:
+            logger.info(
+                "Proximity registry match found | registry_id=%s | distance=%.2fm",
+                best_match.id,
+                min_distance,
+            )
+
+        return best_match
+
+    def _proximity_candidates(
+        self,
+        session: Session,
+        town: str,
+        center: Tuple[float, float],
+        radius_meters: float,
+    ) -> List[Tuple[uuid.UUID, float]]:
+        """
+        (registry_id, distance) of active parcels in the town whose
+        centroid lies within radius of center, nearest first. Uses the
+        in-process spatial index when it is enabled and built, otherwise
+        the indexed geohash column.
+        """
+        if spatial_index.ready:
+            nearby = spatial_index.query_radius(center, radius_meters)
+            if not nearby:
+                return []
+
+            # The index only narrows by position; town and active status
+            # are confirmed against the table
+            stmt = select(LandRegistry.id).where(
+                LandRegistry.id.in_([registry_id for registry_id, _ in nearby]),
+                self._town_clause(session, town),
+                LandRegistry.is_active.is_(True),
+            )
+            allowed = set(session.exec(stmt).all())
+            return [(registry_id, d) for registry_id, d in nearby if registry_id in allowed]
+
+        # Indexed equality lookup on the centroid's geohash cell and its
+        # neighbours; only ids and centroids are fetched, never coordinates
+        cells = geohash.covering_cells(center[0], center[1], settings.REGISTRY_GEOHASH_PRECISION)
+        stmt = select(
+            LandRegistry.id,
+            LandRegistry.centroid_lat,
+            LandRegistry.centroid_lng,
+        ).where(
+            LandRegistry.geohash.in_(cells),
+            self._town_clause(session, town),
+            LandRegistry.is_active.is_(True),
+        )
 
-            return best_match
+        rows = session.exec(stmt).all()
+        if not rows:
+            return []
+
+        distances = geometry.haversine_many(
+            np.array([(r.centroid_lat, r.centroid_lng) for r in rows], dtype=np.float64),
+            center,
+        )
+
+        return sorted(
+            ((rows[i].id, float(d)) for i, d in enumerate(distances) if d < radius_meters),
+            key=lambda item: item[1],
+        )
 
     # ------------------------------------------------------------------
 
@@ -229,18 +788,46 @@ class SimpleVerifier:
         db: Session,
         user_id: int,
         limit: int = 50,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
     ) -> list:
-        """Get user's verification history"""
+        """Get user's verification history as rows of HISTORY_COLUMNS"""
 
-        stmt = (
-            select(VerificationRequest)
-            .where(VerificationRequest.user_id == user_id)
-            .order_by(VerificationRequest.requested_at.desc())
+        return db.exec(self._history_query(user_id, limit, after)).all()
+
+    async def aget_history(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+    ) -> list:
+        """Async ``get_history``"""
+
+        return (await db.exec(self._history_query(user_id, limit, after))).all()
+
+    def _history_query(
+        self,
+        user_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+    ):
+        """
+        Newest first. ``after`` is the (requested_at, id) of the last row of
+        the previous page: the next page is an index seek on
+        (user_id, requested_at, id), however deep it is. Only the columns
+        of a history item are selected, never the coordinate blobs.
+        """
+        stmt = select(*HISTORY_COLUMNS).where(VerificationRequest.user_id == user_id)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(VerificationRequest.requested_at, VerificationRequest.id) < tuple(after)
+            )
+        return (
+            stmt
+            .order_by(VerificationRequest.requested_at.desc(), VerificationRequest.id.desc())
             .limit(limit)
         )
 
-        return db.exec(stmt).all()
-
 
 # Global instance
 verifier = SimpleVerifier()
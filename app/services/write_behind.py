@@ -0,0 +1,121 @@
+"""
+Write-behind buffer for finished verification results.
+
+With ``VERIFICATION_WRITE_BEHIND`` on, a verification returns as soon
+as its outcome is known and the VerificationRequest row is written later
+by a background thread, batched: the buffer is flushed every
+``VERIFICATION_WRITE_BEHIND_INTERVAL_MS`` or as soon as
+``VERIFICATION_WRITE_BEHIND_MAX_ROWS`` rows are waiting, in one commit.
+
+The trade-off: a result can be returned before its row exists, so a
+client reading history straight away may not see it yet, and rows still
+buffered when the process dies are lost. ``flush()`` runs on shutdown.
+"""
+import logging
+import threading
+from typing import List, Optional
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.land_models import VerificationRequest
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Batches VerificationRequest inserts on a background thread"""
+
+    def __init__(
+        self,
+        interval_ms: int = settings.VERIFICATION_WRITE_BEHIND_INTERVAL_MS,
+        max_rows: int = settings.VERIFICATION_WRITE_BEHIND_MAX_ROWS,
+    ):
+        self.interval_seconds = interval_ms / 1000
+        self.max_rows = max_rows
+
+        self._condition = threading.Condition()
+        self._rows: List[VerificationRequest] = []
+        self._flusher: Optional[threading.Thread] = None
+        self._flush_lock = threading.Lock()
+
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def add(self, vr: VerificationRequest) -> VerificationRequest:
+        """Queue a copy of ``vr`` for insertion; returns ``vr``"""
+        copy = VerificationRequest.model_validate(vr)
+        with self._condition:
+            self._start()
+            self._rows.append(copy)
+            if len(self._rows) >= self.max_rows:
+                self._condition.notify()
+        return vr
+
+    def _start(self) -> None:
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._run, name="verification-write-behind", daemon=True)
+            self._flusher.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: len(self._rows) >= self.max_rows, timeout=self.interval_seconds)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed")
+
+    def flush(self) -> int:
+        """Write every buffered row now; returns rows written"""
+        with self._flush_lock:
+            with self._condition:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+
+            with Session(engine, expire_on_commit=False) as session:
+                try:
+                    session.add_all(rows)
+                    session.commit()
+                    written = len(rows)
+                except Exception:
+                    # Retry one by one so a bad row cannot drop the batch
+                    session.rollback()
+                    written = self._write_each(session, rows)
+
+            self.written += written
+            self.flushes += 1
+            return written
+
+    def _write_each(self, session: Session, rows: List[VerificationRequest]) -> int:
+        written = 0
+        for vr in rows:
+            try:
+                session.merge(vr)
+                session.commit()
+                written += 1
+            except Exception:
+                session.rollback()
+                self.failed += 1
+                logger.exception("Dropping verification result | verification_id=%s", vr.id)
+        return written
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._rows)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.VERIFICATION_WRITE_BEHIND,
+            "pending": self.pending(),
+            "written": self.written,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
+
+
+# Global instance
+write_behind = WriteBehindBuffer()
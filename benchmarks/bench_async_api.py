@@ -0,0 +1,125 @@
+"""
+Benchmark: requests/sec for POST /verification/verify, sync vs. async DB.
+
+Drives the ASGI app in-process with concurrent clients at concurrency 1,
+16 and 128. ``async`` is the real endpoint (AsyncSession, awaited
+round-trips). ``sync`` is the same flow as it used to run: an ``async
+def`` endpoint calling the sync ``UserCRUD`` / ``verify_land`` on
+``Session(engine)``, blocking the event loop on every query.
+
+Usage:
+    python -m benchmarks.bench_async_api
+"""
+import asyncio
+import logging
+import time
+
+from benchmarks.scratch_db import use_scratch_database
+
+use_scratch_database("bench_async_api")
+
+import httpx
+from fastapi import Request
+from sqlmodel import Session, SQLModel
+
+from app.core import database
+from app.core.database import engine
+from app.core.security import create_access_token, verify_token
+from app.crud.user import UserCRUD
+from app.main import app
+from app.models.land_models import LandRegistry
+from app.models.user import User
+from app.schemas.land_schemas import VerificationRequestCreate
+from app.services.verification_service import verifier
+
+CONCURRENCY = (1, 16, 128)
+REQUESTS_PER_LEVEL = 400
+PLOTS = 200
+
+SQUARE = [
+    {"lat": 4.1550, "lng": 9.2410},
+    {"lat": 4.1550, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2410},
+]
+
+
+@app.post("/bench/verify-sync")
+async def verify_sync(body: VerificationRequestCreate, request: Request):
+    """The pre-async endpoint: sync session calls inside ``async def``"""
+    email = verify_token(request.headers["Authorization"].split()[1])["sub"]
+    # Closed before returning: left to a threadpool dependency teardown,
+    # pending sessions pile up while the blocked loop exhausts the pool
+    with Session(engine) as db:
+        user = UserCRUD.get_user_by_email(db, email)
+        vr = verifier.verify_land(db, user.id, body)
+        return {"status": vr.status}
+
+
+def seed() -> str:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(PLOTS):
+            session.add(LandRegistry(
+                certificate_number=f"BENCH-{i}",
+                certificate_pdf_url="https://example.com/cert.pdf",
+                town="Buea",
+                layout="Molyko",
+                block_number="B1",
+                plot_number=f"P{i}",
+                coordinates=SQUARE,
+                owner_name="Bench Owner",
+                area_square_meters=1900.0,
+            ))
+        session.add(User(name="bench", email="bench@example.com", is_verified=True))
+        session.commit()
+    return create_access_token({"sub": "bench@example.com"})
+
+
+async def run_level(client: httpx.AsyncClient, path: str, token: str, concurrency: int) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    queue = asyncio.Queue()
+    for i in range(REQUESTS_PER_LEVEL):
+        queue.put_nowait(i)
+
+    async def worker():
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            body = {
+                "town": "Buea",
+                "layout": "Molyko",
+                "block_number": "B1",
+                "plot_number": f"P{i % PLOTS}",
+                "coordinates": SQUARE,
+            }
+            response = await client.post(path, json=body, headers=headers)
+            assert response.status_code == 200, response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return REQUESTS_PER_LEVEL / (time.perf_counter() - start)
+
+
+async def main():
+    logging.disable(logging.INFO)
+    database.engine.echo = False
+    database.async_engine.echo = False
+    token = seed()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'concurrency':>11} {'sync (req/s)':>13} {'async (req/s)':>14}")
+        for concurrency in CONCURRENCY:
+            sync_rate = await run_level(client, "/bench/verify-sync", token, concurrency)
+            async_rate = await run_level(client, "/api/v1/verification/verify", token, concurrency)
+            print(f"{concurrency:>11} {sync_rate:>13.1f} {async_rate:>14.1f}")
+
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
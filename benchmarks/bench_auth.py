@@ -0,0 +1,81 @@
+"""
+Benchmark: authentication overhead per request.
+
+Resolves the same bearer token the way ``get_current_user`` does, with
+the verified-token cache and the principal cache each on and off:
+``verify_token`` alone (JWT decode), then the full dependency (decode
+plus user lookup) on an AsyncSession. Reports microseconds per request.
+
+Usage:
+    python -m benchmarks.bench_auth [requests]
+"""
+import asyncio
+import logging
+import sys
+import time
+
+from benchmarks.scratch_db import use_scratch_database
+
+use_scratch_database("bench_auth")
+
+from sqlmodel import Session, SQLModel
+
+from app.api.deps import get_current_user
+from app.core.database import engine, new_async_session
+from app.core.security import create_access_token, token_cache, verify_token
+from app.models.user import User
+from app.services.principal_cache import principal_cache
+
+REQUESTS = 20_000
+EMAIL = "bench@example.com"
+
+
+def seed() -> str:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(name="bench", email=EMAIL))
+        session.commit()
+    return create_access_token({"sub": EMAIL, "role": "user"})
+
+
+def configure(token_cached: bool, principal_cached: bool) -> None:
+    token_cache.enabled = token_cached
+    token_cache.clear()
+    principal_cache.enabled = principal_cached
+    principal_cache.clear()
+
+
+def time_decode(token: str, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        verify_token(token)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def time_dependency(token: str, requests: int) -> float:
+    async with new_async_session() as session:
+        start = time.perf_counter()
+        for _ in range(requests):
+            await get_current_user(token, session)
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else REQUESTS
+    logging.disable(logging.INFO)
+    engine.echo = False
+    token = seed()
+
+    print(f"{'token cache':>12} {'principal cache':>16} {'decode us':>10} {'get_current_user us':>20}")
+    for token_cached in (False, True):
+        for principal_cached in (False, True):
+            configure(token_cached, principal_cached)
+            decode = time_decode(token, requests)
+            configure(token_cached, principal_cached)
+            dependency = asyncio.run(time_dependency(token, requests // 10))
+            print(f"{str(token_cached):>12} {str(principal_cached):>16} {decode:>10.1f} {dependency:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: streaming verification export throughput and memory.
+
+Seeds verification requests and drains ``stream_export`` in every
+format, reporting rows per second, then peak Python memory (tracemalloc,
+measured in a separate pass since tracing slows everything down) for two
+export sizes: peak memory should not grow with the row count.
+
+Usage:
+    python -m benchmarks.bench_export
+"""
+import logging
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.scratch_db import use_scratch_database
+
+use_scratch_database("bench_export")
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel
+
+from app.core.database import engine
+from app.models.land_models import VerificationRequest
+from app.models.user import User
+from app.services.verification_export import ExportFilters, stream_export
+
+ROWS = 100_000
+SQUARE = [
+    {"lat": 4.1550, "lng": 9.2410},
+    {"lat": 4.1550, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2410},
+]
+START = datetime(2024, 1, 1)
+
+
+def seed() -> None:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(name="bench", email="bench@example.com")
+        session.add(user)
+        session.commit()
+        session.execute(insert(VerificationRequest), [
+            {"id": uuid.uuid4(), "user_id": user.id, "submitted_town": "Buea",
+             "submitted_layout": "Molyko", "submitted_block": "B1", "submitted_plot": f"P{i}",
+             "submitted_coords": SQUARE, "official_coords": SQUARE, "official_owner": "Bench Owner",
+             "status": "verified", "is_verified": True, "is_fraud": i % 10 == 0,
+             "overlap_score": 1.0, "distance_meters": 0.0,
+             "requested_at": START + timedelta(seconds=i)}
+            for i in range(ROWS)
+        ])
+        session.commit()
+
+
+def drain(filters: ExportFilters, fmt: str, compress: bool):
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in stream_export(filters, fmt, compress))
+    return time.perf_counter() - start, size
+
+
+def peak_memory(filters: ExportFilters) -> int:
+    tracemalloc.start()
+    for _ in stream_export(filters, "ndjson"):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    logging.disable(logging.INFO)
+    engine.echo = False
+    seed()
+
+    sizes = (ROWS // 10, ROWS)
+    print(f"{'rows':>8} {'format':>12} {'rows/s':>9} {'MB out':>8}")
+    for rows in sizes:
+        filters = ExportFilters(until=START + timedelta(seconds=rows))
+        for fmt, compress in (("ndjson", False), ("csv", False), ("ndjson", True), ("csv", True)):
+            elapsed, size = drain(filters, fmt, compress)
+            label = fmt + (".gz" if compress else "")
+            print(f"{rows:>8} {label:>12} {rows / elapsed:>9.0f} {size / 1e6:>8.1f}")
+
+    for rows in sizes:
+        peak = peak_memory(ExportFilters(until=START + timedelta(seconds=rows)))
+        print(f"peak memory, {rows} rows (ndjson): {peak / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
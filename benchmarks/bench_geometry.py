@@ -0,0 +1,72 @@
+"""
+Benchmark: per-candidate Python loop vs. batch geometry engine.
+
+Compares one submitted polygon against N registry polygons the way
+``SimpleVerifier._search_registry`` used to (one call per candidate to
+the original ``compare_polygons``, see ``baseline_geometry``) and with a
+single ``compare_many`` call.
+
+Usage:
+    python -m benchmarks.bench_geometry
+"""
+import random
+import time
+
+import numpy as np
+
+from app.services.geometry_service import geometry
+from benchmarks.baseline_geometry import baseline_geometry
+
+SIZES = (10, 100, 10_000)
+VERTICES = 6
+
+
+def random_polygon(rng: random.Random, center=(4.155, 9.241), spread=0.01):
+    lat0 = center[0] + rng.uniform(-spread, spread)
+    lng0 = center[1] + rng.uniform(-spread, spread)
+    return [
+        (lat0 + rng.uniform(-1e-4, 1e-4), lng0 + rng.uniform(-1e-4, 1e-4))
+        for _ in range(VERTICES)
+    ]
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = random.Random(42)
+    submitted = random_polygon(rng)
+
+    print(f"{'candidates':>10} {'loop (ms)':>12} {'batch (ms)':>12} {'speedup':>9}")
+    for size in SIZES:
+        candidates = [random_polygon(rng) for _ in range(size)]
+
+        def loop():
+            return [baseline_geometry.compare_polygons(submitted, c) for c in candidates]
+
+        def batch():
+            return geometry.compare_many(submitted, candidates)
+
+        # Same results up to floating-point rounding (summation order, libm)
+        scalar = loop()
+        vector = batch()
+        assert np.allclose(vector["distance_meters"], [r["distance_meters"] for r in scalar], rtol=1e-9, atol=1e-9)
+        assert np.allclose(vector["area_ratio"], [r["area_ratio"] for r in scalar], rtol=1e-9)
+        assert np.array_equal(vector["match"], [r["match"] for r in scalar])
+
+        loop_time = best_of(loop, repeat=3 if size > 1000 else 5)
+        batch_time = best_of(batch)
+        print(
+            f"{size:>10} {loop_time * 1000:>12.2f} {batch_time * 1000:>12.2f} "
+            f"{loop_time / batch_time:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
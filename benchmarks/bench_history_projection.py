@@ -0,0 +1,105 @@
+"""
+Benchmark: full-row vs projected verification history reads.
+
+Seeds one user with thousands of verifications carrying submitted and
+official polygons, then pages through the whole history twice: loading
+whole VerificationRequest rows (the old query) and selecting only the
+history columns (``HISTORY_COLUMNS``). Reports time and the bytes
+fetched as counted by ``db_metrics.record_fetch``.
+
+Usage:
+    python -m benchmarks.bench_history_projection
+"""
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.scratch_db import use_scratch_database
+
+use_scratch_database("bench_history_projection")
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select
+
+from app.core.database import engine
+from app.core.db_metrics import db_metrics
+from app.models.land_models import VerificationRequest
+from app.models.user import User
+from app.services.verification_service import verifier
+
+VERIFICATIONS = 5000
+PAGE_SIZE = 100
+VERTICES = 24
+
+
+def polygon(i: int) -> list:
+    return [
+        {"lat": 4.155 + 0.0001 * (k % 5) + i * 1e-6, "lng": 9.241 + 0.0001 * (k // 5)}
+        for k in range(VERTICES)
+    ]
+
+
+def seed() -> int:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with Session(engine) as session:
+        user = User(name="bench", email="bench@example.com")
+        session.add(user)
+        session.commit()
+        session.execute(insert(VerificationRequest), [
+            {"id": uuid.uuid4(), "user_id": user.id, "submitted_town": "Buea",
+             "submitted_layout": "Molyko", "submitted_block": "B1", "submitted_plot": f"P{i}",
+             "submitted_coords": polygon(i), "official_coords": polygon(i),
+             "official_owner": "Bench Owner", "status": "verified", "is_verified": True,
+             "is_fraud": False, "requested_at": start + timedelta(seconds=i)}
+            for i in range(VERIFICATIONS)
+        ])
+        session.commit()
+        return user.id
+
+
+def read_all(session: Session, user_id: int, full: bool, label: str) -> float:
+    elapsed = 0.0
+    after = None
+    while True:
+        start = time.perf_counter()
+        stmt = verifier._history_query(user_id, PAGE_SIZE, after)
+        if full:
+            rows = session.scalars(stmt.with_only_columns(VerificationRequest)).all()
+        else:
+            rows = session.exec(stmt).all()
+        elapsed += time.perf_counter() - start
+        db_metrics.record_fetch(label, rows)
+        if len(rows) < PAGE_SIZE:
+            break
+        after = (rows[-1].requested_at, rows[-1].id)
+        session.expunge_all()
+    return elapsed
+
+
+def main():
+    logging.disable(logging.INFO)
+    engine.echo = False
+    user_id = seed()
+    db_metrics.reset()
+
+    with Session(engine) as session:
+        timings = {
+            "full rows": read_all(session, user_id, True, "full rows"),
+            "projected": read_all(session, user_id, False, "projected"),
+        }
+
+    fetched = db_metrics.snapshot()["fetched"]
+    print(f"{VERIFICATIONS} verifications, {PAGE_SIZE} per page, {VERTICES}-vertex polygons")
+    print(f"{'query':>10} {'total (ms)':>11} {'bytes':>11} {'bytes/row':>10}")
+    for label, elapsed in timings.items():
+        print(
+            f"{label:>10} {elapsed * 1000:>11.1f} {fetched[label]['bytes']:>11} "
+            f"{fetched[label]['bytes'] / fetched[label]['rows']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: streaming registry import throughput.
+
+Generates a GeoJSON FeatureCollection and a CSV of synthetic parcels,
+imports each into an empty land_registry with ``RegistryImporter`` and
+reports parcels per second and the projected time for 1M parcels.
+
+Usage:
+    python -m benchmarks.bench_import_registry [parcels]
+"""
+import csv
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+from benchmarks.scratch_db import use_scratch_database
+
+use_scratch_database("bench_import_registry")
+
+from sqlmodel import SQLModel
+
+from app.commands.import_registry import RegistryImporter
+from app.core.database import engine
+from app.models.land_models import LandRegistry
+
+WORKDIR = "/tmp/bench_import_registry"
+PARCELS = 200_000
+
+
+def parcel(i: int):
+    lat = 4.0 + random.random()
+    lng = 9.0 + random.random()
+    size = 0.0002 + random.random() * 0.0004
+    ring = [(lat, lng), (lat, lng + size), (lat + size, lng + size), (lat + size, lng)]
+    properties = {
+        "certificate_number": f"BENCH-{i}",
+        "certificate_pdf_url": f"https://example.com/cert/{i}.pdf",
+        "town": "Buea",
+        "layout": f"Layout {i % 200}",
+        "block_number": f"B{i % 50}",
+        "plot_number": f"P{i}",
+        "owner_name": "Bench Owner",
+    }
+    return ring, properties
+
+
+def write_inputs(count: int):
+    os.makedirs(WORKDIR, exist_ok=True)
+    geojson_path = os.path.join(WORKDIR, "parcels.geojson")
+    csv_path = os.path.join(WORKDIR, "parcels.csv")
+    random.seed(42)
+
+    with open(geojson_path, "w", encoding="utf-8") as geojson, \
+            open(csv_path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = None
+        geojson.write('{"type": "FeatureCollection", "features": [\n')
+        for i in range(count):
+            ring, properties = parcel(i)
+            closed = [[lng, lat] for lat, lng in ring + ring[:1]]
+            feature = {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [closed]}, "properties": properties}
+            geojson.write(("," if i else "") + json.dumps(feature) + "\n")
+
+            row = {**properties, "coordinates": json.dumps([{"lat": lat, "lng": lng} for lat, lng in ring])}
+            if writer is None:
+                writer = csv.DictWriter(csv_file, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+        geojson.write("]}\n")
+
+    return {"geojson": geojson_path, "csv": csv_path}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PARCELS
+    logging.disable(logging.INFO)
+    engine.echo = False
+    inputs = write_inputs(count)
+
+    print(f"{count} parcels")
+    print(f"{'format':>8} {'seconds':>8} {'parcels/s':>10} {'1M parcels (min)':>17}")
+    for fmt, path in inputs.items():
+        SQLModel.metadata.drop_all(engine, tables=[LandRegistry.__table__])
+        importer = RegistryImporter(
+            path,
+            fmt,
+            errors_path=os.path.join(WORKDIR, f"{fmt}.errors.csv"),
+            checkpoint_path=os.path.join(WORKDIR, f"{fmt}.checkpoint.json"),
+        )
+        start = time.perf_counter()
+        stats = importer.run()
+        elapsed = time.perf_counter() - start
+        assert stats.imported == count, stats
+        rate = count / elapsed
+        print(f"{fmt:>8} {elapsed:>8.1f} {rate:>10.0f} {1_000_000 / rate / 60:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
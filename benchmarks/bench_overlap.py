@@ -0,0 +1,76 @@
+"""
+Benchmark: 3-check heuristic vs. metric IoU clipping.
+
+Times, per pair, the original ``compare_polygons`` (see
+``baseline_geometry``), the current one with IoU off (the default) and
+with COORDINATES_IOU_REQUIRED on, and ``polygon_iou`` alone, for an
+overlapping pair and a disjoint pair at 4, 50 and 1,000 vertices. With
+IoU required only pairs the three checks accept are clipped, so the
+disjoint pair costs the same as with IoU off.
+
+Usage:
+    python -m benchmarks.bench_overlap
+"""
+import math
+import time
+
+from app.core.config import settings
+from app.services.geometry_service import geometry
+from benchmarks.baseline_geometry import baseline_geometry
+
+SIZES = (4, 50, 1_000)
+RADIUS_DEG = 2e-4  # roughly a 40 m wide parcel
+
+
+def ring(vertices: int, center=(4.155, 9.241), rotation=0.0):
+    return [
+        (
+            center[0] + RADIUS_DEG * math.sin(rotation + 2 * math.pi * i / vertices),
+            center[1] + RADIUS_DEG * math.cos(rotation + 2 * math.pi * i / vertices),
+        )
+        for i in range(vertices)
+    ]
+
+
+def per_call_us(fn, budget=0.5):
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < budget:
+        fn()
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def iou_required(submitted, official):
+    settings.COORDINATES_IOU_REQUIRED = True
+    try:
+        return geometry.compare_polygons(submitted, official)
+    finally:
+        settings.COORDINATES_IOU_REQUIRED = False
+
+
+def main():
+    settings.COORDINATES_IOU_REQUIRED = False
+    print(
+        f"{'vertices':>8} {'pair':>9} {'baseline (us)':>14} {'checks (us)':>12} "
+        f"{'iou required (us)':>18} {'clip only (us)':>15} {'iou':>6}"
+    )
+    for size in SIZES:
+        submitted = ring(size)
+        pairs = {
+            "overlap": ring(size, center=(4.15502, 9.24101), rotation=0.1),
+            "disjoint": ring(size, center=(4.156, 9.242)),
+        }
+        for label, official in pairs.items():
+            print(
+                f"{size:>8} {label:>9} "
+                f"{per_call_us(lambda: baseline_geometry.compare_polygons(submitted, official)):>14.1f} "
+                f"{per_call_us(lambda: geometry.compare_polygons(submitted, official)):>12.1f} "
+                f"{per_call_us(lambda: iou_required(submitted, official)):>18.1f} "
+                f"{per_call_us(lambda: geometry.polygon_iou(submitted, official)):>15.1f} "
+                f"{geometry.polygon_iou(submitted, official):>6.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: OFFSET vs keyset pagination of verification history and users.
+
+Seeds one user with many verification requests (and many users), then
+times fetching page 1 and a deep page both ways: ``OFFSET`` reads and
+discards every earlier row, keyset seeks the composite index straight to
+the page, so its cost does not grow with depth.
+
+Usage:
+    python -m benchmarks.bench_pagination
+"""
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.scratch_db import use_scratch_database
+
+use_scratch_database("bench_pagination")
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select
+
+from app.core.database import engine
+from app.crud.user import UserCRUD
+from app.models.land_models import VerificationRequest
+from app.models.user import User
+from app.services.verification_service import verifier
+
+ROWS = 60_000
+PAGE_SIZE = 20
+DEEP_PAGE = 1000
+REPEAT = 20
+
+
+def seed() -> int:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with Session(engine) as session:
+        session.execute(insert(User), [
+            {"name": f"user{i}", "email": f"user{i}@example.com", "role": "USER",
+             "is_verified": False, "is_active": True, "created_at": start}
+            for i in range(ROWS)
+        ])
+        session.execute(insert(VerificationRequest), [
+            {"id": uuid.uuid4(), "user_id": 1, "submitted_town": "Buea",
+             "submitted_layout": "Molyko", "submitted_block": "B1", "submitted_plot": f"P{i}",
+             "status": "verified", "is_verified": True, "is_fraud": False,
+             "requested_at": start + timedelta(seconds=i)}
+            for i in range(ROWS)
+        ])
+        session.commit()
+    return 1
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def deep_history_cursor(session: Session, user_id: int):
+    # The (requested_at, id) of the last row before the deep page
+    stmt = (
+        select(VerificationRequest.requested_at, VerificationRequest.id)
+        .where(VerificationRequest.user_id == user_id)
+        .order_by(VerificationRequest.requested_at.desc(), VerificationRequest.id.desc())
+        .offset((DEEP_PAGE - 1) * PAGE_SIZE - 1)
+        .limit(1)
+    )
+    return tuple(session.exec(stmt).one())
+
+
+def main():
+    logging.disable(logging.INFO)
+    engine.echo = False
+    user_id = seed()
+    skip = (DEEP_PAGE - 1) * PAGE_SIZE
+
+    with Session(engine) as session:
+        after = deep_history_cursor(session, user_id)
+        after_id = skip  # ids are dense from 1
+
+        def history_offset(offset):
+            stmt = verifier._history_query(user_id, PAGE_SIZE).offset(offset)
+            return session.exec(stmt).all()
+
+        cases = [
+            ("history offset", lambda: history_offset(0), lambda: history_offset(skip)),
+            ("history keyset",
+             lambda: verifier.get_history(session, user_id, PAGE_SIZE),
+             lambda: verifier.get_history(session, user_id, PAGE_SIZE, after)),
+            ("users offset",
+             lambda: UserCRUD.get_all_users(session, 0, PAGE_SIZE),
+             lambda: UserCRUD.get_all_users(session, skip, PAGE_SIZE)),
+            ("users keyset",
+             lambda: UserCRUD.get_all_users(session, 0, PAGE_SIZE),
+             lambda: UserCRUD.get_all_users(session, 0, PAGE_SIZE, after_id)),
+        ]
+
+        print(f"{ROWS} rows, {PAGE_SIZE} per page")
+        print(f"{'query':>15} {'page 1 (ms)':>12} {f'page {DEEP_PAGE} (ms)':>15}")
+        for name, first, deep in cases:
+            print(f"{name:>15} {timed(first):>12.3f} {timed(deep):>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: login throughput against verification latency under mixed load.
+
+Drives the ASGI app in-process with concurrent login clients
+(``POST /auth/login``, one bcrypt verification each) alongside
+verification clients (``POST /verification/verify``) for a fixed
+duration, with bcrypt on the request threads (``inline``) and on the
+password hashing process pool (``pool``). Reports logins per second,
+logins shed with 503, and verification p50/p99 latency; ``idle`` is the
+verification latency with no login traffic.
+
+Hashes at the cost set by BCRYPT_ROUNDS.
+
+Usage:
+    python -m benchmarks.bench_password_hashing [seconds]
+"""
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+from benchmarks.scratch_db import use_scratch_database
+
+use_scratch_database("bench_password_hashing")
+
+import httpx
+from sqlmodel import Session, SQLModel
+
+from app.core import database, security
+from app.core.database import engine
+from app.core.security import create_access_token, hash_password
+from app.main import app
+from app.models.land_models import LandRegistry
+from app.models.user import User
+from app.services.password_hashing import PasswordHashPool
+
+DURATION_SECONDS = 10.0
+LOGIN_CLIENTS = 16
+VERIFY_CLIENTS = 8
+PLOTS = 200
+PASSWORD = "bench-password"
+
+SQUARE = [
+    {"lat": 4.1550, "lng": 9.2410},
+    {"lat": 4.1550, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2410},
+]
+
+
+def seed() -> str:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(PLOTS):
+            session.add(LandRegistry(
+                certificate_number=f"BENCH-{i}",
+                certificate_pdf_url="https://example.com/cert.pdf",
+                town="Buea",
+                layout="Molyko",
+                block_number="B1",
+                plot_number=f"P{i}",
+                coordinates=SQUARE,
+                owner_name="Bench Owner",
+                area_square_meters=1900.0,
+            ))
+        session.add(User(name="bench", email="bench@example.com", password_hash=hash_password(PASSWORD)))
+        session.commit()
+    return create_access_token({"sub": "bench@example.com"})
+
+
+async def run(client: httpx.AsyncClient, token: str, seconds: float, login_clients: int):
+    headers = {"Authorization": f"Bearer {token}"}
+    deadline = time.perf_counter() + seconds
+    logins = shed = 0
+    latencies = []
+
+    async def login():
+        nonlocal logins, shed
+        credentials = {"username": "bench@example.com", "password": PASSWORD}
+        while time.perf_counter() < deadline:
+            response = await client.post("/api/v1/auth/login", data=credentials)
+            if response.status_code == 503:
+                shed += 1
+                await asyncio.sleep(0.05)
+                continue
+            assert response.status_code == 200, response.text
+            logins += 1
+
+    async def verify(worker: int):
+        i = worker
+        while time.perf_counter() < deadline:
+            body = {
+                "town": "Buea",
+                "layout": "Molyko",
+                "block_number": "B1",
+                "plot_number": f"P{i % PLOTS}",
+                "coordinates": SQUARE,
+            }
+            start = time.perf_counter()
+            response = await client.post("/api/v1/verification/verify", json=body, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+            i += VERIFY_CLIENTS
+
+    await asyncio.gather(
+        *(login() for _ in range(login_clients)),
+        *(verify(worker) for worker in range(VERIFY_CLIENTS)),
+    )
+    quantiles = statistics.quantiles(latencies, n=100)
+    return logins / seconds, shed, quantiles[49] * 1000, quantiles[98] * 1000
+
+
+async def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else DURATION_SECONDS
+    logging.disable(logging.INFO)
+    database.engine.echo = False
+    database.async_engine.echo = False
+    token = seed()
+
+    pool = security.password_hasher
+    modes = (
+        ("idle", pool, 0),
+        ("inline", PasswordHashPool(workers=0, queue_depth=LOGIN_CLIENTS), LOGIN_CLIENTS),
+        ("pool", pool, LOGIN_CLIENTS),
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{LOGIN_CLIENTS} login clients, {VERIFY_CLIENTS} verification clients, {seconds:.0f}s per mode")
+        print(f"{'mode':>8} {'logins/s':>9} {'503s':>6} {'verify p50 ms':>14} {'verify p99 ms':>14}")
+        for name, hasher, login_clients in modes:
+            security.password_hasher = hasher
+            rate, shed, p50, p99 = await run(client, token, seconds, login_clients)
+            print(f"{name:>8} {rate:>9.1f} {shed:>6} {p50:>14.1f} {p99:>14.1f}")
+
+    security.password_hasher = pool
+    pool.shutdown()
+    await database.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+Benchmark: coordinate column size and decode time by storage format.
+
+Stores N polygons in an SQLite table once per POLYGON_STORAGE format and
+measures bytes per value, and the time to fetch every row and turn it
+into (lat, lng) points the way the verify and history paths do.
+
+Usage:
+    python -m benchmarks.bench_polygon_storage
+"""
+import random
+import time
+
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, func, select
+
+from app.models.types import STORAGE_FORMATS, PolygonType
+from app.services.geometry_service import geometry
+
+ROWS = 20_000
+VERTEX_COUNTS = (4, 50)
+
+
+def polygon(rng: random.Random, vertices: int):
+    lat0, lng0 = 4.0 + rng.random(), 9.0 + rng.random()
+    return [{"lat": lat0 + rng.uniform(0, 3e-4), "lng": lng0 + rng.uniform(0, 3e-4)} for _ in range(vertices)]
+
+
+def main():
+    rng = random.Random(3)
+    print(f"{'vertices':>8} {'storage':>8} {'bytes/row':>10} {'fetch (ms)':>11} {'fetch+points (ms)':>18}")
+    for vertices in VERTEX_COUNTS:
+        values = [polygon(rng, vertices) for _ in range(ROWS)]
+        for storage in STORAGE_FORMATS:
+            engine = create_engine("sqlite://")
+            table = Table(
+                "polygons", MetaData(),
+                Column("id", Integer, primary_key=True),
+                Column("coords", PolygonType(storage)),
+            )
+            table.create(engine)
+            with engine.begin() as conn:
+                conn.execute(table.insert(), [{"coords": v} for v in values])
+
+            with engine.connect() as conn:
+                size = conn.execute(select(func.sum(func.length(table.c.coords)))).scalar() / ROWS
+
+                start = time.perf_counter()
+                rows = conn.execute(select(table.c.coords)).scalars().all()
+                fetched = time.perf_counter() - start
+
+                start = time.perf_counter()
+                rows = conn.execute(select(table.c.coords)).scalars().all()
+                for coords in rows:
+                    geometry.points_to_list(coords)
+                decoded = time.perf_counter() - start
+
+            print(f"{vertices:>8} {storage:>8} {size:>10.0f} {fetched * 1000:>11.1f} {decoded * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
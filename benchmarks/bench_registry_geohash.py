@@ -0,0 +1,110 @@
+"""
+Benchmark: database proximity search latency by registry size.
+
+Grows a land_registry table to 10k, 100k and 1M synthetic parcels (spread
+over 10 towns) and times, at each size:
+
+- geohash: ``SimpleVerifier._proximity_candidates`` (indexed geohash
+  cell + neighbours lookup)
+- town scan: the previous ``town ILIKE '%x%' LIMIT 20`` candidate query
+
+Usage:
+    python -m benchmarks.bench_registry_geohash
+"""
+import random
+import time
+import uuid
+
+from benchmarks.scratch_db import use_scratch_database
+
+use_scratch_database("bench_registry")
+
+from sqlmodel import Session, SQLModel, select  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.models.land_models import LandRegistry, derive_registry_fields  # noqa: E402
+from app.services.verification_service import verifier  # noqa: E402
+
+SIZES = (10_000, 100_000, 1_000_000)
+TOWNS = [f"Town{i}" for i in range(10)]
+QUERIES = 500
+BATCH = 10_000
+ORIGIN = (4.0, 9.0)
+SPAN_DEG = 0.45
+
+
+def parcel_rows(rng: random.Random, count: int, start: int):
+    rows = []
+    for n in range(start, start + count):
+        lat = ORIGIN[0] + rng.uniform(0, SPAN_DEG)
+        lng = ORIGIN[1] + rng.uniform(0, SPAN_DEG)
+        coords = [
+            {"lat": lat, "lng": lng},
+            {"lat": lat, "lng": lng + 2e-4},
+            {"lat": lat + 2e-4, "lng": lng + 2e-4},
+            {"lat": lat + 2e-4, "lng": lng},
+        ]
+        town = rng.choice(TOWNS)
+        rows.append({
+            "id": uuid.uuid4(),
+            "certificate_number": f"BENCH-{n}",
+            "certificate_pdf_url": "",
+            "town": town,
+            "layout": "Layout",
+            "block_number": str(n // 100),
+            "plot_number": str(n),
+            "coordinates": coords,
+            "owner_name": "Bench",
+            "is_active": True,
+            **derive_registry_fields(coords, town, "Layout", str(n // 100), str(n)),
+        })
+    return rows
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)] * 1000
+
+
+def main():
+    engine.echo = False
+    SQLModel.metadata.drop_all(engine, tables=[LandRegistry.__table__])
+    SQLModel.metadata.create_all(engine, tables=[LandRegistry.__table__])
+
+    rng = random.Random(11)
+    loaded = 0
+    print(f"{'parcels':>10} {'geohash p50 (ms)':>17} {'p99':>8} {'town scan p50 (ms)':>19} {'p99':>8}")
+
+    for size in SIZES:
+        with engine.begin() as conn:
+            while loaded < size:
+                count = min(BATCH, size - loaded)
+                conn.execute(LandRegistry.__table__.insert(), parcel_rows(rng, count, loaded))
+                loaded += count
+
+        geohash_times, scan_times = [], []
+        with Session(engine) as session:
+            for _ in range(QUERIES):
+                town = rng.choice(TOWNS)
+                center = (ORIGIN[0] + rng.uniform(0, SPAN_DEG), ORIGIN[1] + rng.uniform(0, SPAN_DEG))
+
+                start = time.perf_counter()
+                verifier._proximity_candidates(session, town, center, radius_meters=50)
+                geohash_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                session.exec(
+                    select(LandRegistry)
+                    .where(LandRegistry.town.ilike(f"%{town}%"), LandRegistry.is_active.is_(True))
+                    .limit(20)
+                ).all()
+                scan_times.append(time.perf_counter() - start)
+
+        print(
+            f"{size:>10} {percentile(geohash_times, 0.5):>17.3f} {percentile(geohash_times, 0.99):>8.3f} "
+            f"{percentile(scan_times, 0.5):>19.3f} {percentile(scan_times, 0.99):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
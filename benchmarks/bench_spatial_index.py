@@ -0,0 +1,65 @@
+"""
+Benchmark: in-process registry spatial index query latency.
+
+Fills a RegistrySpatialIndex with N synthetic parcels spread over a
+~50 x 50 km area and times "all parcels within 50 m of this centroid"
+queries at 10k, 100k and 1M parcels.
+
+Usage:
+    python -m benchmarks.bench_spatial_index
+"""
+import random
+import time
+import uuid
+from types import SimpleNamespace
+
+from app.services.spatial_index import RegistrySpatialIndex
+
+SIZES = (10_000, 100_000, 1_000_000)
+QUERIES = 2_000
+ORIGIN = (4.0, 9.0)
+SPAN_DEG = 0.45
+
+
+def parcel(rng: random.Random):
+    lat = ORIGIN[0] + rng.uniform(0, SPAN_DEG)
+    lng = ORIGIN[1] + rng.uniform(0, SPAN_DEG)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        is_active=True,
+        centroid_lat=lat,
+        centroid_lng=lng,
+        bbox_min_lat=lat - 1e-4,
+        bbox_min_lng=lng - 1e-4,
+        bbox_max_lat=lat + 1e-4,
+        bbox_max_lng=lng + 1e-4,
+    )
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{'parcels':>10} {'build (s)':>10} {'query p50 (us)':>15} {'query p99 (us)':>15} {'hits/query':>11}")
+    for size in SIZES:
+        index = RegistrySpatialIndex()
+        start = time.perf_counter()
+        for _ in range(size):
+            index.upsert(parcel(rng))
+        build = time.perf_counter() - start
+
+        timings = []
+        hits = 0
+        for _ in range(QUERIES):
+            center = (ORIGIN[0] + rng.uniform(0, SPAN_DEG), ORIGIN[1] + rng.uniform(0, SPAN_DEG))
+            start = time.perf_counter()
+            hits += len(index.query_radius(center, 50))
+            timings.append(time.perf_counter() - start)
+
+        timings.sort()
+        print(
+            f"{size:>10} {build:>10.2f} {timings[len(timings) // 2] * 1e6:>15.1f} "
+            f"{timings[int(len(timings) * 0.99)] * 1e6:>15.1f} {hits / QUERIES:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: DB round-trips and connection hold time per verification.
+
+Runs ``verify_land`` sequentially in each persistence mode and reports,
+per verification, the statements sent, pool checkouts and the time
+connections were held (from ``app.core.db_metrics``):
+
+- ``pending+final``: pending insert, refresh, registry search on a second
+  session, final update (the default)
+- ``single-commit``: search on the caller's session, one insert
+- ``write-behind``: as single-commit, rows inserted in batches by the
+  buffer (flushed before the counters are read)
+
+Usage:
+    python -m benchmarks.bench_verify_transactions
+"""
+import logging
+import time
+
+from benchmarks.scratch_db import use_scratch_database
+
+use_scratch_database("bench_verify_transactions")
+
+from sqlmodel import Session, SQLModel
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.db_metrics import db_metrics
+from app.models.land_models import LandRegistry
+from app.models.user import User
+from app.schemas.land_schemas import VerificationRequestCreate
+from app.services.verification_service import verifier
+from app.services.write_behind import write_behind
+
+VERIFICATIONS = 300
+PLOTS = 100
+
+SQUARE = [
+    {"lat": 4.1550, "lng": 9.2410},
+    {"lat": 4.1550, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2410},
+]
+
+MODES = {
+    "pending+final": (False, False),
+    "single-commit": (True, False),
+    "write-behind": (False, True),
+}
+
+
+def seed() -> int:
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(PLOTS):
+            session.add(LandRegistry(
+                certificate_number=f"BENCH-{i}",
+                certificate_pdf_url="https://example.com/cert.pdf",
+                town="Buea",
+                layout="Molyko",
+                block_number="B1",
+                plot_number=f"P{i}",
+                coordinates=SQUARE,
+                owner_name="Bench Owner",
+                area_square_meters=1900.0,
+            ))
+        user = User(name="bench", email="bench@example.com", is_verified=True)
+        session.add(user)
+        session.commit()
+        return user.id
+
+
+def main():
+    logging.disable(logging.INFO)
+    engine.echo = False
+    user_id = seed()
+
+    requests = [
+        VerificationRequestCreate(
+            town="Buea",
+            layout="Molyko",
+            block_number="B1",
+            plot_number=f"P{i % PLOTS}",
+            coordinates=SQUARE,
+        )
+        for i in range(VERIFICATIONS)
+    ]
+
+    print(f"{'mode':>14} {'statements':>11} {'checkouts':>10} {'hold (ms)':>10} {'latency (ms)':>13}")
+    for mode, (single_commit, write_behind_enabled) in MODES.items():
+        settings.VERIFICATION_SINGLE_COMMIT = single_commit
+        settings.VERIFICATION_WRITE_BEHIND = write_behind_enabled
+        db_metrics.reset()
+
+        start = time.perf_counter()
+        for request in requests:
+            with Session(engine) as db:
+                verifier.verify_land(db, user_id, request)
+        elapsed = time.perf_counter() - start
+        write_behind.flush()
+
+        metrics = db_metrics.snapshot()
+        print(
+            f"{mode:>14} {metrics['statements'] / VERIFICATIONS:>11.2f} "
+            f"{metrics['checkouts'] / VERIFICATIONS:>10.2f} "
+            f"{metrics['hold_seconds'] / VERIFICATIONS * 1000:>10.3f} "
+            f"{elapsed / VERIFICATIONS * 1000:>13.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Scratch database for benchmarks.
+
+Benchmarks drop and recreate tables, so they never run against the app's
+database: ``use_scratch_database`` must be called before anything from
+``app`` is imported. The URL comes from BENCH_DATABASE_URL (a throwaway
+SQLite file by default) and replaces DATABASE_URL for the process; every
+benchmark that touches a database goes through here. To measure against
+PostgreSQL, point it at a scratch database:
+
+    BENCH_DATABASE_URL=postgresql://.../scratch python -m benchmarks.bench_registry_geohash
+"""
+import os
+
+
+def use_scratch_database(name: str) -> str:
+    """Point the app at the benchmark database; returns its URL"""
+    url = os.environ.get("BENCH_DATABASE_URL", f"sqlite:////tmp/{name}.db")
+    if url == os.environ.get("DATABASE_URL"):
+        raise SystemExit("BENCH_DATABASE_URL is the app's DATABASE_URL; benchmarks drop tables, use a scratch database")
+
+    os.environ["DATABASE_URL"] = url
+    # Engines that would otherwise follow another database
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.pop("REGISTRY_DB_URL", None)
+    return url
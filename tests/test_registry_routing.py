@@ -0,0 +1,137 @@
+"""
+RoutingSession against two SQLite files: the primary database and a
+registry database read through the read-only registry engine.
+
+The engines are created when ``app.core.database`` is imported, so the
+URLs are set before anything from ``app`` is imported.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="registry_routing_")
+PRIMARY = os.path.join(_tmp, "primary.db")
+REGISTRY = os.path.join(_tmp, "registry.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{PRIMARY}"
+os.environ["REGISTRY_DB_URL"] = f"sqlite:///{REGISTRY}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import pytest  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlmodel import Session, SQLModel, create_engine, select  # noqa: E402
+
+from app.core import database  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import RoutingSession  # noqa: E402
+from app.models.land_models import LandRegistry  # noqa: E402
+import app.models.user  # noqa: E402,F401  (users table, for create_all)
+
+SQUARE = [
+    {"lat": 4.1550, "lng": 9.2410},
+    {"lat": 4.1550, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2414},
+    {"lat": 4.1554, "lng": 9.2410},
+]
+
+
+def _plot(owner_name: str, plot_number: str = "P1") -> LandRegistry:
+    return LandRegistry(
+        certificate_number=f"CERT-{owner_name}-{plot_number}",
+        certificate_pdf_url="https://example.com/cert.pdf",
+        town="Buea",
+        layout="Molyko",
+        block_number="B1",
+        plot_number=plot_number,
+        coordinates=SQUARE,
+        owner_name=owner_name,
+        area_square_meters=1900.0,
+    )
+
+
+def _owner_of(plot_number: str = "P1") -> str:
+    with RoutingSession(database.engine) as session:
+        stmt = select(LandRegistry.owner_name).where(LandRegistry.plot_number == plot_number)
+        return session.exec(stmt).one()
+
+
+def _count(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT count(*) FROM land_registry").fetchone()[0]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def databases():
+    # The same plot with a different owner in each file, so a read shows
+    # which database answered
+    SQLModel.metadata.create_all(database.engine)
+    with Session(database.engine) as session:
+        session.add(_plot("Primary Owner"))
+        session.commit()
+
+    writer = create_engine(os.environ["REGISTRY_DB_URL"])
+    SQLModel.metadata.create_all(writer, tables=[LandRegistry.__table__])
+    with Session(writer) as session:
+        session.add(_plot("Registry Owner"))
+        session.commit()
+    writer.dispose()
+
+    yield
+    database.engine.dispose()
+    database.registry_engine.dispose()
+    shutil.rmtree(_tmp, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def fresh_health_check(monkeypatch):
+    # Re-check the registry engine on every read instead of every 30s
+    monkeypatch.setattr(settings, "REGISTRY_HEALTH_CHECK_SECONDS", 0)
+
+
+def test_reads_registry_from_registry_database():
+    assert database.registry_router.enabled
+    assert _owner_of() == "Registry Owner"
+
+
+def test_falls_back_to_primary_when_registry_is_down():
+    moved = REGISTRY + ".down"
+    os.rename(REGISTRY, moved)
+    database.registry_engine.dispose()
+    try:
+        assert _owner_of() == "Primary Owner"
+    finally:
+        database.registry_engine.dispose()
+        os.replace(moved, REGISTRY)
+
+    assert _owner_of() == "Registry Owner"
+
+
+def test_falls_back_to_primary_when_registry_schema_is_behind():
+    # A registry database never migrated for a newer column
+    with sqlite3.connect(REGISTRY) as conn:
+        conn.execute("ALTER TABLE land_registry DROP COLUMN version")
+    try:
+        assert _owner_of() == "Primary Owner"
+    finally:
+        with sqlite3.connect(REGISTRY) as conn:
+            conn.execute("ALTER TABLE land_registry ADD COLUMN version INTEGER DEFAULT 1 NOT NULL")
+
+    assert _owner_of() == "Registry Owner"
+
+
+def test_registry_engine_rejects_writes():
+    with pytest.raises(OperationalError, match="readonly"):
+        with database.registry_engine.begin() as conn:
+            conn.execute(text("DELETE FROM land_registry"))
+
+    assert _count(REGISTRY) == 1
+
+
+def test_writes_go_to_primary():
+    with RoutingSession(database.engine) as session:
+        session.add(_plot("New Owner", plot_number="P2"))
+        session.commit()
+
+    assert _count(PRIMARY) == 2
+    assert _count(REGISTRY) == 1